@@ -0,0 +1,141 @@
+import os
+import sys
+import json
+import gzip
+import time
+import argparse
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+MAGIC = b"SIRIS-ARCHIVE 1\n"
+ARCHIVE_DIR = "archive"
+ARCHIVE_EXT = ".arc"
+
+# Archive layout: MAGIC, one line of JSON metadata, then the compressed chat file.
+# Listing and indexing read only the first two lines; the payload is
+# decompressed when the chat is opened or searched.
+
+def archive_path(history_dir, chat_id):
+    return os.path.join(history_dir, ARCHIVE_DIR, chat_id + ARCHIVE_EXT)
+
+def _compress(data):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=10).compress(data)
+    return "gzip", gzip.compress(data, compresslevel=6)
+
+def _decompress(codec, data):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("chat was archived with zstd; install the 'zstandard' package to open it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def read_archive_header(path):
+    with open(path, "rb") as f:
+        if f.readline() != MAGIC:
+            raise ValueError(f"not a chat archive: {path}")
+        return json.loads(f.readline())
+
+def read_archive_payload(path):
+    """(header, original chat file bytes)"""
+    with open(path, "rb") as f:
+        if f.readline() != MAGIC:
+            raise ValueError(f"not a chat archive: {path}")
+        header = json.loads(f.readline())
+        return header, _decompress(header["codec"], f.read())
+
+def write_archive(source_path, chat_id, metadata, history_dir):
+    """Compress a chat file into the archive tier and remove the original. Returns the archive path."""
+    with open(source_path, "rb") as f:
+        raw = f.read()
+    codec, payload = _compress(raw)
+    header = dict(metadata, id=chat_id, codec=codec, format=os.path.splitext(source_path)[1],
+                  size=len(raw), archived_at=time.time())
+
+    path = archive_path(history_dir, chat_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    os.remove(source_path)
+    return path
+
+def restore_archive(history_dir, chat_id):
+    """Decompress an archived chat back into history_dir. Returns the restored file path."""
+    path = archive_path(history_dir, chat_id)
+    header, raw = read_archive_payload(path)
+    target = os.path.join(history_dir, chat_id + header.get("format", ".jsonl"))
+    tmp_path = target + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(raw)
+    os.replace(tmp_path, target)
+    # Keep the original timestamp so restoring doesn't make it the latest chat
+    if header.get("updated_at"):
+        os.utime(target, (header["updated_at"], header["updated_at"]))
+    os.remove(path)
+    return target
+
+class ChatArchiver:
+    """Moves chats untouched for archive_after_days into the compressed archive tier."""
+
+    def __init__(self, chat_manager, archive_after_days=30):
+        self.chat_manager = chat_manager
+        self.archive_after_days = archive_after_days
+
+    def sweep(self, limit=None):
+        if not self.archive_after_days:
+            return 0
+        manager = self.chat_manager
+        index = manager.index
+        cutoff = time.time() - self.archive_after_days * 86400
+        # Pending journal writes must land before files are compressed
+        manager.writer.flush()
+
+        archived, saved = 0, 0
+        for entry in index.list(0, len(index)):
+            if entry.get("archived") or entry["updated_at"] > cutoff or entry["id"] == manager.current_chat_id:
+                continue
+            source = None
+            for ext in (".jsonl", ".json"):
+                candidate = os.path.join(manager.history_dir, entry["id"] + ext)
+                if os.path.exists(candidate):
+                    source = candidate
+                    break
+            if source is None:
+                continue
+            try:
+                size = os.path.getsize(source)
+                metadata = {key: entry[key] for key in ("name", "created_at", "updated_at", "message_count", "token_count")}
+                path = write_archive(source, entry["id"], metadata, manager.history_dir)
+                saved += size - os.path.getsize(path)
+                index.annotate(entry["id"], archived=True)
+                archived += 1
+            except Exception as e:
+                print(f"⚠️ Failed to archive chat {entry['id']}: {e}")
+            if limit and archived >= limit:
+                break
+        if archived:
+            print(f"🗜️ Archived {archived} old chats ({saved / 1024:.0f} KB saved)")
+        return archived
+
+def main(argv=None):
+    from core.chat.chat_manager import ChatManager
+    parser = argparse.ArgumentParser(description="Compress chats that haven't been used for a while.")
+    parser.add_argument("--dir", default="chat_history")
+    parser.add_argument("--days", type=float, default=30)
+    args = parser.parse_args(argv)
+    manager = ChatManager(history_dir=args.dir)
+    ChatArchiver(manager, args.days).sweep()
+    manager.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+
+from core.chat.archive import ARCHIVE_DIR, ARCHIVE_EXT, read_archive_header
+
+INDEX_FILE = "chats.index"  # not .json/.jsonl, so it's never mistaken for a chat
+
+class ChatIndex:
+    """Metadata for every chat in a history folder, without opening the chats.
+
+    Entries are kept in an OrderedDict in least-recently-updated order, so the
+    latest chat is the last key and listings page backwards from the end. On
+    disk the index is an append-only JSONL log of entry updates, compacted when
+    superseded lines outnumber live entries. It is rebuilt from the chat files
+    if missing, and reconciled when the folder changed behind its back (the
+    directory mtime is newer than the index).
+    """
+
+    def __init__(self, history_dir="chat_history", writer=None):
+        self.history_dir = history_dir
+        self.path = os.path.join(history_dir, INDEX_FILE)
+        self.entries = OrderedDict()  # chat id -> entry, most recently updated last
+        self.lines = 0
+        self.lock = threading.Lock()
+        self.writer = writer
+        self._load()
+
+    # --- LOADING ---
+    def _load(self):
+        if self.writer:
+            self.writer.flush()
+        if not os.path.exists(self.path):
+            self.rebuild()
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.endswith("\n"):
+                        break  # torn last write
+                    entry = json.loads(line)
+                    self.lines += 1
+                    if entry.get("deleted"):
+                        self.entries.pop(entry["id"], None)
+                        continue
+                    self.entries.pop(entry["id"], None)
+                    self.entries[entry["id"]] = entry
+        except (ValueError, KeyError) as e:
+            print(f"⚠️ Chat index unreadable ({e}); rebuilding.")
+            self.rebuild()
+            return
+        # annotate() records don't carry recency, so order by updated_at rather than log order
+        self.entries = OrderedDict(sorted(self.entries.items(), key=lambda kv: kv[1]["updated_at"]))
+        if self._is_stale():
+            self.reconcile()
+
+    def _is_stale(self):
+        # Adding/removing chat files bumps the folder mtime; our own writes keep the index newer
+        try:
+            return os.path.getmtime(self.history_dir) > os.path.getmtime(self.path)
+        except OSError:
+            return True
+
+    def _entry_from_file(self, chat_id, name):
+        # Imported here: chat_manager imports this module
+        from core.chat.chat_manager import read_chat
+        path = os.path.join(self.history_dir, name)
+        if name.endswith(ARCHIVE_EXT):
+            # The archive header already holds the metadata; don't decompress
+            header = read_archive_header(path)
+            entry = {key: header.get(key) for key in ("name", "created_at", "updated_at", "message_count", "token_count")}
+            entry.update(id=chat_id, archived=True)
+            return entry
+        data = read_chat(path)
+        return {
+            "id": chat_id,
+            "name": data.get("name", chat_id),
+            "created_at": data.get("created_at", ""),
+            "updated_at": os.path.getmtime(path),
+            "message_count": len(data.get("messages", [])),
+            "token_count": data.get("token_count", 0),
+        }
+
+    def rebuild(self):
+        """Index every chat file from scratch (first run, or the index was lost)."""
+        print("🗂️ Building chat index...")
+        self.entries = OrderedDict()
+        self.reconcile()
+
+    def reconcile(self):
+        """Pick up chat files added, changed or removed outside this index."""
+        from core.chat.chat_manager import chat_id_from_file
+        index_mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else 0.0
+        found = {}
+        for name in os.listdir(self.history_dir):
+            chat_id = chat_id_from_file(name)
+            # A journal and a not-yet-removed legacy file: the journal wins
+            if chat_id and (chat_id not in found or name.endswith(".jsonl")):
+                found[chat_id] = name
+        archive_dir = os.path.join(self.history_dir, ARCHIVE_DIR)
+        if os.path.isdir(archive_dir):
+            for name in os.listdir(archive_dir):
+                if name.endswith(ARCHIVE_EXT):
+                    found.setdefault(name[:-len(ARCHIVE_EXT)], os.path.join(ARCHIVE_DIR, name))
+
+        changed = [chat_id for chat_id in self.entries if chat_id not in found]
+        for chat_id in changed:
+            del self.entries[chat_id]
+        for chat_id, name in found.items():
+            if chat_id in self.entries and os.path.getmtime(os.path.join(self.history_dir, name)) <= index_mtime:
+                continue
+            try:
+                self.entries[chat_id] = self._entry_from_file(chat_id, name)
+                changed.append(chat_id)
+            except Exception as e:
+                print(f"⚠️ Skipping unreadable chat {name}: {e}")
+
+        if changed or not os.path.exists(self.path):
+            # Restore recency order after adding entries out of order
+            self.entries = OrderedDict(sorted(self.entries.items(), key=lambda kv: kv[1]["updated_at"]))
+            self.compact()
+        else:
+            os.utime(self.path)
+
+    # --- UPDATES ---
+    def update(self, chat_id, name, created_at, message_count, token_count):
+        entry = {
+            "id": chat_id,
+            "name": name,
+            "created_at": created_at,
+            "updated_at": time.time(),
+            "message_count": message_count,
+            "token_count": token_count,
+        }
+        with self.lock:
+            self.entries.pop(chat_id, None)
+            self.entries[chat_id] = entry
+            self._append(entry)
+
+    def annotate(self, chat_id, **fields):
+        """Change entry fields (e.g. archived) without counting as an update."""
+        with self.lock:
+            entry = self.entries.get(chat_id)
+            if entry is None:
+                return
+            entry.update(fields)
+            self._append(dict(entry))
+
+    def remove(self, chat_id):
+        with self.lock:
+            if self.entries.pop(chat_id, None) is not None:
+                self._append({"id": chat_id, "deleted": True})
+
+    def _append(self, record):
+        line = json.dumps(record) + "\n"
+        self.lines += 1
+        if self.lines > 2 * len(self.entries) + 64:
+            self._compact_locked()
+        elif self.writer:
+            self.writer.append(self.path, line)
+        else:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except Exception as e:
+                print(f"⚠️ Failed to update chat index: {e}")
+
+    def compact(self):
+        """Rewrite the index with one line per live chat, atomically."""
+        with self.lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        entries = [dict(e) for e in self.entries.values()]
+        render = lambda: "".join(json.dumps(entry) + "\n" for entry in entries)
+        # The rename bumps the folder mtime; don't read that as staleness next start
+        touch = lambda: os.utime(self.path)
+        self.lines = len(entries)
+        if self.writer:
+            self.writer.replace(self.path, render, touch)
+            return
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(render())
+            os.replace(tmp_path, self.path)
+            touch()
+        except Exception as e:
+            print(f"⚠️ Failed to save chat index: {e}")
+
+    # --- QUERIES ---
+    def latest(self):
+        """Id of the most recently updated chat, or None."""
+        with self.lock:
+            return next(reversed(self.entries), None)
+
+    def get(self, chat_id):
+        with self.lock:
+            entry = self.entries.get(chat_id)
+            return dict(entry) if entry else None
+
+    def list(self, offset=0, limit=50):
+        """Chats newest first, one page at a time."""
+        with self.lock:
+            page = []
+            for i, chat_id in enumerate(reversed(self.entries)):
+                if i >= offset + limit:
+                    break
+                if i >= offset:
+                    page.append(dict(self.entries[chat_id]))
+            return page
+
+    def __len__(self):
+        return len(self.entries)
+
+    def close(self):
+        if self.writer:
+            self.writer.flush()
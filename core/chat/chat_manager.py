@@ -1,36 +1,147 @@
+import io
 import os
 import json
 import time
 import uuid
+import threading
 from datetime import datetime
 
+from core.chat.chat_index import ChatIndex
+from core.chat.archive import ARCHIVE_EXT, archive_path, read_archive_payload, restore_archive
+from core.chat.persistence import get_persistence
+
+JOURNAL_VERSION = 1
+CHAT_EXTENSIONS = (".jsonl", ".json")  # journal first; .json is the legacy whole-file format
+
+def estimate_tokens(text):
+    return len(text) // 4  # Rough estimate when no tokenizer is loaded
+
+def chat_id_from_file(name):
+    for ext in CHAT_EXTENSIONS:
+        if name.endswith(ext):
+            return name[:-len(ext)]
+    return None
+
+def _read_journal(path):
+    """Replay a chat journal. Returns (chat data, stale record count, torn tail?)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return _replay(f)
+
+def _replay(lines):
+    data, base_tokens, message_tokens = None, 0, 0
+    stale, torn = 0, False
+    for line in lines:
+        if not line.endswith("\n"):
+            # Crash mid-append: the last record never finished
+            torn = True
+            break
+        try:
+            record = json.loads(line)
+        except ValueError:
+            torn = True
+            break
+        if "header" in record:
+            header = record["header"]
+            base_tokens = header.get("token_count", 0)
+            data = {
+                "id": header["id"],
+                "name": header["name"],
+                "created_at": header["created_at"],
+                "messages": [],
+            }
+            if header.get("summary"):
+                data["summary"] = header["summary"]
+        elif "meta" in record:
+            data.update(record["meta"])
+            stale += 1
+        else:
+            message_tokens += record.pop("tokens", 0)
+            data["messages"].append(record)
+    if data is None:
+        raise ValueError("journal has no header")
+    data["token_count"] = base_tokens + message_tokens
+    return data, stale, torn
+
+def read_chat(path):
+    """Load a saved chat (journal, legacy or archived) as {"id", "name", "created_at", "messages", "token_count"}."""
+    if path.endswith(ARCHIVE_EXT):
+        header, raw = read_archive_payload(path)
+        text = raw.decode("utf-8")
+        return _replay(io.StringIO(text))[0] if header.get("format") == ".jsonl" else json.loads(text)
+    if path.endswith(".jsonl"):
+        return _read_journal(path)[0]
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 class ChatManager:
-    def __init__(self, history_dir="chat_history", max_tokens=50000):
+    """Chat history stored as one append-only JSONL journal per chat.
+
+    Line 1 is a header (id, name, created_at, token_count not attributed to a
+    message), then one line per message. Renames append a small meta record.
+    An append writes one line, so its cost doesn't grow with the chat. The
+    journal is compacted (rewritten atomically) when meta records pile up,
+    after a torn write, or when a legacy .json chat is first appended to.
+    All writes go through a write-behind PersistenceWorker, so callers
+    (including the Qt thread) never wait on the disk. The public methods take
+    self.lock: messages arrive on the Qt thread while naming and summaries
+    run on background threads.
+
+    history_mode "rotate" starts a new chat at max_tokens. "summarize" keeps
+    the chat and instead folds older turns into a running summary (stored as
+    {"text", "covers"}: the first `covers` messages are summarized) once the
+    unsummarized tail exceeds summarize_at tokens; get_context() then returns
+    the summary followed by the recent messages.
+    """
+
+    def __init__(self, history_dir="chat_history", max_tokens=50000, compact_after=32, writer=None,
+                 history_mode="rotate", summarize_at=1500, keep_recent=6):
         self.history_dir = history_dir
         self.max_tokens = max_tokens
+        self.compact_after = compact_after
+        self.history_mode = history_mode
+        self.summarize_at = summarize_at
+        self.keep_recent = keep_recent
+        # Swapped for the LLM tokenizer's counter once a model is loaded
+        self.count_tokens = estimate_tokens
+        self.unsummarized_tokens = 0
+        # Called as listener(chat_id, message_index, message) after every add_message
+        self.listeners = []
+        self.writer = writer or get_persistence()
         self.current_chat_id = None
         self.current_chat_data = None
         self.token_count = 0
-        
+        self.current_path = None
+        self.stale_records = 0
+        self.lock = threading.Lock()
+
         if not os.path.exists(self.history_dir):
             os.makedirs(self.history_dir)
-            
+        self.index = ChatIndex(self.history_dir, writer=self.writer)
+
         self.load_latest_or_create()
 
     def load_latest_or_create(self):
-        # Find latest chat file
-        files = [f for f in os.listdir(self.history_dir) if f.endswith('.json')]
-        if not files:
+        latest = self.index.latest()
+        if latest is None:
             self.create_new_chat()
         else:
-            # Sort by modification time
-            latest_file = max(files, key=lambda x: os.path.getmtime(os.path.join(self.history_dir, x)))
-            self.load_chat(latest_file.replace('.json', ''))
+            self.load_chat(latest)
+
+    def list_chats(self, offset=0, limit=50):
+        """Chat metadata (id, name, times, message/token counts), newest first."""
+        return self.index.list(offset, limit)
+
+    def _update_index(self):
+        data = self.current_chat_data
+        self.index.update(self.current_chat_id, data.get("name", ""), data.get("created_at", ""),
+                          len(data["messages"]), self.token_count)
 
     def create_new_chat(self, name=None):
+        if self.current_chat_data and self.stale_records:
+            self.compact()
         self.current_chat_id = str(uuid.uuid4())
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
+
         self.current_chat_data = {
             "id": self.current_chat_id,
             "name": name or f"Chat {timestamp}",
@@ -39,62 +150,209 @@ class ChatManager:
             "token_count": 0
         }
         self.token_count = 0
+        self.unsummarized_tokens = 0
+        self.current_path = self._journal_path(self.current_chat_id)
         self.save_chat()
         print(f"🆕 Created new chat: {self.current_chat_data['name']}")
 
     def load_chat(self, chat_id):
-        path = os.path.join(self.history_dir, f"{chat_id}.json")
+        # Queued writes must land before we read the file back
+        self.writer.flush()
+        journal_path = self._journal_path(chat_id)
+        legacy_path = os.path.join(self.history_dir, f"{chat_id}.json")
         try:
-            with open(path, 'r') as f:
-                self.current_chat_data = json.load(f)
-                self.current_chat_id = self.current_chat_data.get("id", chat_id)
-                self.token_count = self.current_chat_data.get("token_count", 0)
-                print(f"📂 Loaded chat: {self.current_chat_data.get('name', chat_id)}")
+            if not os.path.exists(journal_path) and not os.path.exists(legacy_path) \
+                    and os.path.exists(archive_path(self.history_dir, chat_id)):
+                # Archived chats are decompressed only when opened
+                restore_archive(self.history_dir, chat_id)
+                self.index.annotate(chat_id, archived=False)
+            if os.path.exists(journal_path):
+                self.current_chat_data, self.stale_records, torn = _read_journal(journal_path)
+                self.current_path = journal_path
+            else:
+                with open(legacy_path, 'r') as f:
+                    self.current_chat_data = json.load(f)
+                self.current_path = legacy_path
+                torn = False
+            self.current_chat_id = self.current_chat_data.get("id", chat_id)
+            self.token_count = self.current_chat_data.get("token_count", 0)
+            self._recount_unsummarized()
+            print(f"📂 Loaded chat: {self.current_chat_data.get('name', chat_id)}")
+            if torn:
+                print(f"⚠️ Chat {chat_id} had an incomplete last write; repairing.")
+                self.compact()
         except Exception as e:
             print(f"❌ Failed to load chat {chat_id}: {e}")
             self.create_new_chat()
 
-    def save_chat(self):
+    def _journal_path(self, chat_id):
+        return os.path.join(self.history_dir, f"{chat_id}.jsonl")
+
+    def _migrate_legacy(self):
+        # Legacy chats become journals before their first append
+        if not self.current_path.endswith(".jsonl"):
+            self.compact()
+
+    def _append(self, record):
+        self.writer.append(self.current_path, json.dumps(record) + "\n")
+        self._update_index()
+
+    def compact(self):
+        """Queue an atomic rewrite of the current chat as header + messages."""
         if not self.current_chat_id: return
-        
-        path = os.path.join(self.history_dir, f"{self.current_chat_id}.json")
-        try:
-            with open(path, 'w') as f:
-                json.dump(self.current_chat_data, f, indent=4)
-        except Exception as e:
-            print(f"❌ Failed to save chat: {e}")
 
-    def add_message(self, role, content, tokens_approx=0):
-        if not self.current_chat_data:
-            self.create_new_chat()
-            
-        message = {
-            "role": role,
-            "content": content,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        data = self.current_chat_data
+        path = self._journal_path(self.current_chat_id)
+        # Compacted messages carry no per-message count; the header holds the total
+        header = {
+            "version": JOURNAL_VERSION,
+            "id": self.current_chat_id,
+            "name": data.get("name", f"Chat {self.current_chat_id}"),
+            "created_at": data.get("created_at", ""),
+            "token_count": self.token_count,
         }
-        self.current_chat_data["messages"].append(message)
-        
-        # Update token count (approximate if not provided)
-        if tokens_approx == 0:
-            tokens_approx = len(content) // 4  # Rough estimate
-            
-        self.token_count += tokens_approx
-        self.current_chat_data["token_count"] = self.token_count
-        
-        self.save_chat()
-        
-        # Check for rotation
-        if self.token_count >= self.max_tokens:
-            print(f"🔄 Token limit reached ({self.token_count}/{self.max_tokens}). Starting new chat.")
-            self.create_new_chat()
+        if data.get("summary"):
+            header["summary"] = data["summary"]
+        # Serialize on the writer thread from a snapshot of the message list
+        messages = list(data["messages"])
+        render = lambda: "".join(json.dumps(r) + "\n" for r in [{"header": header}] + messages)
+        on_done = None
+        if self.current_path != path:
+            # Migrated from the legacy format: drop the old file once the journal is on disk
+            legacy_path = self.current_path
+            def on_done():
+                try: os.remove(legacy_path)
+                except OSError: pass
+            self.current_path = path
+        self.writer.replace(path, render, on_done)
+        self.stale_records = 0
+        self._update_index()
+
+    def save_chat(self):
+        self.compact()
+
+    def add_message(self, role, content, tokens_approx=0):
+        with self.lock:
+            if not self.current_chat_data:
+                self.create_new_chat()
+            self._migrate_legacy()
+
+            message = {
+                "role": role,
+                "content": content,
+                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            self.current_chat_data["messages"].append(message)
+
+            # Update token count (tokenizer-based once an LLM is loaded)
+            if tokens_approx == 0:
+                tokens_approx = self.count_tokens(content)
+
+            self.token_count += tokens_approx
+            self.unsummarized_tokens += tokens_approx
+            self.current_chat_data["token_count"] = self.token_count
+
+            self._append({**message, "tokens": tokens_approx})
+            for listener in self.listeners:
+                listener(self.current_chat_id, len(self.current_chat_data["messages"]) - 1, message)
+
+            # Check for rotation
+            if self.history_mode == "rotate" and self.token_count >= self.max_tokens:
+                print(f"🔄 Token limit reached ({self.token_count}/{self.max_tokens}). Starting new chat.")
+                self.create_new_chat()
 
     def get_context(self, limit=10):
-        """Get recent messages for LLM context"""
-        if not self.current_chat_data: return []
-        return self.current_chat_data["messages"][-limit:]
+        """Get recent messages for LLM context, led by the running summary if there is one"""
+        with self.lock:
+            if not self.current_chat_data: return []
+            summary = self.current_chat_data.get("summary")
+            if not summary:
+                return self.current_chat_data["messages"][-limit:]
+            recent = self.current_chat_data["messages"][summary["covers"]:][-limit:]
+            return [{"role": "summary", "content": summary["text"]}] + recent
+
+    def set_token_counter(self, count_tokens):
+        """Count with a real tokenizer from now on (estimate_tokens to go back).
+
+        The open chat is recounted on a helper thread, since tokenizing a long
+        chat would stall the caller (the Qt thread, when a model loads).
+        """
+        with self.lock:
+            self.count_tokens = count_tokens
+            if not self.current_chat_data:
+                return
+            summary = self.current_chat_data.get("summary")
+            covers = summary["covers"] if summary else 0
+            snapshot = (count_tokens, self.current_chat_id, covers,
+                        self.current_chat_data["messages"][covers:], self.unsummarized_tokens)
+        threading.Thread(target=self._recount_in_background, args=snapshot, name="siris-recount", daemon=True).start()
+
+    def _recount_in_background(self, count_tokens, chat_id, covers, messages, counted_before):
+        try:
+            total = sum(count_tokens(m["content"]) for m in messages)
+        except Exception as e:
+            print(f"⚠️ Token recount failed: {e}")
+            return
+        with self.lock:
+            summary = (self.current_chat_data or {}).get("summary")
+            # A new counter, chat or summary since the snapshot has already recounted
+            if count_tokens is not self.count_tokens or chat_id != self.current_chat_id \
+                    or covers != (summary["covers"] if summary else 0):
+                return
+            # Messages added meanwhile were counted as they arrived
+            self.unsummarized_tokens = total + self.unsummarized_tokens - counted_before
+
+    # --- ROLLING SUMMARY ---
+    def _recount_unsummarized(self):
+        summary = (self.current_chat_data or {}).get("summary")
+        covers = summary["covers"] if summary else 0
+        self.unsummarized_tokens = sum(self.count_tokens(m["content"]) for m in self.current_chat_data["messages"][covers:])
+
+    def needs_summary(self):
+        if self.history_mode != "summarize" or not self.current_chat_data:
+            return False
+        summary = self.current_chat_data.get("summary")
+        covers = summary["covers"] if summary else 0
+        # Fold at least keep_recent messages per pass so a long tail doesn't trigger every turn
+        return (self.unsummarized_tokens >= self.summarize_at
+                and len(self.current_chat_data["messages"]) - covers >= 2 * self.keep_recent)
+
+    def summary_work(self):
+        """(chat id, previous summary text, messages to fold in, new covers) for the summarizer."""
+        with self.lock:
+            data = self.current_chat_data
+            summary = data.get("summary")
+            covers = summary["covers"] if summary else 0
+            new_covers = len(data["messages"]) - self.keep_recent
+            return self.current_chat_id, summary["text"] if summary else "", data["messages"][covers:new_covers], new_covers
+
+    def apply_summary(self, chat_id, text, covers):
+        """Store a summary computed in the background, unless the chat changed meanwhile."""
+        with self.lock:
+            if chat_id != self.current_chat_id or not text:
+                return False
+            previous = self.current_chat_data.get("summary")
+            if previous and previous["covers"] >= covers:
+                return False
+            self._migrate_legacy()
+            self.current_chat_data["summary"] = {"text": text, "covers": covers}
+            self._recount_unsummarized()
+            self._append({"meta": {"summary": self.current_chat_data["summary"]}})
+            self.stale_records += 1
+            if self.stale_records >= self.compact_after:
+                self.compact()
+            return True
 
     def set_chat_name(self, name):
-        if self.current_chat_data:
-            self.current_chat_data["name"] = name
-            self.save_chat()
+        with self.lock:
+            if self.current_chat_data:
+                self._migrate_legacy()
+                self.current_chat_data["name"] = name
+                self._append({"meta": {"name": name}})
+                self.stale_records += 1
+                if self.stale_records >= self.compact_after:
+                    self.compact()
+
+    def close(self):
+        """Wait for queued writes of this (and every other) chat to reach disk."""
+        self.writer.flush()
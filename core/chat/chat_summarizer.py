@@ -0,0 +1,45 @@
+class ChatSummarizer:
+    """Folds older turns of a long chat into a running summary, in the background."""
+
+    def __init__(self, llm_engine, max_tokens=160):
+        self.llm = llm_engine
+        self.max_tokens = max_tokens
+
+    def summarize(self, previous, messages, cancel_token=None):
+        """New running summary covering `previous` plus `messages`, or None if cancelled/failed"""
+        conversation_text = ""
+        for msg in messages:
+            conversation_text += f"{msg['role']}: {msg['content']}\n"
+
+        prompt = (
+            f"Update the running summary of a conversation between a user and Siris with the new messages below. "
+            f"Keep names, facts, decisions and open questions; drop small talk. "
+            f"Write at most 6 short sentences. Just the summary.\n\n"
+            f"Current summary:\n{previous or '(none yet)'}\n\n"
+            f"New messages:\n{conversation_text}\nUpdated summary:"
+        )
+
+        try:
+            summary = self.llm.generate(prompt, max_tokens=self.max_tokens, cancel_token=cancel_token)
+            if cancel_token and cancel_token.cancelled:
+                return None
+            summary = summary.strip()
+            if not summary or summary.startswith("Error:"):
+                return None
+            return summary
+        except Exception as e:
+            print(f"⚠️ Failed to summarize chat: {e}")
+            return None
+
+    def run(self, chat_manager, cancel_token=None):
+        """Summarize the current chat if it has grown past its threshold. True if a summary was stored."""
+        if not chat_manager.needs_summary():
+            return False
+        chat_id, previous, messages, covers = chat_manager.summary_work()
+        summary = self.summarize(previous, messages, cancel_token)
+        if summary is None:
+            return False
+        stored = chat_manager.apply_summary(chat_id, summary, covers)
+        if stored:
+            print(f"🧾 Summarized {len(messages)} older messages")
+        return stored
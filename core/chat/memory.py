@@ -0,0 +1,269 @@
+import os
+import re
+import json
+import time
+import zlib
+import queue
+import threading
+import numpy as np
+
+from core.chat.chat_manager import read_chat, chat_id_from_file
+
+class HashingEmbedder:
+    """Dependency-free fallback: signed feature hashing of words and word pairs, L2-normalized."""
+
+    def __init__(self, dim=512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"[a-z0-9]+", text.lower())
+            for feature in words + [a + " " + b for a, b in zip(words, words[1:])]:
+                h = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-6)
+
+class SentenceEmbedder:
+    """Small sentence-transformers model on CPU (e.g. all-MiniLM-L6-v2)."""
+
+    def __init__(self, model_path):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_path, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = os.path.basename(os.path.normpath(model_path))
+
+    def embed(self, texts):
+        return self.model.encode(texts, batch_size=32, normalize_embeddings=True,
+                                 convert_to_numpy=True).astype(np.float32)
+
+def load_embedder(config_path="config/paths.json"):
+    """The configured embedding model (paths.json "embedding.model_path"), else the hashing fallback."""
+    try:
+        with open(config_path, "r") as f:
+            model_path = json.load(f).get("embedding", {}).get("model_path")
+        if model_path:
+            return SentenceEmbedder(model_path)
+    except Exception as e:
+        print(f"⚠️ Embedding model unavailable ({e}); using hashed word features.")
+    return HashingEmbedder()
+
+class VectorStore:
+    """Append-only float16 vectors in a memory-mapped file plus one JSONL metadata line per row.
+
+    Search runs on a float32 copy kept in RAM and grown with every add, so a
+    query is one BLAS matrix-vector product. Rows below count are never
+    rewritten, which lets search score a snapshot without holding the lock.
+
+    Search stays exact and is bound by memory bandwidth: about 0.14 ms per
+    1000 rows of 384 floats on one core, so a few ms up to ~20k exchanges
+    (years of daily use) and ~15 ms at 100k. Past that an approximate index
+    (IVF/HNSW) would be needed.
+    """
+
+    def __init__(self, directory, dim, initial_capacity=1024):
+        self.directory = directory
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, "vectors.f16")
+        self.meta_path = os.path.join(directory, "meta.jsonl")
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+        self.meta = []
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        self.meta.append(json.loads(line))
+        row_bytes = dim * 2
+        existing = os.path.getsize(self.vectors_path) // row_bytes if os.path.exists(self.vectors_path) else 0
+        # Rows whose vector or metadata didn't make it to disk are dropped
+        self.count = min(len(self.meta), existing)
+        del self.meta[self.count:]
+        self.capacity = 0
+        self.matrix = None
+        self._grow(max(initial_capacity, existing))
+        self.shadow = np.zeros((max(initial_capacity, self.count), dim), dtype=np.float32)
+        self.shadow[:self.count] = self.matrix[:self.count]
+
+    def _grow(self, capacity):
+        if self.matrix is not None:
+            self.matrix.flush()
+            del self.matrix
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(capacity * self.dim * 2)
+        self.matrix = np.memmap(self.vectors_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+        self.capacity = capacity
+
+    def add(self, vectors, metas):
+        with self.lock:
+            needed = self.count + len(vectors)
+            if needed > self.capacity:
+                self._grow(max(needed, self.capacity * 2))
+            self.matrix[self.count:needed] = vectors.astype(np.float16)
+            self.matrix.flush()
+            if needed > len(self.shadow):
+                # Searches still hold the old array; it stays valid for their rows
+                shadow = np.zeros((max(needed, len(self.shadow) * 2), self.dim), dtype=np.float32)
+                shadow[:self.count] = self.shadow[:self.count]
+                self.shadow = shadow
+            # Same rounding as the file, so scores don't depend on when the store was loaded
+            self.shadow[self.count:needed] = self.matrix[self.count:needed]
+            # Metadata last: a row only counts once its line is written
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                for meta in metas:
+                    f.write(json.dumps(meta) + "\n")
+            self.meta.extend(metas)
+            self.count = needed
+
+    def search(self, query_vector, k=3, exclude=None):
+        """Top-k (score, meta) by cosine similarity. exclude(meta) -> True drops a row."""
+        query = query_vector.astype(np.float32)
+        with self.lock:
+            # Snapshot only: adds append past n, so scoring can run unlocked
+            n, shadow, metas = self.count, self.shadow, self.meta
+        hits = []
+        if n == 0:
+            return hits
+        scores = shadow[:n] @ query
+        # Over-fetch so exclusions still leave k results
+        take = min(n, k * 4 + 8)
+        top = np.argpartition(-scores, take - 1)[:take]
+        for row in top[np.argsort(-scores[top])]:
+            if exclude and exclude(metas[row]):
+                continue
+            hits.append((float(scores[row]), metas[row]))
+            if len(hits) >= k:
+                break
+        return hits
+
+    def keys(self):
+        with self.lock:
+            return {(meta["chat_id"], meta["index"]) for meta in self.meta}
+
+class SemanticMemory:
+    """Long-term memory over every chat: user/assistant exchanges embedded in the background.
+
+    Messages arrive through ChatManager listeners. Each completed exchange is
+    queued, embedded in batches on a worker thread, and appended to the
+    VectorStore, so adding never blocks the caller and search covers
+    everything embedded so far.
+    """
+
+    def __init__(self, directory="memory", embedder=None, batch_size=32, flush_interval=2.0, max_chars=1200):
+        self.embedder = embedder or load_embedder()
+        self.directory = os.path.join(directory, self.embedder.name)
+        self.store = VectorStore(self.directory, self.embedder.dim)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_chars = max_chars
+        self.pending_user = {}  # chat id -> (index, user message) waiting for its answer
+        self.queue = queue.Queue()
+        self.stats = {"embedded": 0, "batches": 0, "embed_ms": 0.0}
+        self.thread = threading.Thread(target=self._run, name="siris-memory", daemon=True)
+        self.thread.start()
+
+    # --- INGEST ---
+    def on_message(self, chat_id, index, message):
+        """ChatManager listener: pair each assistant reply with the user message before it."""
+        if message["role"] == "user":
+            self.pending_user[chat_id] = (index, message)
+            return
+        user = self.pending_user.pop(chat_id, None)
+        if message["role"] != "assistant" or user is None:
+            return
+        text = f"user: {user[1]['content']}\nassistant: {message['content']}"[:self.max_chars]
+        self._enqueue(text, {"chat_id": chat_id, "index": index, "timestamp": message.get("timestamp", ""), "text": text})
+
+    def _enqueue(self, text, meta):
+        self.queue.put((text, meta))
+
+    def backfill(self, chat_dir="chat_history"):
+        """Embed exchanges saved while memory wasn't running. Only chats changed since the last backfill are read."""
+        state_path = os.path.join(self.directory, "backfill.json")
+        try:
+            with open(state_path, "r") as f:
+                since = json.load(f)["backfilled_at"]
+        except Exception:
+            since = 0.0
+        started = time.time()
+        known = self.store.keys()
+        queued = 0
+        for name in sorted(os.listdir(chat_dir)):
+            chat_id = chat_id_from_file(name)
+            path = os.path.join(chat_dir, name)
+            if not chat_id or os.path.getmtime(path) < since:
+                continue
+            try:
+                data = read_chat(path)
+            except Exception:
+                continue
+            chat_id = data.get("id", chat_id)
+            pending = None
+            for index, message in enumerate(data.get("messages", [])):
+                if message["role"] == "user":
+                    pending = message
+                elif message["role"] == "assistant" and pending and (chat_id, index) not in known:
+                    text = f"user: {pending['content']}\nassistant: {message['content']}"[:self.max_chars]
+                    self._enqueue(text, {"chat_id": chat_id, "index": index,
+                                         "timestamp": message.get("timestamp", ""), "text": text})
+                    queued += 1
+                    pending = None
+        self.flush()
+        with open(state_path, "w") as f:
+            json.dump({"backfilled_at": started}, f)
+        if queued:
+            print(f"🧠 Added {queued} past exchanges to long-term memory")
+        return queued
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            # Let a burst (backfill, a fast exchange) accumulate into one batch
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                start = time.perf_counter()
+                vectors = self.embedder.embed([text for text, _ in batch])
+                self.store.add(vectors, [meta for _, meta in batch])
+                self.stats["embedded"] += len(batch)
+                self.stats["batches"] += 1
+                self.stats["embed_ms"] += (time.perf_counter() - start) * 1000
+            except Exception as e:
+                print(f"⚠️ Memory embedding failed: {e}")
+            for _ in batch:
+                self.queue.task_done()
+
+    def flush(self, timeout=30.0):
+        """Wait until everything queued so far is searchable. False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.queue.all_tasks_done.wait(remaining):
+                    return False
+        return True
+
+    # --- RETRIEVAL ---
+    def search(self, query, k=3, min_score=0.35, exclude_chat=None, exclude_from_index=0):
+        """Top-k past exchanges relevant to query. Exchanges of exclude_chat at or after
+        exclude_from_index (already in the prompt's history) are skipped."""
+        if not query.strip():
+            return []
+        vector = self.embedder.embed([query])[0]
+        exclude = None
+        if exclude_chat:
+            exclude = lambda meta: meta["chat_id"] == exclude_chat and meta["index"] >= exclude_from_index
+        return [dict(meta, score=score) for score, meta in self.store.search(vector, k, exclude) if score >= min_score]
+
+    def format_hits(self, hits):
+        return "\n\n".join(f"[{hit['timestamp']}]\n{hit['text']}" for hit in hits)
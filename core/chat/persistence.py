@@ -0,0 +1,155 @@
+import os
+import time
+import atexit
+import threading
+from collections import OrderedDict, deque
+
+from core.telemetry.tracer import percentile
+
+class PersistenceWorker:
+    """Write-behind disk writer so chat saves never block the calling (often Qt) thread.
+
+    Work is queued per file path, in first-queued order. Pending appends to a
+    path are coalesced into a single write. A full snapshot of a path
+    supersedes the appends queued before it (the snapshot already contains
+    them) and is written atomically via temp file + fsync + rename. Arbitrary
+    ordered jobs (e.g. SQLite inserts) go through call().
+    """
+
+    CALLS = "__calls__"
+
+    def __init__(self, name="siris-persist", latency_window=256):
+        self.lock = threading.Condition()
+        self.pending = OrderedDict()  # path -> {"snapshot": (render, on_done) or None, "appends": [str]}
+        self.busy = False
+        self.stopped = False
+        self.latencies = deque(maxlen=latency_window)  # seconds per path flush
+        self.metrics = {"writes": 0, "snapshots": 0, "appends": 0, "coalesced": 0,
+                        "bytes": 0, "errors": 0, "calls": 0}
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.thread.start()
+
+    # --- SUBMIT ---
+    def append(self, path, text):
+        with self.lock:
+            job = self._job(path)
+            if job["appends"]:
+                self.metrics["coalesced"] += 1
+            job["appends"].append(text)
+            self.metrics["appends"] += 1
+            self.lock.notify()
+
+    def replace(self, path, render, on_done=None):
+        """Atomically rewrite path with render() (called on the writer thread; pass it a snapshot)."""
+        with self.lock:
+            job = self._job(path)
+            if job["snapshot"] or job["appends"]:
+                self.metrics["coalesced"] += 1
+            job["snapshot"] = (render, on_done)
+            job["appends"] = []
+            self.lock.notify()
+
+    def call(self, fn):
+        """Run fn on the writer thread, in order with other call() jobs."""
+        with self.lock:
+            self._job(self.CALLS)["appends"].append(fn)
+            self.lock.notify()
+
+    def _job(self, path):
+        job = self.pending.get(path)
+        if job is None:
+            job = self.pending[path] = {"snapshot": None, "appends": []}
+        return job
+
+    # --- WRITER THREAD ---
+    def _run(self):
+        while True:
+            with self.lock:
+                while not self.pending and not self.stopped:
+                    self.lock.wait()
+                if not self.pending and self.stopped:
+                    return
+                path, job = self.pending.popitem(last=False)
+                self.busy = True
+            start = time.perf_counter()
+            try:
+                if path == self.CALLS:
+                    for fn in job["appends"]:
+                        fn()
+                        self.metrics["calls"] += 1
+                else:
+                    self._write(path, job)
+            except Exception as e:
+                self.metrics["errors"] += 1
+                print(f"❌ Failed to save {path}: {e}")
+            finally:
+                with self.lock:
+                    self.latencies.append(time.perf_counter() - start)
+                    self.busy = False
+                    self.lock.notify_all()
+
+    def _write(self, path, job):
+        if job["snapshot"]:
+            render, on_done = job["snapshot"]
+            data = render()
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self.metrics["snapshots"] += 1
+            self.metrics["bytes"] += len(data)
+            if on_done:
+                on_done()
+        if job["appends"]:
+            data = "".join(job["appends"])
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(data)
+            self.metrics["bytes"] += len(data)
+        self.metrics["writes"] += 1
+
+    # --- SHUTDOWN / METRICS ---
+    def flush(self, timeout=10.0):
+        """Block until everything queued so far is on disk. False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self.lock:
+            while self.pending or self.busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.lock.wait(remaining)
+        return True
+
+    def close(self, timeout=10.0):
+        flushed = self.flush(timeout)
+        with self.lock:
+            self.stopped = True
+            self.lock.notify_all()
+        self.thread.join(timeout)
+        return flushed
+
+    def stats(self):
+        with self.lock:
+            depth = sum((1 if job["snapshot"] else 0) + len(job["appends"]) for job in self.pending.values())
+            latencies = sorted(self.latencies)
+            stats = dict(self.metrics)
+            stats["queue_depth"] = depth
+            stats["pending_paths"] = len(self.pending)
+        if latencies:
+            stats["write_ms_p50"] = percentile(latencies, 50) * 1000
+            stats["write_ms_p95"] = percentile(latencies, 95) * 1000
+            stats["write_ms_max"] = latencies[-1] * 1000
+        return stats
+
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_persistence():
+    """Shared writer, flushed at interpreter exit."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = PersistenceWorker()
+            atexit.register(_worker.close)
+        return _worker
@@ -0,0 +1,197 @@
+import os
+import re
+import json
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+from core.chat.chat_manager import ChatManager
+
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+META_FILE = "session.meta"  # not .json, so ChatManager doesn't mistake it for a chat
+
+class Session:
+    """One conversation: its own ChatManager (history + token count) and per-session settings."""
+
+    def __init__(self, session_id, directory, max_tokens=50000):
+        self.id = session_id
+        self.directory = directory
+        self.lock = threading.RLock()
+        self.pins = 0
+        self.settings = {}
+        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.last_used = time.time()
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_meta()
+        self.chat = ChatManager(history_dir=directory, max_tokens=max_tokens)
+
+    @property
+    def token_count(self):
+        return self.chat.token_count
+
+    def history(self, limit=10):
+        return self.chat.get_context(limit=limit)
+
+    def _load_meta(self):
+        path = os.path.join(self.directory, META_FILE)
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r") as f:
+                meta = json.load(f)
+            self.settings = meta.get("settings", {})
+            self.created_at = meta.get("created_at", self.created_at)
+        except Exception as e:
+            print(f"⚠️ Session {self.id} metadata unreadable: {e}")
+
+    def save(self):
+        path = os.path.join(self.directory, META_FILE)
+        meta = {
+            "id": self.id,
+            "created_at": self.created_at,
+            "last_used": self.last_used,
+            "settings": self.settings,
+            "token_count": self.token_count,
+        }
+        try:
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(meta, f, indent=4)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"❌ Failed to save session {self.id}: {e}")
+
+class SessionManager:
+    """Thread-safe session registry with a bounded in-memory LRU; evicted sessions live on disk."""
+
+    def __init__(self, root="chat_history/sessions", max_cached=32, max_tokens=50000):
+        self.root = root
+        self.max_cached = max_cached
+        self.max_tokens = max_tokens
+        self.cache = OrderedDict()  # session_id -> Session, least recently used first
+        self.lock = threading.Lock()
+        self.closing = {}  # session_id -> Event set once the evicted session is on disk
+        self.loads = 0
+        self.evictions = 0
+        os.makedirs(root, exist_ok=True)
+
+    def create(self, settings=None, session_id=None):
+        session_id = session_id or uuid.uuid4().hex
+        with self.use(session_id) as session:
+            if settings:
+                session.settings.update(settings)
+            session.save()
+        return session_id
+
+    def exists(self, session_id):
+        return bool(SESSION_ID_PATTERN.match(session_id or "")) and (
+            session_id in self.cache or os.path.isdir(os.path.join(self.root, session_id)))
+
+    @contextmanager
+    def use(self, session_id, create=True):
+        """Pin a session in memory and hold its lock for the duration of one request."""
+        session = self._checkout(session_id, create)
+        try:
+            with session.lock:
+                session.last_used = time.time()
+                yield session
+        finally:
+            with self.lock:
+                session.pins -= 1
+                evicted = self._evict_locked()
+            self._close_evicted(evicted)
+
+    def _checkout(self, session_id, create):
+        if not SESSION_ID_PATTERN.match(session_id or ""):
+            raise ValueError(f"invalid session id: {session_id!r}")
+        with self.lock:
+            session = self.cache.get(session_id)
+            if session is not None:
+                self.cache.move_to_end(session_id)
+                session.pins += 1
+                return session
+            closing = self.closing.get(session_id)
+
+        if closing:
+            # Evicted a moment ago: let its queued writes land before reading it back
+            closing.wait()
+        # Load from disk without blocking requests for other sessions
+        directory = os.path.join(self.root, session_id)
+        if not create and not os.path.isdir(directory):
+            raise KeyError(f"unknown session: {session_id}")
+        loaded = Session(session_id, directory, self.max_tokens)
+
+        with self.lock:
+            # Another thread may have loaded it meanwhile; keep the first one
+            session = self.cache.setdefault(session_id, loaded)
+            if session is loaded:
+                self.loads += 1
+            self.cache.move_to_end(session_id)
+            session.pins += 1
+            return session
+
+    def _evict_locked(self):
+        """Pop least recently used sessions over the limit; the caller closes them after unlocking."""
+        evicted = []
+        for session_id in list(self.cache):
+            if len(self.cache) <= self.max_cached:
+                break
+            session = self.cache[session_id]
+            # Sessions in use by a request stay resident
+            if session.pins > 0:
+                continue
+            del self.cache[session_id]
+            self.closing[session_id] = threading.Event()
+            self.evictions += 1
+            evicted.append(session)
+        return evicted
+
+    def _close_evicted(self, sessions):
+        # Saving flushes the shared write-behind queue, so it never runs under self.lock
+        for session in sessions:
+            try:
+                session.save()
+                session.chat.close()
+            finally:
+                with self.lock:
+                    self.closing.pop(session.id).set()
+
+    def update_settings(self, session_id, **settings):
+        with self.use(session_id, create=False) as session:
+            session.settings.update(settings)
+            session.save()
+            return dict(session.settings)
+
+    def list_sessions(self):
+        with self.lock:
+            live = {session_id: (session.token_count, session.last_used) for session_id, session in self.cache.items()}
+        sessions = []
+        for name in sorted(os.listdir(self.root)):
+            path = os.path.join(self.root, name, META_FILE)
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, "r") as f:
+                    meta = json.load(f)
+            except Exception:
+                continue
+            if name in live:
+                meta["token_count"], meta["last_used"] = live[name]
+            sessions.append(meta)
+        return sessions
+
+    def stats(self):
+        with self.lock:
+            return {"cached": len(self.cache), "max_cached": self.max_cached,
+                    "loads": self.loads, "evictions": self.evictions}
+
+    def flush(self):
+        with self.lock:
+            sessions = list(self.cache.values())
+        for session in sessions:
+            with session.lock:
+                session.save()
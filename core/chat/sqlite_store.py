@@ -0,0 +1,332 @@
+import os
+import re
+import sys
+import time
+import uuid
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+from core.chat.chat_manager import read_chat, chat_id_from_file, estimate_tokens
+from core.chat.persistence import get_persistence
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    token_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS chats_updated ON chats(updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    chat_id TEXT NOT NULL REFERENCES chats(id) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    tokens INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS messages_chat ON messages(chat_id, id);
+"""
+
+# External-content FTS table kept in sync by triggers
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(content, content='messages', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, content) VALUES (new.id, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts(messages_fts, rowid, content) VALUES ('delete', old.id, old.content);
+END;
+"""
+
+def fts_query(text):
+    """Quote each word so user input can't trip FTS5 query syntax; the last word also matches as a prefix."""
+    words = [f'"{word}"' for word in re.findall(r"\w+", text)]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+class ChatStore:
+    """SQLite chat history (WAL) with full-text search over message content.
+
+    Connections aren't shareable across threads, so each thread gets its own;
+    WAL lets readers on those connections run alongside the single writer.
+    Every connection is also tracked so close() can shut them all.
+    """
+
+    def __init__(self, db_path="chat_history/siris.db"):
+        self.db_path = db_path
+        self.local = threading.local()
+        self.connections = []
+        self.connections_lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            print("⚠️ SQLite built without FTS5; history search falls back to LIKE.")
+            self.has_fts = False
+        conn.commit()
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None or conn not in self.connections:
+            # Still used by one thread only; the flag just lets close() run from any thread
+            conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self.local.conn = conn
+            with self.connections_lock:
+                self.connections.append(conn)
+        return conn
+
+    def close(self):
+        """Close every thread's connection; a thread that uses the store again reconnects."""
+        with self.connections_lock:
+            connections, self.connections = self.connections, []
+        for conn in connections:
+            conn.close()
+
+    # --- WRITES ---
+    def create_chat(self, chat_id, name, created_at):
+        with self.connection() as conn:
+            conn.execute("INSERT INTO chats (id, name, created_at, updated_at) VALUES (?, ?, ?, ?)",
+                         (chat_id, name, created_at, time.time()))
+
+    def add_message(self, chat_id, message, tokens):
+        with self.connection() as conn:
+            conn.execute("INSERT INTO messages (chat_id, role, content, timestamp, tokens) VALUES (?, ?, ?, ?, ?)",
+                         (chat_id, message["role"], message["content"], message["timestamp"], tokens))
+            conn.execute("UPDATE chats SET updated_at = ?, message_count = message_count + 1, "
+                         "token_count = token_count + ? WHERE id = ?", (time.time(), tokens, chat_id))
+
+    def rename_chat(self, chat_id, name):
+        with self.connection() as conn:
+            conn.execute("UPDATE chats SET name = ?, updated_at = ? WHERE id = ?", (name, time.time(), chat_id))
+
+    def delete_chat(self, chat_id):
+        with self.connection() as conn:
+            conn.execute("DELETE FROM chats WHERE id = ?", (chat_id,))
+
+    # --- READS ---
+    def latest_chat(self):
+        row = self.connection().execute("SELECT id FROM chats ORDER BY updated_at DESC LIMIT 1").fetchone()
+        return row["id"] if row else None
+
+    def load_chat(self, chat_id):
+        conn = self.connection()
+        chat = conn.execute("SELECT * FROM chats WHERE id = ?", (chat_id,)).fetchone()
+        if chat is None:
+            return None
+        messages = conn.execute("SELECT role, content, timestamp FROM messages WHERE chat_id = ? ORDER BY id",
+                                (chat_id,)).fetchall()
+        return {
+            "id": chat["id"],
+            "name": chat["name"],
+            "created_at": chat["created_at"],
+            "messages": [dict(m) for m in messages],
+            "token_count": chat["token_count"],
+        }
+
+    def list_chats(self, offset=0, limit=50):
+        rows = self.connection().execute(
+            "SELECT * FROM chats ORDER BY updated_at DESC LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+        return [dict(r) for r in rows]
+
+    def search(self, query, limit=10, chat_id=None):
+        """Best-matching messages across all chats, with a highlighted snippet each."""
+        match = fts_query(query)
+        if not match:
+            return []
+        chat_filter = "AND m.chat_id = ?" if chat_id else ""
+        params = [match] + ([chat_id] if chat_id else []) + [limit]
+        if self.has_fts:
+            sql = f"""
+                SELECT m.chat_id, c.name AS chat_name, m.role, m.timestamp,
+                       snippet(messages_fts, 0, '[', ']', '…', 12) AS snippet,
+                       bm25(messages_fts) AS score
+                FROM messages_fts
+                JOIN messages m ON m.id = messages_fts.rowid
+                JOIN chats c ON c.id = m.chat_id
+                WHERE messages_fts MATCH ? {chat_filter}
+                ORDER BY score LIMIT ?"""
+        else:
+            params[0] = f"%{query.strip()}%"
+            sql = f"""
+                SELECT m.chat_id, c.name AS chat_name, m.role, m.timestamp,
+                       substr(m.content, 1, 160) AS snippet, 0.0 AS score
+                FROM messages m JOIN chats c ON c.id = m.chat_id
+                WHERE m.content LIKE ? {chat_filter}
+                ORDER BY m.id DESC LIMIT ?"""
+        rows = self.connection().execute(sql, params).fetchall()
+        # bm25() is lower-is-better; flip it so callers can treat higher as better
+        return [{**dict(r), "score": -r["score"]} for r in rows]
+
+    # --- IMPORT ---
+    def import_history(self, chat_dir="chat_history"):
+        """Copy file-based chats (.json / .jsonl) into the database. Already imported ids are skipped."""
+        imported = skipped = 0
+        conn = self.connection()
+        existing = {row["id"] for row in conn.execute("SELECT id FROM chats")}
+        with conn:
+            for name in sorted(os.listdir(chat_dir)):
+                if not chat_id_from_file(name):
+                    continue
+                path = os.path.join(chat_dir, name)
+                try:
+                    data = read_chat(path)
+                except Exception as e:
+                    print(f"⚠️ Skipping unreadable chat {name}: {e}")
+                    continue
+                chat_id = data.get("id") or chat_id_from_file(name)
+                if chat_id in existing:
+                    skipped += 1
+                    continue
+                messages = data.get("messages", [])
+                conn.execute("INSERT INTO chats VALUES (?, ?, ?, ?, ?, ?)",
+                             (chat_id, data.get("name", chat_id), data.get("created_at", ""),
+                              os.path.getmtime(path), len(messages), data.get("token_count", 0)))
+                conn.executemany("INSERT INTO messages (chat_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+                                 [(chat_id, m["role"], m["content"], m.get("timestamp", "")) for m in messages])
+                existing.add(chat_id)
+                imported += 1
+        print(f"📥 Imported {imported} chats ({skipped} already present)")
+        return imported
+
+class SQLiteChatManager:
+    """Drop-in for ChatManager that keeps history in a ChatStore; writes go through the write-behind worker."""
+
+    def __init__(self, db_path="chat_history/siris.db", max_tokens=50000, store=None, writer=None,
+                 import_from="chat_history"):
+        self.store = store or ChatStore(db_path)
+        if import_from and os.path.isdir(import_from) and self.store.latest_chat() is None:
+            # First start on this backend: bring the file-based history along
+            self.store.import_history(import_from)
+        self.writer = writer or get_persistence()
+        self.max_tokens = max_tokens
+        self.count_tokens = estimate_tokens
+        self.current_chat_id = None
+        self.current_chat_data = None
+        self.token_count = 0
+        # Called as listener(chat_id, message_index, message) after every add_message
+        self.listeners = []
+        self.load_latest_or_create()
+
+    def load_latest_or_create(self):
+        latest = self.store.latest_chat()
+        if latest is None:
+            self.create_new_chat()
+        else:
+            self.load_chat(latest)
+
+    def create_new_chat(self, name=None):
+        self.current_chat_id = str(uuid.uuid4())
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.current_chat_data = {
+            "id": self.current_chat_id,
+            "name": name or f"Chat {timestamp}",
+            "created_at": timestamp,
+            "messages": [],
+            "token_count": 0
+        }
+        self.token_count = 0
+        self.writer.call(lambda chat_id=self.current_chat_id, name=self.current_chat_data["name"]:
+                         self.store.create_chat(chat_id, name, timestamp))
+        print(f"🆕 Created new chat: {self.current_chat_data['name']}")
+
+    def load_chat(self, chat_id):
+        self.writer.flush()
+        data = self.store.load_chat(chat_id)
+        if data is None:
+            print(f"❌ Failed to load chat {chat_id}: not found")
+            self.create_new_chat()
+            return
+        self.current_chat_data = data
+        self.current_chat_id = data["id"]
+        self.token_count = data["token_count"]
+        print(f"📂 Loaded chat: {data['name']}")
+
+    def add_message(self, role, content, tokens_approx=0):
+        if not self.current_chat_data:
+            self.create_new_chat()
+
+        message = {
+            "role": role,
+            "content": content,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self.current_chat_data["messages"].append(message)
+
+        # Update token count (tokenizer-based once an LLM is loaded)
+        if tokens_approx == 0:
+            tokens_approx = self.count_tokens(content)
+
+        self.token_count += tokens_approx
+        self.current_chat_data["token_count"] = self.token_count
+        self.writer.call(lambda chat_id=self.current_chat_id: self.store.add_message(chat_id, message, tokens_approx))
+        for listener in self.listeners:
+            listener(self.current_chat_id, len(self.current_chat_data["messages"]) - 1, message)
+
+        # Check for rotation
+        if self.token_count >= self.max_tokens:
+            print(f"🔄 Token limit reached ({self.token_count}/{self.max_tokens}). Starting new chat.")
+            self.create_new_chat()
+
+    def get_context(self, limit=10):
+        """Get recent messages for LLM context"""
+        if not self.current_chat_data: return []
+        return self.current_chat_data["messages"][-limit:]
+
+    def set_chat_name(self, name):
+        if self.current_chat_data:
+            self.current_chat_data["name"] = name
+            self.writer.call(lambda chat_id=self.current_chat_id: self.store.rename_chat(chat_id, name))
+
+    def set_token_counter(self, count_tokens):
+        self.count_tokens = count_tokens
+
+    def needs_summary(self):
+        # Rolling summaries are only kept by the journal backend
+        return False
+
+    def list_chats(self, offset=0, limit=50):
+        self.writer.flush()
+        return self.store.list_chats(offset, limit)
+
+    def search(self, query, limit=10):
+        self.writer.flush()
+        return self.store.search(query, limit)
+
+    def close(self):
+        self.writer.flush()
+        self.store.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Siris SQLite chat history.")
+    parser.add_argument("--db", default="chat_history/siris.db")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="import file-based chats")
+    imp.add_argument("--from", dest="source", default="chat_history")
+    find = sub.add_parser("search", help="full-text search over all messages")
+    find.add_argument("query", nargs="+")
+    find.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    store = ChatStore(args.db)
+    if args.command == "import":
+        store.import_history(args.source)
+    else:
+        for hit in store.search(" ".join(args.query), args.limit):
+            print(f"{hit['score']:6.2f}  {hit['chat_name']} [{hit['timestamp']}] {hit['role']}: {hit['snippet']}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
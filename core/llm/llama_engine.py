@@ -1,10 +1,147 @@
+import os
 import torch
 import json
 import re
-from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig
+import time
+import threading
+from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig, StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+from transformers.generation.streamers import BaseStreamer
+from core.telemetry.tracer import tracer
+
+class TraceStreamer(BaseStreamer):
+    """Stamps the first generated token of a turn."""
+    def __init__(self, turn_id):
+        self.turn_id = turn_id
+        self.prompt_seen = False
+        self.tokens = 0
+
+    def put(self, value):
+        # generate() pushes the prompt ids first, then one chunk per new token
+        if not self.prompt_seen:
+            self.prompt_seen = True
+            return
+        if self.tokens == 0:
+            tracer.mark("first_token", self.turn_id)
+        self.tokens += 1
+
+    def end(self):
+        pass
+
+class CancelStoppingCriteria(StoppingCriteria):
+    """Stops decoding as soon as the turn's cancel token is set."""
+    def __init__(self, cancel_token):
+        self.cancel_token = cancel_token
+
+    def __call__(self, input_ids, scores, **kwargs):
+        return torch.full((input_ids.shape[0],), self.cancel_token.cancelled, dtype=torch.bool, device=input_ids.device)
+
+# End of a sentence (optionally closed by a quote/bracket), or a line break
+SENTENCE_END = re.compile(r'[.!?…]["\'”)\]]?\s*$|\n\s*$')
+
+def trim_to_sentence(text):
+    """Cut text back to its last complete sentence (unchanged if there is none)."""
+    matches = list(re.finditer(r'[.!?…]["\'”)\]]?(?=\s|$)', text))
+    return text[:matches[-1].end()] if matches else text
+
+class DeadlineStoppingCriteria(StoppingCriteria):
+    """Wall-clock budget for one generation, also used to measure decode speed.
+
+    Called once per generated token. With a deadline it stops at the first
+    sentence boundary once the deadline is within soft_s, or once
+    target_tokens have been generated, and unconditionally at the deadline
+    itself. For thinking models only the answer is budgeted: the clock and
+    the token target start at </think>, so the budget can't run out
+    mid-thought and leave nothing to say.
+    """
+    def __init__(self, tokenizer, prompt_len, deadline=None, soft_s=0.0, target_tokens=None, thinking=False):
+        self.tokenizer = tokenizer
+        self.prompt_len = prompt_len
+        self.deadline = deadline
+        self.soft_s = soft_s
+        self.target_tokens = target_tokens
+        self.answering = not thinking
+        # Thinking: the same budget, applied from the end of the <think> block
+        self.answer_budget = deadline - time.perf_counter() if thinking and deadline is not None else None
+        self.answer_from = 0  # token count when the answer started
+        self.tail = ""
+        self.reason = None
+        self.first_at = None
+        self.last_at = None
+        self.tokens = 0
+
+    def __call__(self, input_ids, scores, **kwargs):
+        now = time.perf_counter()
+        if self.first_at is None:
+            self.first_at = now
+        self.last_at = now
+        self.tokens = input_ids.shape[1] - self.prompt_len
+        stop = False
+        if self.deadline is not None:
+            try:
+                piece = self.tokenizer.decode(input_ids[0, -1:], skip_special_tokens=True)
+            except Exception:
+                piece = ""  # tokenizer busy on another thread; the hard deadline still applies
+            self.tail = (self.tail + piece)[-48:]
+            if not self.answering:
+                if "</think>" in self.tail:
+                    self.answering = True
+                    self.tail = ""
+                    self.answer_from = self.tokens
+                    self.deadline = now + self.answer_budget
+                return torch.full((input_ids.shape[0],), False, dtype=torch.bool, device=input_ids.device)
+            answer_tokens = self.tokens - self.answer_from
+            if now >= self.deadline:
+                stop, self.reason = True, "deadline"
+            elif SENTENCE_END.search(self.tail) and (
+                    now >= self.deadline - self.soft_s or (self.target_tokens and answer_tokens >= self.target_tokens)):
+                stop, self.reason = True, "sentence"
+        return torch.full((input_ids.shape[0],), stop, dtype=torch.bool, device=input_ids.device)
+
+    def decode_rate(self):
+        """Tokens per second after the first token, or None if too few tokens to tell."""
+        if self.tokens < 8 or self.last_at <= self.first_at:
+            return None
+        return (self.tokens - 1) / (self.last_at - self.first_at)
+
+class ThinkFilter:
+    """Drops <think>...</think> blocks from a stream of text deltas."""
+    def __init__(self):
+        self.buffer = ""
+        self.thinking = False
+
+    def feed(self, text):
+        self.buffer += text
+        out = ""
+        while self.buffer:
+            tag = "</think>" if self.thinking else "<think>"
+            idx = self.buffer.find(tag)
+            if idx >= 0:
+                if not self.thinking:
+                    out += self.buffer[:idx]
+                self.buffer = self.buffer[idx + len(tag):]
+                self.thinking = not self.thinking
+                continue
+            # Hold back a possible partial tag at the end
+            keep = 0
+            for n in range(1, len(tag)):
+                if self.buffer.endswith(tag[:n]):
+                    keep = n
+            if not self.thinking:
+                out += self.buffer[:len(self.buffer) - keep]
+            self.buffer = self.buffer[len(self.buffer) - keep:]
+            break
+        return out
+
+    def flush(self):
+        out = "" if self.thinking else self.buffer
+        self.buffer = ""
+        return out
 
 class LLMEngine:
-    def __init__(self, model_key="llama_1b", config_path="config/paths.json"):
+    DEFAULT_MAX_TOKENS = 200
+    MIN_MAX_TOKENS = 32
+
+    def __init__(self, model_key="llama_1b", config_path="config/paths.json", rates_path="logs/llm_rates.json"):
         with open(config_path, 'r') as f:
             self.paths = json.load(f)['llm']
         
@@ -21,6 +158,10 @@ class LLMEngine:
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.tokenizer = None
         self.model = None
+        # Measured speed per model/device, kept across runs: {key: {"tps", "prefill_s"}}
+        self.rates_path = rates_path
+        self.rates_lock = threading.Lock()
+        self.rates = self._load_rates()
         self.load_model()
 
     def load_model(self):
@@ -120,9 +261,84 @@ class LLMEngine:
             self.model = None
             self.tokenizer = None
 
-    def generate(self, prompt, system_prompt=None, max_tokens=200):
-        if not self.model: return "Error: Brain offline."
-        
+    def count_tokens(self, text):
+        """Exact prompt-token count with this model's tokenizer."""
+        tokenizer = self.tokenizer
+        if tokenizer is None:
+            return len(text) // 4
+        try:
+            return len(tokenizer.encode(text, add_special_tokens=False))
+        except Exception:
+            # Fast tokenizers refuse concurrent use from another thread
+            return len(text) // 4
+
+    # --- SPEED / BUDGET ---
+    def _rate_key(self):
+        return f"{self.model_key}@{self.device}"
+
+    def _load_rates(self):
+        try:
+            with open(self.rates_path, "r") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def speed(self):
+        """(tokens/s, prefill seconds) measured on this machine, or (None, None) before the first reply."""
+        rate = self.rates.get(self._rate_key(), {})
+        return rate.get("tps"), rate.get("prefill_s")
+
+    def _record_speed(self, criteria, started):
+        tps = criteria.decode_rate()
+        if tps is None:
+            return
+        prefill = criteria.first_at - started
+        with self.rates_lock:
+            rate = self.rates.get(self._rate_key())
+            if rate:
+                # Smooth over load spikes (other apps, thermal throttling)
+                rate = {"tps": rate["tps"] * 0.7 + tps * 0.3, "prefill_s": rate["prefill_s"] * 0.7 + prefill * 0.3}
+            else:
+                rate = {"tps": tps, "prefill_s": prefill}
+            self.rates[self._rate_key()] = rate
+            try:
+                os.makedirs(os.path.dirname(self.rates_path) or ".", exist_ok=True)
+                with open(self.rates_path, "w") as f:
+                    json.dump(self.rates, f, indent=2)
+            except Exception as e:
+                print(f"⚠️ Failed to save LLM speed: {e}")
+
+    def plan(self, max_tokens=None, deadline_s=None):
+        """Token cap for a request. With a deadline and a measured speed, the default cap
+        shrinks to what this machine can decode in time."""
+        if max_tokens is not None:
+            return max_tokens
+        tps, prefill = self.speed()
+        # Thinking models are budgeted from </think> (see DeadlineStoppingCriteria); a cap
+        # sized to the deadline would cut the thinking off before any answer
+        if not deadline_s or not tps or self.model_type == "thinking":
+            return self.DEFAULT_MAX_TOKENS
+        affordable = int((deadline_s - prefill) * tps)
+        return max(self.MIN_MAX_TOKENS, min(self.DEFAULT_MAX_TOKENS, affordable))
+
+    def _criteria(self, inputs, cancel_token, started, deadline_s, target_tokens):
+        tps, prefill = self.speed()
+        deadline = started + deadline_s if deadline_s else None
+        # Start looking for a sentence end about one sentence (~20 tokens) before the deadline
+        soft_s = min(deadline_s * 0.3, 20 / tps) if deadline_s and tps else (deadline_s or 0) * 0.3
+        deadline_criteria = DeadlineStoppingCriteria(self.tokenizer, inputs['input_ids'].shape[1], deadline, soft_s,
+                                                     target_tokens, thinking=self.model_type == "thinking")
+        criteria = [deadline_criteria]
+        if cancel_token:
+            criteria.append(CancelStoppingCriteria(cancel_token))
+        return deadline_criteria, StoppingCriteriaList(criteria)
+
+    def unload(self):
+        """Free the weights (and VRAM); load_model() brings them back."""
+        self.model = None
+        self.tokenizer = None
+
+    def _build_inputs(self, prompt, system_prompt=None):
         # Use model-specific system prompts
         if system_prompt is None:
             if self.model_type == "thinking":
@@ -140,38 +356,143 @@ class LLMEngine:
             {"role": "user", "content": prompt}
         ]
         
+        # Format Prompt
+        formatted_prompt = self.tokenizer.apply_chat_template(
+            messages, 
+            tokenize=False, 
+            add_generation_prompt=True
+        )
+        return self.tokenizer(formatted_prompt, return_tensors="pt").to(self.model.device)
+
+    def generate(self, prompt, system_prompt=None, max_tokens=None, turn_id=None, cancel_token=None,
+                 deadline_s=None, target_tokens=None):
+        """deadline_s: wall-clock budget for this call; target_tokens: preferred answer length.
+        Both stop at a sentence boundary. max_tokens=None adapts the cap to the measured speed."""
+        if not self.model: return "Error: Brain offline."
+        if cancel_token and cancel_token.cancelled: return ""
+        
         try:
-            # Format Prompt
-            formatted_prompt = self.tokenizer.apply_chat_template(
-                messages, 
-                tokenize=False, 
-                add_generation_prompt=True
-            )
+            started = time.perf_counter()
+            inputs = self._build_inputs(prompt, system_prompt)
             
-            inputs = self.tokenizer(formatted_prompt, return_tensors="pt").to(self.model.device)
+            # Only trace turns from the voice pipeline (not chat naming etc.)
+            streamer = TraceStreamer(turn_id) if turn_id else None
+            deadline_criteria, stopping_criteria = self._criteria(inputs, cancel_token, started, deadline_s, target_tokens)
             
             # Generate
             with torch.no_grad():
                 outputs = self.model.generate(
                     **inputs, 
-                    max_new_tokens=max_tokens,
+                    max_new_tokens=self.plan(max_tokens, deadline_s),
                     pad_token_id=self.tokenizer.eos_token_id,
                     do_sample=True,
                     temperature=0.6, # Slightly lower for Qwen instruction following
-                    top_p=0.9
+                    top_p=0.9,
+                    streamer=streamer,
+                    stopping_criteria=stopping_criteria
                 )
             
+            # Barge-in: the partial answer belongs to an abandoned turn
+            if cancel_token and cancel_token.cancelled:
+                return ""
+            
+            self._record_speed(deadline_criteria, started)
+            if streamer:
+                tracer.mark("last_token", turn_id, tokens=streamer.tokens, stop=deadline_criteria.reason)
+            
             # Decode
             response = self.tokenizer.decode(outputs[0][inputs['input_ids'].shape[1]:], skip_special_tokens=True)
             
             # Filter output for thinking models
             if self.model_type == "thinking":
                 response = self._filter_output(response)
+            # Out of time mid-sentence: don't hand TTS a fragment
+            if deadline_criteria.reason == "deadline":
+                response = trim_to_sentence(response.strip())
             
             return response.strip()
             
         except Exception as e:
             return f"Generation Error: {e}"
+
+    def generate_stream(self, prompt, system_prompt=None, max_tokens=None, turn_id=None, cancel_token=None,
+                        deadline_s=None, target_tokens=None, result=None):
+        """Same as generate, but yields the response as text deltas while decoding.
+
+        Deltas can't be taken back, so pass a dict as result to get the final
+        response: result["text"] (trimmed to the last full sentence if the
+        deadline cut it off) and result["stop"] (why decoding ended)."""
+        if not self.model:
+            yield "Error: Brain offline."
+            return
+        if cancel_token and cancel_token.cancelled:
+            return
+        
+        try:
+            started = time.perf_counter()
+            inputs = self._build_inputs(prompt, system_prompt)
+        except Exception as e:
+            yield f"Generation Error: {e}"
+            return
+        
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        deadline_criteria, stopping_criteria = self._criteria(inputs, cancel_token, started, deadline_s, target_tokens)
+        max_new_tokens = self.plan(max_tokens, deadline_s)
+        
+        def run():
+            try:
+                with torch.no_grad():
+                    self.model.generate(
+                        **inputs, 
+                        max_new_tokens=max_new_tokens,
+                        pad_token_id=self.tokenizer.eos_token_id,
+                        do_sample=True,
+                        temperature=0.6,
+                        top_p=0.9,
+                        streamer=streamer,
+                        stopping_criteria=stopping_criteria
+                    )
+            except Exception as e:
+                print(f"❌ Streaming generation failed: {e}")
+                streamer.end()
+        
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        
+        think_filter = ThinkFilter() if self.model_type == "thinking" else None
+        chunks = 0
+        parts = []
+        for text in streamer:
+            if cancel_token and cancel_token.cancelled:
+                break
+            if think_filter:
+                text = think_filter.feed(text)
+            if not text:
+                continue
+            if chunks == 0 and turn_id:
+                tracer.mark("first_token", turn_id)
+            chunks += 1
+            parts.append(text)
+            yield text
+        thread.join()
+        cancelled = bool(cancel_token and cancel_token.cancelled)
+        # A decode cut short by barge-in says nothing about this machine's speed
+        if not cancelled:
+            self._record_speed(deadline_criteria, started)
+        if think_filter and not cancelled:
+            tail = think_filter.flush()
+            if tail:
+                parts.append(tail)
+                yield tail
+        if result is not None:
+            response = "".join(parts).strip()
+            # Out of time mid-sentence: don't hand TTS a fragment
+            if deadline_criteria.reason == "deadline":
+                response = trim_to_sentence(response)
+            result["text"] = response
+            result["stop"] = deadline_criteria.reason
+        if turn_id:
+            tracer.mark("last_token", turn_id, chunks=chunks, stop=deadline_criteria.reason)
     
     def _filter_output(self, text):
         """Extract only the final answer from thinking model output"""
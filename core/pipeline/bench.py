@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import glob
+import time
+import platform
+import argparse
+import tracemalloc
+import numpy as np
+
+from core.telemetry.tracer import percentile
+from core.pipeline.headless import HeadlessPipeline, load_engines, read_wav
+
+STAGES = ["stt", "llm", "tts"]
+
+def synthetic_clips(durations=(2.0, 5.0, 10.0), sample_rate=16000, seed=0):
+    """Speech-like test clips: noise shaped by a syllable-rate envelope over a few formants."""
+    rng = np.random.default_rng(seed)
+    clips = []
+    for seconds in durations:
+        t = np.arange(int(seconds * sample_rate), dtype=np.float32) / sample_rate
+        envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4.0 * t)
+        voiced = sum(np.sin(2 * np.pi * f * t) for f in (220.0, 720.0, 1240.0)) / 3
+        noise = rng.standard_normal(len(t)).astype(np.float32) * 0.05
+        clips.append((f"synthetic_{seconds:g}s", ((voiced * envelope) * 0.3 + noise).astype(np.float32)))
+    return clips
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        try:
+            import psutil
+            info = psutil.Process().memory_info()
+            return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+        except ImportError:
+            return None
+
+def measure_memory(pipeline, audio):
+    """Python heap peak per stage (one pass under tracemalloc, kept out of the timed runs)."""
+    peaks = {}
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        transcript = pipeline.stt.transcribe_audio(audio)
+        peaks["stt"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+
+        tracemalloc.reset_peak()
+        response = pipeline.worker.process(transcript or "hello")
+        peaks["llm"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+
+        if pipeline.tts is not None:
+            tracemalloc.reset_peak()
+            pipeline.tts.synthesize(response)
+            peaks["tts"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+def run_benchmark(pipeline, clips, iterations=10, warmup=1):
+    latencies = {stage: [] for stage in STAGES}
+    work = {"audio_in_s": 0.0, "tokens": 0, "audio_out_s": 0.0}
+    busy = {stage: 0.0 for stage in STAGES}
+
+    for i in range(warmup + iterations):
+        for name, audio in clips:
+            result = pipeline.run_audio(audio)
+            if i < warmup:
+                continue
+            for stage, seconds in result["timings"].items():
+                latencies[stage].append(seconds * 1000)
+                busy[stage] += seconds
+            work["audio_in_s"] += result["input_audio_s"]
+            work["tokens"] += result["tokens"]
+            if result["audio"] is not None:
+                work["audio_out_s"] += len(result["audio"]) / float(result["sample_rate"])
+
+    report = {"stages": {}, "throughput": {}}
+    for stage, values in latencies.items():
+        if not values:
+            continue
+        values.sort()
+        report["stages"][stage] = {
+            "n": len(values),
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+        }
+    # Realtime factors: seconds of audio processed per second of compute
+    if busy["stt"]:
+        report["throughput"]["stt_realtime_x"] = work["audio_in_s"] / busy["stt"]
+    if busy["llm"]:
+        report["throughput"]["llm_tokens_per_s"] = work["tokens"] / busy["llm"]
+    if busy["tts"]:
+        report["throughput"]["tts_realtime_x"] = work["audio_out_s"] / busy["tts"]
+    return report
+
+def compare(report, baseline, tolerance=0.15):
+    """List of human-readable regressions against a stored baseline."""
+    regressions = []
+    for stage, stats in report["stages"].items():
+        base = baseline.get("stages", {}).get(stage)
+        if not base:
+            continue
+        for key in ("p50_ms", "p95_ms"):
+            if base[key] > 0 and stats[key] > base[key] * (1 + tolerance):
+                regressions.append(f"{stage} {key}: {stats[key]:.1f} vs baseline {base[key]:.1f} (+{(stats[key] / base[key] - 1) * 100:.0f}%)")
+    for key, value in report["throughput"].items():
+        base = baseline.get("throughput", {}).get(key)
+        if base and value < base * (1 - tolerance):
+            regressions.append(f"{key}: {value:.1f} vs baseline {base:.1f} (-{(1 - value / base) * 100:.0f}%)")
+    base_mem = baseline.get("peak_rss_mb")
+    if base_mem and report.get("peak_rss_mb") and report["peak_rss_mb"] > base_mem * (1 + tolerance):
+        regressions.append(f"peak_rss_mb: {report['peak_rss_mb']:.0f} vs baseline {base_mem:.0f}")
+    return regressions
+
+def print_report(report, baseline=None):
+    print(f"\n📊 Siris pipeline benchmark ({report['engines']}, {report['iterations']} iterations)")
+    print(f"{'stage':<6}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'heap MB':>10}")
+    for stage in STAGES:
+        stats = report["stages"].get(stage)
+        if not stats:
+            continue
+        heap = report["heap_peak_mb"].get(stage, 0.0)
+        print(f"{stage:<6}{stats['n']:>5}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{heap:>10.1f}")
+    for key, value in report["throughput"].items():
+        line = f"{key}: {value:.1f}"
+        base = (baseline or {}).get("throughput", {}).get(key)
+        if base:
+            line += f"  (baseline {base:.1f})"
+        print(line)
+    if report.get("peak_rss_mb"):
+        print(f"peak_rss_mb: {report['peak_rss_mb']:.0f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark STT -> LLM -> TTS with stand-in or real models.")
+    parser.add_argument("--real", action="store_true", help="benchmark the real models from config/paths.json")
+    parser.add_argument("--model", default=None, help="LLM model key (with --real)")
+    parser.add_argument("--voice", default=None, help="voice name (with --real)")
+    parser.add_argument("--no-speech", action="store_true", help="skip TTS")
+    parser.add_argument("--wav-dir", default=None, help="benchmark every WAV in this folder instead of synthetic clips")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--baseline", default="bench/baseline.json", help="baseline file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed regression (fraction)")
+    parser.add_argument("--output", default=None, help="also write the report JSON here")
+    args = parser.parse_args(argv)
+
+    if args.wav_dir:
+        clips = [(os.path.basename(p), read_wav(p)) for p in sorted(glob.glob(os.path.join(args.wav_dir, "*.wav")))]
+        if not clips:
+            print(f"❌ No WAV files in {args.wav_dir}")
+            return 2
+    else:
+        clips = synthetic_clips()
+
+    stt, llm, tts = load_engines(args.real, args.model, args.voice, speech=not args.no_speech)
+    pipeline = HeadlessPipeline(stt, llm, tts)
+
+    heap = measure_memory(pipeline, clips[0][1])
+    report = run_benchmark(pipeline, clips, iterations=args.iterations, warmup=args.warmup)
+    report.update({
+        "engines": "real" if args.real else "stub",
+        "iterations": args.iterations,
+        "clips": [name for name, _ in clips],
+        "heap_peak_mb": heap,
+        "peak_rss_mb": peak_rss_mb(),
+        "machine": platform.platform(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=4)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if baseline:
+        if baseline.get("engines") != report["engines"]:
+            print(f"⚠️ Baseline was recorded with '{baseline.get('engines')}' engines, comparison may be meaningless")
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("❌ Regressions vs baseline:")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print("✅ No regressions vs baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import wave
+import json
+import argparse
+import tempfile
+import numpy as np
+
+from core.chat.chat_manager import ChatManager
+from core.pipeline.worker import SirisWorker
+
+def read_wav(path, target_rate=16000):
+    """Load a PCM WAV as mono float32 in [-1, 1], resampled to target_rate."""
+    with wave.open(path, "rb") as wf:
+        rate = wf.getframerate()
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        frames = wf.readframes(wf.getnframes())
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+    audio = np.frombuffer(frames, dtype=dtype).astype(np.float32)
+    if width == 1:
+        audio = (audio - 128.0) / 128.0
+    else:
+        audio /= float(np.iinfo(dtype).max)
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != target_rate and len(audio):
+        positions = np.linspace(0, len(audio) - 1, int(len(audio) * target_rate / rate))
+        audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+def write_wav(path, audio, sample_rate):
+    pcm = (np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0) * 32767).astype(np.int16)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm.tobytes())
+
+def load_engines(real=False, model_key=None, voice=None, speech=True):
+    """Return (stt, llm, tts). Stand-ins unless real=True; tts is None if speech is off."""
+    if not real:
+        from core.pipeline.stubs import StubSTT, StubLLM, StubTTS
+        return StubSTT(), StubLLM(), (StubTTS() if speech else None)
+
+    from core.stt.whisper_engine import STTEngine
+    from core.llm.llama_engine import LLMEngine
+    stt = STTEngine()
+    llm = LLMEngine(model_key=model_key or "llama_1b")
+    tts = None
+    if speech:
+        from core.tts.voiceuser import VoiceUser
+        tts = VoiceUser()
+        tts.load_voice(voice or "default")
+    return stt, llm, tts
+
+class HeadlessPipeline:
+    """Drives STT -> SirisWorker/LLM -> TTS without Qt widgets, a microphone or the top bar."""
+
+    def __init__(self, stt, llm, tts=None, chat_manager=None, use_internet=False, use_local_index=False):
+        self.stt = stt
+        self.llm = llm
+        self.tts = tts
+        # Keep headless chats out of the user's history unless asked otherwise
+        self.chat_manager = chat_manager or ChatManager(history_dir=tempfile.mkdtemp(prefix="siris_headless_"))
+        self.worker = SirisWorker(llm, self.chat_manager, internet_default=use_internet)
+        self.worker.use_local_index = use_local_index
+
+    def run_audio(self, audio, sample_rate=16000):
+        start = time.perf_counter()
+        transcript = self.stt.transcribe_audio(audio, sample_rate)
+        stt_time = time.perf_counter() - start
+        result = self.run_text(transcript) if transcript else self._empty_result()
+        result["transcript"] = transcript
+        result["timings"]["stt"] = stt_time
+        result["input_audio_s"] = len(audio) / float(sample_rate)
+        return result
+
+    def run_text(self, text):
+        timings = {}
+        self.chat_manager.add_message("user", text)
+
+        start = time.perf_counter()
+        response = self.worker.process(text)
+        timings["llm"] = time.perf_counter() - start
+        self.chat_manager.add_message("assistant", response)
+
+        audio, rate = None, None
+        if self.tts is not None and response:
+            start = time.perf_counter()
+            audio, rate, _ = self.tts.synthesize(response)
+            timings["tts"] = time.perf_counter() - start
+
+        return {
+            "transcript": text,
+            "response": response,
+            "tokens": getattr(self.llm, "last_token_count", None) or len(response.split()),
+            "audio": audio,
+            "sample_rate": rate,
+            "timings": timings,
+        }
+
+    @staticmethod
+    def _empty_result():
+        return {"transcript": "", "response": "", "tokens": 0, "audio": None, "sample_rate": None, "timings": {}}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Siris pipeline headless on WAV files or text.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--wav", nargs="+", help="input WAV file(s)")
+    source.add_argument("--text", nargs="+", help="input text prompt(s)")
+    parser.add_argument("--real", action="store_true", help="load the real Whisper/LLM/XTTS models from config/paths.json")
+    parser.add_argument("--model", default=None, help="LLM model key (with --real)")
+    parser.add_argument("--voice", default=None, help="voice name (with --real)")
+    parser.add_argument("--no-speech", action="store_true", help="skip TTS")
+    parser.add_argument("--internet", action="store_true", help="ground answers with web search")
+    parser.add_argument("--out-dir", default=None, help="write reply_<n>.wav files here")
+    parser.add_argument("--json", action="store_true", help="print results as JSON lines")
+    args = parser.parse_args(argv)
+
+    stt, llm, tts = load_engines(args.real, args.model, args.voice, speech=not args.no_speech)
+    pipeline = HeadlessPipeline(stt, llm, tts, use_internet=args.internet)
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    inputs = args.wav or args.text
+    for n, item in enumerate(inputs):
+        result = pipeline.run_audio(read_wav(item)) if args.wav else pipeline.run_text(item)
+        if args.out_dir and result["audio"] is not None:
+            write_wav(os.path.join(args.out_dir, f"reply_{n}.wav"), result["audio"], result["sample_rate"])
+        timings = {k: round(v * 1000, 1) for k, v in result["timings"].items()}
+        if args.json:
+            print(json.dumps({"input": item, "transcript": result["transcript"], "response": result["response"],
+                              "tokens": result["tokens"], "timings_ms": timings}))
+        else:
+            print(f"🎤 {result['transcript']}")
+            print(f"🤖 {result['response']}")
+            print(f"⏱️ {timings}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
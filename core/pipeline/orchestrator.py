@@ -0,0 +1,113 @@
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class TurnCancelled(Exception):
+    """Raised by pipeline stages when their turn has been cancelled."""
+    pass
+
+class CancelToken:
+    """Per-turn cancellation flag shared by every stage of a turn."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try: callback()
+            except Exception as e: print(f"⚠️ Cancel callback failed: {e}")
+
+    def add_callback(self, callback):
+        """Run callback on cancel (immediately if already cancelled)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TurnCancelled()
+
+    def wait(self, timeout):
+        """Sleep up to timeout seconds, waking early on cancel. Returns True if cancelled."""
+        return self._event.wait(timeout)
+
+class Turn:
+    def __init__(self, turn_id=None):
+        self.id = turn_id or uuid.uuid4().hex[:12]
+        self.token = CancelToken()
+
+    @property
+    def cancelled(self):
+        return self.token.cancelled
+
+class TurnOrchestrator:
+    """Runs turn stages on a bounded pool and cancels the previous turn when a new one starts.
+
+    Background work (archiving, memory backfill, naming, summaries) gets its
+    own smaller pool, so a long job can never hold a thread a live turn needs.
+    """
+
+    def __init__(self, max_workers=4, background_workers=2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="siris-turn")
+        self.background = ThreadPoolExecutor(max_workers=background_workers, thread_name_prefix="siris-background")
+        self.current_turn = None
+        self.lock = threading.Lock()
+
+    def start_turn(self):
+        """Cancel whatever is still running and begin a new turn (barge-in)."""
+        turn = Turn()
+        with self.lock:
+            previous, self.current_turn = self.current_turn, turn
+        if previous:
+            previous.token.cancel()
+        return turn
+
+    def cancel_current(self):
+        with self.lock:
+            turn = self.current_turn
+        if turn:
+            turn.token.cancel()
+        return turn
+
+    def submit(self, turn, fn, *args, **kwargs):
+        """Run a stage of the turn on the pool. Skipped if the turn is cancelled before it starts."""
+        def run():
+            if turn.cancelled:
+                return None
+            try:
+                return fn(*args, **kwargs)
+            except TurnCancelled:
+                print(f"⏹️ Turn {turn.id} cancelled")
+                return None
+            except Exception as e:
+                print(f"❌ Turn {turn.id} stage failed: {e}")
+                return None
+        return self.executor.submit(run)
+
+    def submit_background(self, fn, *args, **kwargs):
+        """Run work that is not tied to a turn (e.g. chat naming)."""
+        def run():
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                print(f"❌ Background task failed: {e}")
+                return None
+        return self.background.submit(run)
+
+    def shutdown(self):
+        self.cancel_current()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.background.shutdown(wait=False, cancel_futures=True)
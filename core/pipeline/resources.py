@@ -0,0 +1,132 @@
+import os
+import sys
+import gc
+from PyQt6.QtCore import QObject, QTimer
+
+# Seconds an engine may sit unused before it is unloaded (0 = never)
+DEFAULT_IDLE_TIMEOUTS = {"stt": 1800, "llm": 3600, "tts": 1800}
+
+def process_rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+def gpu_allocated_mb():
+    # Don't pay for importing torch just to learn nothing is on the GPU
+    torch = sys.modules.get("torch")
+    if torch is None or not torch.cuda.is_available():
+        return 0.0
+    return torch.cuda.memory_allocated() / (1024 * 1024)
+
+def memory_snapshot():
+    return {"rss_mb": process_rss_mb(), "vram_mb": gpu_allocated_mb()}
+
+def release_memory():
+    """Return freed engine memory to the OS/driver where possible."""
+    gc.collect()
+    torch = sys.modules.get("torch")
+    if torch is not None and torch.cuda.is_available():
+        torch.cuda.empty_cache()
+
+def engine_footprint(engine):
+    """Weights size of an engine's torch model split by host/GPU, or None if it has none."""
+    model = getattr(engine, "model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return None
+    sizes = {"rss_mb": 0.0, "vram_mb": 0.0}
+    try:
+        for tensor in list(model.parameters()) + list(model.buffers()):
+            key = "vram_mb" if tensor.device.type == "cuda" else "rss_mb"
+            sizes[key] += tensor.numel() * tensor.element_size() / (1024 * 1024)
+    except Exception:
+        return None
+    return sizes
+
+class ResourceManager(QObject):
+    """Unloads idle engines and keeps resident engines under a memory budget.
+
+    Engines are unloaded through the EngineRegistry, which reloads them the
+    next time a turn acquires them. Checks run on a GUI-thread timer.
+    """
+
+    def __init__(self, registry, idle_timeouts=None, budget_mb=0, check_interval_s=30):
+        super().__init__()
+        self.registry = registry
+        self.idle_timeouts = dict(DEFAULT_IDLE_TIMEOUTS)
+        self.idle_timeouts.update(idle_timeouts or {})
+        self.budget_mb = budget_mb
+        self.unloads = {"idle": 0, "budget": 0, "disabled": 0}
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(check_interval_s * 1000))
+        self.timer.timeout.connect(self.check)
+        self.timer.start()
+
+    def footprint(self, name):
+        """Measured weights if the engine exposes a torch model, else the RSS/VRAM growth seen while loading."""
+        engine = self.registry.get(name)
+        sizes = engine_footprint(engine) if engine is not None else None
+        if sizes is None:
+            with self.registry.lock:
+                sizes = dict(self.registry.footprints.get(name, {"rss_mb": 0.0, "vram_mb": 0.0}))
+        return sizes
+
+    def resident(self):
+        with self.registry.lock:
+            return [name for name, state in self.registry.states.items() if state == self.registry.READY]
+
+    def usage(self):
+        engines = {}
+        for name in list(self.registry.states):
+            sizes = self.footprint(name) if self.registry.get(name) is not None else {"rss_mb": 0.0, "vram_mb": 0.0}
+            engines[name] = {
+                "state": self.registry.state(name),
+                "idle_s": round(self.registry.idle_seconds(name), 1),
+                "rss_mb": round(sizes["rss_mb"], 1),
+                "vram_mb": round(sizes["vram_mb"], 1),
+            }
+        return {
+            "process_rss_mb": round(process_rss_mb(), 1),
+            "gpu_allocated_mb": round(gpu_allocated_mb(), 1),
+            "budget_mb": self.budget_mb,
+            "engines": engines,
+            "unloads": dict(self.unloads),
+        }
+
+    def check(self):
+        # 1. Idle timeouts
+        for name in self.resident():
+            timeout = self.idle_timeouts.get(name, 0)
+            if timeout and self.registry.idle_seconds(name) > timeout:
+                if self.registry.unload(name):
+                    self.unloads["idle"] += 1
+
+        # 2. Budget: drop least recently used engines until the rest fit
+        if not self.budget_mb:
+            return
+        resident = self.resident()
+        total = sum(sum(self.footprint(name).values()) for name in resident)
+        for name in sorted(resident, key=self.registry.idle_seconds, reverse=True):
+            if total <= self.budget_mb:
+                break
+            size = sum(self.footprint(name).values())
+            if self.registry.unload(name):
+                self.unloads["budget"] += 1
+                total -= size
+
+    def release(self, name):
+        """Unload an engine the current settings no longer need (e.g. speech output switched off)."""
+        if self.registry.unload(name):
+            self.unloads["disabled"] += 1
+
+    def prewarm(self, names):
+        """Start reloading engines a turn is about to need, e.g. as soon as recording starts."""
+        for name in names:
+            self.registry.ensure(name)
@@ -0,0 +1,182 @@
+import time
+import threading
+from collections import deque
+import numpy as np
+
+class LatestValue:
+    """Single-slot mailbox: the writer replaces, readers take whatever is newest.
+
+    The slot is one (sequence, value) tuple swapped by a single attribute
+    assignment, which is atomic in CPython, so neither side ever blocks.
+    """
+
+    def __init__(self, value=None):
+        self._slot = (0, value)
+
+    def publish(self, value):
+        self._slot = (self._slot[0] + 1, value)
+
+    def read(self):
+        """(sequence, value); the sequence changes whenever a new value is published"""
+        return self._slot
+
+class SpectrumAnalyzer:
+    """Band energies of mic and TTS audio for the waveform, computed on a worker thread.
+
+    feed() is safe to call from a sounddevice callback: it only appends the
+    chunk to a deque. TTS audio is handed over whole with feed_playback() and
+    sliced by the playback clock (the playback slot is the one piece of state
+    both sides write, so it sits behind a small lock). The worker wakes at display rate, runs one
+    batched rfft over every hop that arrived since its last tick, and
+    publishes {"bands", "level", "flux"} (all 0..1) to a LatestValue. With no
+    audio coming in it sleeps until the next feed.
+    """
+
+    def __init__(self, bands=16, fps=60, fft_size=512, min_hz=80.0, max_hz=8000.0,
+                 floor_db=-70.0, ceiling_db=-10.0, idle_after_s=0.5):
+        self.band_count = bands
+        self.interval = 1.0 / fps
+        self.fft_size = fft_size
+        self.hop = fft_size // 2
+        self.min_hz = min_hz
+        self.max_hz = max_hz
+        self.floor_db = floor_db
+        self.range_db = ceiling_db - floor_db
+        self.idle_after_s = idle_after_s
+
+        self.window = np.hanning(fft_size).astype(np.float32)
+        # Scale so a full-scale sine reads 0 dBFS in its bin
+        self.window_gain = self.window.sum() / 2
+        self.band_maps = {}  # sample rate -> (bins x bands) averaging matrix
+
+        self.inbox = deque(maxlen=256)  # (sample_rate, mono float32 chunk) from audio callbacks
+        self.playback = None  # (audio, sample_rate, start time, position)
+        # The TTS thread replaces/clears playback while the worker advances it; a plain
+        # check-then-set could resurrect a clip stopped by barge-in
+        self.playback_lock = threading.Lock()
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.pending_rate = None
+        self.previous_bands = np.zeros(bands, dtype=np.float32)
+        self.latest = LatestValue({"bands": self.previous_bands, "level": 0.0, "flux": 0.0})
+        self.stats = {"frames": 0, "ticks": 0, "analyze_ms": 0.0}
+
+        self.wake = threading.Event()
+        self.stopped = False
+        self.thread = threading.Thread(target=self._run, name="siris-spectrum", daemon=True)
+        self.thread.start()
+
+    # --- INPUT ---
+    def feed(self, samples, sample_rate):
+        """Queue captured audio (frames x channels or mono). Pass a copy, the callback buffer is reused."""
+        if samples.ndim > 1:
+            samples = samples[:, 0]
+        self.inbox.append((sample_rate, samples.astype(np.float32, copy=False)))
+        if not self.wake.is_set():
+            self.wake.set()
+
+    def feed_playback(self, audio, sample_rate):
+        """Analyze audio that has just started playing, in step with playback time."""
+        playback = (np.asarray(audio, dtype=np.float32), sample_rate, time.monotonic(), 0)
+        with self.playback_lock:
+            self.playback = playback
+        self.wake.set()
+
+    def stop_playback(self):
+        with self.playback_lock:
+            self.playback = None
+
+    def close(self):
+        self.stopped = True
+        self.wake.set()
+
+    # --- WORKER ---
+    def _run(self):
+        last_audio = time.monotonic()
+        while not self.stopped:
+            self.wake.wait()
+            tick = time.monotonic()
+            if self._collect():
+                last_audio = tick
+                self._analyze()
+            elif tick - last_audio > self.idle_after_s:
+                # Quiet: publish silence once and sleep until audio arrives
+                self._publish(np.zeros(self.band_count, dtype=np.float32), 0.0)
+                self.pending = np.zeros(0, dtype=np.float32)
+                self.wake.clear()
+                if self.inbox or self.playback:
+                    self.wake.set()
+                continue
+            time.sleep(max(0.0, self.interval - (time.monotonic() - tick)))
+
+    def _collect(self):
+        """Move new audio into self.pending. False if nothing arrived."""
+        chunks = []
+        rate = self.pending_rate
+        while self.inbox:
+            chunk_rate, chunk = self.inbox.popleft()
+            if chunk_rate != rate:
+                chunks, rate = [], chunk_rate
+            chunks.append(chunk)
+
+        with self.playback_lock:
+            playback = self.playback
+            if playback is not None:
+                audio, playback_rate, started, position = playback
+                end = min(len(audio), int((time.monotonic() - started) * playback_rate))
+                self.playback = None if end >= len(audio) else (audio, playback_rate, started, end)
+        if playback is not None and end > position:
+            # Playback takes over the display while it runs
+            chunks, rate = [audio[position:end]], playback_rate
+
+        if not chunks:
+            return False
+        if rate != self.pending_rate:
+            self.pending = np.zeros(0, dtype=np.float32)
+            self.pending_rate = rate
+        self.pending = np.concatenate([self.pending] + chunks)
+        return True
+
+    def _band_map(self, sample_rate):
+        band_map = self.band_maps.get(sample_rate)
+        if band_map is None:
+            freqs = np.fft.rfftfreq(self.fft_size, 1.0 / sample_rate)
+            max_hz = min(self.max_hz, sample_rate / 2)
+            edges = np.geomspace(self.min_hz, max_hz, self.band_count + 1)
+            band_map = np.zeros((len(freqs), self.band_count), dtype=np.float32)
+            for band in range(self.band_count):
+                in_band = (freqs >= edges[band]) & (freqs < edges[band + 1])
+                if not in_band.any():
+                    # Low bands narrower than one bin borrow the nearest bin
+                    in_band[np.abs(freqs - np.sqrt(edges[band] * edges[band + 1])).argmin()] = True
+                band_map[in_band, band] = 1.0 / in_band.sum()
+            self.band_maps[sample_rate] = band_map
+        return band_map
+
+    def _analyze(self):
+        start = time.perf_counter()
+        pending, n, hop = self.pending, self.fft_size, self.hop
+        count = (len(pending) - n) // hop + 1 if len(pending) >= n else 0
+        if count <= 0:
+            return
+        # Keep only the frames a display tick can show; drop older backlog
+        count = min(count, 8)
+        offset = len(pending) - n - (count - 1) * hop
+        frames = np.lib.stride_tricks.sliding_window_view(pending[offset:], n)[::hop][:count]
+        spectrum = np.abs(np.fft.rfft(frames * self.window, axis=1)) / self.window_gain
+        power = (spectrum ** 2).mean(axis=0)
+        band_db = 10 * np.log10(power @ self._band_map(self.pending_rate) + 1e-12)
+        bands = np.clip((band_db - self.floor_db) / self.range_db, 0.0, 1.0).astype(np.float32)
+
+        rms = np.sqrt(np.mean(frames[-1] ** 2))
+        level = float(np.clip((20 * np.log10(rms + 1e-9) - self.floor_db) / self.range_db, 0.0, 1.0))
+        self._publish(bands, level)
+        # Keep the overlap for the next tick's first frame
+        self.pending = pending[-(n - hop):]
+        self.stats["frames"] += count
+        self.stats["ticks"] += 1
+        self.stats["analyze_ms"] += (time.perf_counter() - start) * 1000
+
+    def _publish(self, bands, level):
+        flux = float(np.clip(bands - self.previous_bands, 0.0, None).mean() * 4)
+        self.previous_bands = bands
+        self.latest.publish({"bands": bands, "level": level, "flux": min(1.0, flux)})
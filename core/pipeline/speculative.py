@@ -0,0 +1,122 @@
+import threading
+from difflib import SequenceMatcher
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from core.tools.search import get_search_service, normalize_query, format_results
+
+class SpeculativeSearch:
+    """Starts web search from partial transcripts while the user is still talking.
+
+    A partial is considered stable once two consecutive partials agree on a
+    word prefix (or when it comes from an already finalized STT segment).
+    When the final transcript arrives the speculative result is reused if the
+    queries match closely, otherwise it is discarded.
+    """
+
+    def __init__(self, cancel_token=None, min_words=4, match_threshold=0.85, max_launches=3, num_results=3):
+        self.service = get_search_service()
+        self.min_words = min_words
+        self.match_threshold = match_threshold
+        self.max_launches = max_launches
+        self.num_results = num_results
+        self.last_words = []
+        self.launched = []  # (normalized query, future)
+        self.lock = threading.Lock()
+        if cancel_token:
+            cancel_token.add_callback(self.discard)
+
+    def offer(self, text, stable=False):
+        """Feed a partial transcript. Launches a search if a stable prefix is long enough."""
+        words = normalize_query(text).split()
+        with self.lock:
+            if stable:
+                candidate = words
+            else:
+                # Stable prefix = words two consecutive partials agree on
+                prefix = 0
+                for a, b in zip(self.last_words, words):
+                    if a != b: break
+                    prefix += 1
+                candidate = words[:prefix]
+            self.last_words = words
+
+            if len(candidate) < self.min_words or len(self.launched) >= self.max_launches:
+                return
+            query = " ".join(candidate)
+            # Skip if an earlier launch already covers this query
+            if any(self._similarity(query, q) >= self.match_threshold for q, _ in self.launched):
+                return
+            print(f"🔮 Speculative search: '{query}'")
+            self.launched.append((query, self.service.submit(query, self.num_results)))
+
+    def offer_stable(self, text):
+        self.offer(text, stable=True)
+
+    def resolve(self, final_query, timeout=None):
+        """Return formatted results if a speculative search matches the final query, else None."""
+        final = normalize_query(final_query)
+        with self.lock:
+            launched, self.launched = self.launched, []
+        if not launched:
+            return None
+
+        best_query, best_future = max(launched, key=lambda item: self._similarity(final, item[0]))
+        for query, future in launched:
+            if future is not best_future:
+                future.cancel()
+
+        score = self._similarity(final, best_query)
+        if score < self.match_threshold:
+            best_future.cancel()
+            print(f"🔮 Speculation discarded ({score:.2f}): '{best_query}'")
+            return None
+
+        timeout = self.service.timeout if timeout is None else timeout
+        try:
+            results = best_future.result(timeout + 0.5)
+        except (FutureTimeout, Exception):
+            best_future.cancel()
+            return None
+        if not results:
+            return None
+        print(f"⚡ Speculative search reused ({score:.2f})")
+        return format_results(results)
+
+    def discard(self):
+        with self.lock:
+            launched, self.launched = self.launched, []
+        for _, future in launched:
+            future.cancel()
+
+    @staticmethod
+    def _similarity(a, b):
+        return SequenceMatcher(None, a, b).ratio()
+
+
+class PartialWindow:
+    """Keeps partial decodes to a short tail of the recording.
+
+    Once the undecoded tail grows past the window, every segment but the last
+    is committed: its text is kept and its audio is never decoded again.
+    """
+
+    def __init__(self, sample_rate=16000, window_seconds=8.0):
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.offset = 0
+        self.committed = []
+
+    def tail(self, audio):
+        """Audio still to decode, or None when one long segment has outgrown the window."""
+        tail = audio[self.offset:]
+        return tail if len(tail) <= 2 * self.window else None
+
+    def advance(self, segments, tail_length):
+        """Take the segments decoded from tail() and return the full partial text."""
+        texts = [text for _, text in segments]
+        text = " ".join(self.committed + texts).strip()
+        if tail_length > self.window and len(segments) > 1:
+            # The last segment may end mid-word, keep decoding it
+            self.offset += int(segments[-2][0] * self.sample_rate)
+            self.committed += texts[:-1]
+        return text
@@ -0,0 +1,212 @@
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.pipeline.resources import memory_snapshot, release_memory
+
+class StartupProfile:
+    """Import and load time per component, measured from when this module is first imported."""
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.records = []  # (component, phase, start_s, seconds, thread name)
+        self.marks = {}    # name -> seconds since t0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, component, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self.lock:
+                self.records.append((component, phase, start - self.t0, end - start, threading.current_thread().name))
+
+    def mark(self, name):
+        with self.lock:
+            self.marks[name] = time.perf_counter() - self.t0
+
+    def report(self):
+        with self.lock:
+            records = sorted(self.records, key=lambda r: r[2])
+            marks = sorted(self.marks.items(), key=lambda m: m[1])
+        lines = ["⏱️ Startup profile", f"{'component':<10}{'phase':<8}{'start s':>9}{'took s':>9}  thread"]
+        for component, phase, start, seconds, thread in records:
+            lines.append(f"{component:<10}{phase:<8}{start:>9.2f}{seconds:>9.2f}  {thread}")
+        for name, at in marks:
+            lines.append(f"• {name} at {at:.2f}s")
+        return "\n".join(lines)
+
+# Shared profile; import this module early so t0 is close to process start
+profile = StartupProfile()
+
+def profiling_requested():
+    return "--profile-startup" in sys.argv or os.environ.get("SIRIS_PROFILE_STARTUP") == "1"
+
+class EngineRegistry(QObject):
+    """Loads engines concurrently in the background and tracks a readiness state per engine.
+
+    Factories run on a small pool. Their results are handed back to the GUI
+    thread, where on_ready callbacks wire signals before the engine is marked
+    ready, so anything waiting on an engine never sees it half-connected.
+    Unloaded engines keep their factory and are reloaded on next use.
+    """
+    state_changed = pyqtSignal(str, str)  # engine name, state
+    _loaded = pyqtSignal(str, int, object, str)
+    _reload_requested = pyqtSignal(str)
+
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+    UNLOADED = "unloaded"
+
+    def __init__(self, max_workers=3):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="siris-load")
+        self.lock = threading.Lock()
+        self.engines = {}      # name -> engine
+        self.states = {}       # name -> state
+        self.events = {}       # name -> threading.Event set once loaded (or failed)
+        self.generations = {}  # name -> load counter, so a stale reload can't win
+        self.callbacks = {}    # name -> on_ready callback for the current generation
+        self.factories = {}    # name -> (factory, on_ready, on_unload), kept for reloads
+        self.footprints = {}   # name -> {"rss_mb", "vram_mb"} grown while loading
+        self.last_used = {}    # name -> time.time() of the last acquire
+        self.pins = {}         # name -> callers currently using the engine
+        self._loaded.connect(self._on_loaded)
+        self._reload_requested.connect(self._reload)
+
+    def load(self, name, factory, on_ready=None, on_unload=None):
+        """Start (re)loading an engine in the background. The old engine stays usable until then."""
+        with self.lock:
+            generation = self.generations.get(name, 0) + 1
+            self.generations[name] = generation
+            self.callbacks[name] = on_ready
+            self.factories[name] = (factory, on_ready, on_unload)
+            self.states[name] = self.LOADING
+            event = self.events.get(name)
+            if name not in self.engines and (event is None or event.is_set()):
+                self.events[name] = threading.Event()
+        self.state_changed.emit(name, self.LOADING)
+        self.executor.submit(self._run, name, generation, factory)
+
+    def _run(self, name, generation, factory):
+        # Concurrent loads share the process, so deltas are approximate
+        before = memory_snapshot()
+        try:
+            engine = factory()
+            after = memory_snapshot()
+            with self.lock:
+                self.footprints[name] = {key: max(0.0, after[key] - before[key]) for key in before}
+            self._loaded.emit(name, generation, engine, "")
+        except Exception as e:
+            print(f"❌ Failed to load {name}: {e}")
+            self._loaded.emit(name, generation, None, str(e))
+
+    def _on_loaded(self, name, generation, engine, error):
+        with self.lock:
+            if self.generations.get(name) != generation:
+                return
+            callback = self.callbacks.pop(name, None)
+        if engine is not None and callback:
+            try: callback(engine)
+            except Exception as e: print(f"⚠️ {name} ready-callback failed: {e}")
+        with self.lock:
+            if engine is not None:
+                self.engines[name] = engine
+                self.last_used[name] = time.time()
+            state = self.READY if engine is not None else self.FAILED
+            self.states[name] = state
+            event = self.events.setdefault(name, threading.Event())
+        event.set()
+        self.state_changed.emit(name, state)
+
+    def get(self, name):
+        """The engine if it has loaded, else None. Never blocks."""
+        with self.lock:
+            return self.engines.get(name)
+
+    def wait(self, name, timeout=None):
+        """Block (off the GUI thread) until the engine has loaded. None if it failed or was never requested."""
+        with self.lock:
+            engine = self.engines.get(name)
+            event = self.events.get(name)
+            unloaded = self.states.get(name) == self.UNLOADED
+        if engine is not None or event is None:
+            return engine
+        if unloaded:
+            self.ensure(name)
+        event.wait(timeout)
+        return self.get(name)
+
+    @contextmanager
+    def acquire(self, name, timeout=None):
+        """Wait for (or reload) an engine and keep it resident while the block runs."""
+        with self.lock:
+            self.pins[name] = self.pins.get(name, 0) + 1
+        try:
+            engine = self.wait(name, timeout)
+            with self.lock:
+                self.last_used[name] = time.time()
+            yield engine
+        finally:
+            with self.lock:
+                self.pins[name] -= 1
+                self.last_used[name] = time.time()
+
+    def ensure(self, name):
+        """Reload an unloaded engine in the background. Safe from any thread."""
+        if self.state(name) == self.UNLOADED:
+            self._reload_requested.emit(name)
+
+    def _reload(self, name):
+        with self.lock:
+            if self.states.get(name) != self.UNLOADED or name not in self.factories:
+                return
+            factory, on_ready, on_unload = self.factories[name]
+        print(f"♻️ Reloading {name}")
+        self.load(name, factory, on_ready, on_unload)
+
+    def unload(self, name):
+        """Drop an idle engine (GUI thread). Returns False if it is in use or not loaded."""
+        with self.lock:
+            if self.states.get(name) != self.READY or self.pins.get(name, 0) > 0:
+                return False
+            engine = self.engines.pop(name)
+            self.states[name] = self.UNLOADED
+            # Waiters block on a fresh event until the reload finishes
+            self.events[name] = threading.Event()
+            on_unload = self.factories.get(name, (None, None, None))[2]
+        if on_unload:
+            try: on_unload(engine)
+            except Exception as e: print(f"⚠️ {name} unload-callback failed: {e}")
+        if hasattr(engine, "unload"):
+            engine.unload()
+        del engine
+        release_memory()
+        print(f"💤 Unloaded {name}")
+        self.state_changed.emit(name, self.UNLOADED)
+        return True
+
+    def idle_seconds(self, name):
+        with self.lock:
+            if self.pins.get(name, 0) > 0 or name not in self.last_used:
+                return 0.0
+            return time.time() - self.last_used[name]
+
+    def state(self, name):
+        with self.lock:
+            return self.states.get(name, self.PENDING)
+
+    def all_settled(self):
+        with self.lock:
+            return all(s in (self.READY, self.FAILED, self.UNLOADED) for s in self.states.values())
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
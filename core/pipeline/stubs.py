@@ -0,0 +1,112 @@
+import zlib
+import numpy as np
+
+from core.telemetry.tracer import tracer
+
+# Tiny stand-ins for Whisper, the LLM and XTTS. They expose the same methods
+# as the real engines and do a small amount of real NumPy work that scales
+# with the input, so the headless runner and the benchmark suite run on any
+# CPU box without model files.
+
+class StubSTT:
+    """Stand-in for STTEngine: log-mel-like FFT front end, fixed transcript."""
+
+    def __init__(self, transcript="what is the weather like today", frame=400, hop=160):
+        self.transcript = transcript
+        self.frame = frame
+        self.hop = hop
+        self.is_loaded = True
+
+    def transcribe_audio(self, audio_data, sample_rate=16000, turn_id=None, cancel_token=None, on_partial=None):
+        audio = np.asarray(audio_data, dtype=np.float32)
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        if len(audio) < self.frame:
+            return ""
+        # Framed FFT over the whole clip, like Whisper's front end
+        idx = np.arange(self.frame)[None, :] + self.hop * np.arange((len(audio) - self.frame) // self.hop + 1)[:, None]
+        spectrum = np.abs(np.fft.rfft(audio[idx] * np.hanning(self.frame), axis=1))
+        log_mel = np.log1p(spectrum)
+        if cancel_token and cancel_token.cancelled:
+            return ""
+        text = self.transcript if float(log_mel.mean()) > 0 else ""
+        if on_partial and text:
+            on_partial(text)
+        return text
+
+class StubLLM:
+    """Stand-in for LLMEngine: a tiny random recurrent model decoding greedily."""
+
+    def __init__(self, vocab_size=512, dim=128, seed=0):
+        rng = np.random.default_rng(seed)
+        self.embed = rng.standard_normal((vocab_size, dim)).astype(np.float32) / np.sqrt(dim)
+        self.recur = rng.standard_normal((dim, dim)).astype(np.float32) / np.sqrt(dim)
+        self.vocab = [f"tok{i}" for i in range(vocab_size)]
+        self.model_key = "stub"
+        self.model = self
+        self.last_token_count = 0
+
+    def generate(self, prompt, system_prompt=None, max_tokens=200, turn_id=None, cancel_token=None,
+                 deadline_s=None, target_tokens=None):
+        max_tokens = max_tokens or 200
+        # "Prefill": fold the prompt into the hidden state
+        hidden = np.zeros(self.recur.shape[0], dtype=np.float32)
+        for word in prompt.split():
+            hidden = np.tanh(self.recur @ hidden + self.embed[zlib.crc32(word.encode()) % len(self.vocab)])
+        tokens = []
+        token = 0
+        for _ in range(max_tokens):
+            if cancel_token and cancel_token.cancelled:
+                return ""
+            hidden = np.tanh(self.recur @ hidden + self.embed[token])
+            token = int(np.argmax(self.embed @ hidden))
+            if not tokens and turn_id:
+                tracer.mark("first_token", turn_id)
+            tokens.append(self.vocab[token])
+        self.last_token_count = len(tokens)
+        if turn_id:
+            tracer.mark("last_token", turn_id, tokens=len(tokens))
+        return " ".join(tokens)
+
+    def generate_stream(self, prompt, system_prompt=None, max_tokens=200, turn_id=None, cancel_token=None,
+                        deadline_s=None, target_tokens=None, result=None):
+        words = self.generate(prompt, system_prompt, max_tokens, turn_id, cancel_token).split()
+        if result is not None:
+            result["text"] = " ".join(words)
+            result["stop"] = None
+        for i, word in enumerate(words):
+            yield word if i == 0 else " " + word
+
+class StubTTS:
+    """Stand-in for VoiceUser: additive sine synthesis, ~0.3 s of audio per word."""
+
+    def __init__(self, sample_rate=24000, seconds_per_word=0.3):
+        self.sample_rate = sample_rate
+        self.seconds_per_word = seconds_per_word
+        self.model = self
+        self.latents = True
+
+    def synthesize(self, text):
+        if len(text) > 200:
+            text = text[:197] + "..."
+        words = text.split()
+        n = int(self.sample_rate * self.seconds_per_word)
+        t = np.arange(n, dtype=np.float32) / self.sample_rate
+        harmonics = np.arange(1, 9, dtype=np.float32)[:, None]
+        pieces = []
+        for word in words:
+            f0 = 110 + (zlib.crc32(word.encode()) % 120)
+            pieces.append((np.sin(2 * np.pi * f0 * harmonics * t) / harmonics).sum(axis=0) * 0.1)
+        audio = np.concatenate(pieces) if pieces else np.zeros(0, dtype=np.float32)
+        return audio.astype(np.float32), self.sample_rate, text
+
+    def speak(self, text, turn_id=None, cancel_token=None):
+        # Headless: synthesize only, nothing to play
+        self.synthesize(text)
+        tracer.end_turn(turn_id)
+
+    def stop(self):
+        pass
+
+    def load_voice(self, voice_name):
+        pass
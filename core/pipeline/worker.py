@@ -0,0 +1,143 @@
+from contextlib import nullcontext
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from core.tools.search import google_search
+from core.tools.local_search import local_search
+from core.telemetry.tracer import tracer
+from core.telemetry.ui_profiler import ui_profiler
+
+class SirisWorker(QObject):
+    response_ready = pyqtSignal(str, str)  # turn_id, response
+    response_delta = pyqtSignal(str, str)  # turn_id, text delta (only when stream_deltas is set)
+    
+    def __init__(self, llm, chat_manager, internet_default=True, sessions=None):
+        super().__init__()
+        self.llm = llm
+        self.chat_manager = chat_manager
+        self.use_internet = internet_default
+        self.use_local_index = True
+        # Optional SessionManager for serving several conversations at once
+        self.sessions = sessions
+        # Optional admission gate (see core.server.api) wrapped around generation
+        self.llm_gate = None
+        # Optional SemanticMemory recalled into GUI-turn prompts
+        self.memory = None
+        # Emit response_delta while decoding instead of only the finished response
+        self.stream_deltas = False
+        # Voice-turn latency SLO: wall-clock budget and preferred answer length (None = off)
+        self.response_budget_s = None
+        self.target_tokens = None
+    
+    def process(self, query, turn_id=None, cancel_token=None, speculation=None, session_id=None, max_tokens=200):
+        if session_id is not None:
+            return self.process_session(session_id, query, cancel_token=cancel_token, max_tokens=max_tokens)
+        full_prompt = self.build_prompt(query, turn_id=turn_id, cancel_token=cancel_token, speculation=speculation)
+        budget = {}
+        if self.response_budget_s:
+            budget["deadline_s"] = self.response_budget_s
+        if self.target_tokens:
+            budget["target_tokens"] = self.target_tokens
+        if self.stream_deltas:
+            parts = []
+            result = {}
+            for delta in self.llm.generate_stream(full_prompt, turn_id=turn_id, cancel_token=cancel_token,
+                                                  result=result, **budget):
+                parts.append(delta)
+                ui_profiler.emitted("response_delta")
+                self.response_delta.emit(turn_id or "", delta)
+            # The engine's final text drops a sentence the deadline cut off
+            response = result.get("text", "".join(parts).strip())
+        else:
+            response = self.llm.generate(full_prompt, turn_id=turn_id, cancel_token=cancel_token, **budget)
+        if cancel_token: cancel_token.raise_if_cancelled()
+        ui_profiler.emitted("response_ready")
+        self.response_ready.emit(turn_id or "", response)
+        return response
+
+    def process_session(self, session_id, query, cancel_token=None, max_tokens=200):
+        """Answer within one session's history/settings and record the exchange there."""
+        with self.sessions.use(session_id) as session:
+            settings = session.settings
+            prompt = self.build_prompt(query, history=session.history(limit=5), cancel_token=cancel_token,
+                                       use_internet=settings.get("internet", self.use_internet))
+            with self._gate():
+                response = self.llm.generate(prompt, max_tokens=settings.get("max_tokens", max_tokens), cancel_token=cancel_token)
+            if cancel_token: cancel_token.raise_if_cancelled()
+            session.chat.add_message("user", query)
+            session.chat.add_message("assistant", response)
+        return response
+
+    def process_stream(self, query, session_id=None, history=None, use_internet=None, cancel_token=None, max_tokens=200):
+        """Yield response deltas. With a session_id the exchange is recorded in that session."""
+        if session_id is None:
+            prompt = self.build_prompt(query, history=history or [], cancel_token=cancel_token, use_internet=use_internet)
+            with self._gate():
+                yield from self.llm.generate_stream(prompt, max_tokens=max_tokens, cancel_token=cancel_token)
+            return
+        
+        with self.sessions.use(session_id) as session:
+            settings = session.settings
+            prompt = self.build_prompt(query, history=session.history(limit=5), cancel_token=cancel_token,
+                                       use_internet=settings.get("internet", self.use_internet if use_internet is None else use_internet))
+            parts = []
+            with self._gate():
+                for delta in self.llm.generate_stream(prompt, max_tokens=settings.get("max_tokens", max_tokens), cancel_token=cancel_token):
+                    parts.append(delta)
+                    yield delta
+            if cancel_token and cancel_token.cancelled:
+                return
+            session.chat.add_message("user", query)
+            session.chat.add_message("assistant", "".join(parts).strip())
+
+    def _gate(self):
+        return self.llm_gate.admit() if self.llm_gate else nullcontext()
+
+    def build_prompt(self, query, history=None, turn_id=None, cancel_token=None, speculation=None, use_internet=None):
+        """Prompt with search grounding and recent history. history=None reads it from the chat manager."""
+        if use_internet is None:
+            use_internet = self.use_internet
+        
+        # Get context from chat history
+        recall = None
+        if history is None:
+            history = self.chat_manager.get_context(limit=5)
+            if self.memory:
+                # Skip exchanges of this chat that are already in the history window
+                messages = self.chat_manager.current_chat_data.get("messages", [])
+                recall = self.memory.search(query, k=3, exclude_chat=self.chat_manager.current_chat_id,
+                                            exclude_from_index=len(messages) - 5)
+                tracer.mark("memory_done", turn_id, hits=len(recall))
+        
+        # Build context string or pass messages if LLM supports it
+        # For now, we'll prepend recent history to the query if needed, 
+        # but LLMEngine.generate takes a prompt. 
+        # Ideally we should update LLMEngine to accept messages.
+        # For now, we'll stick to simple prompt or context injection.
+        
+        if use_internet:
+            # Reuse a search started from the partial transcript if it matches
+            search_results = speculation.resolve(query) if speculation else None
+            speculative = search_results is not None
+            if not speculative:
+                search_results = google_search(query, cancel_token=cancel_token)
+            if cancel_token: cancel_token.raise_if_cancelled()
+            tracer.mark("search_done", turn_id, speculative=speculative)
+            context = f"Web Results:\\n{search_results}\\n\\nUser Query: {query}"
+        elif self.use_local_index:
+            # Offline: ground the answer in past chats and local documents
+            local_results = local_search(query, cancel_token=cancel_token)
+            if cancel_token: cancel_token.raise_if_cancelled()
+            tracer.mark("search_done", turn_id, local=True, hits=local_results.count("Source:"))
+            context = f"Local Notes:\n{local_results}\n\nUser Query: {query}" if local_results else query
+        else:
+            context = query
+        if recall:
+            context = f"Related past conversations:\n{self.memory.format_hits(recall)}\n\n{context}"
+            
+        # Add history context if available (simple concatenation for now)
+        if history:
+            hist_text = "\\n".join([f"{msg['role']}: {msg['content']}" for msg in history])
+            full_prompt = f"History:\\n{hist_text}\\n\\nCurrent User Query: {context}"
+        else:
+            full_prompt = context
+        return full_prompt
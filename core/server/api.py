@@ -0,0 +1,325 @@
+import io
+import sys
+import json
+import time
+import argparse
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from core.chat.session_manager import SessionManager
+from core.pipeline.orchestrator import CancelToken
+from core.pipeline.worker import SirisWorker
+from core.pipeline.headless import load_engines, read_wav, write_wav
+
+MAX_BODY_BYTES = 25 * 1024 * 1024
+DEFAULT_MAX_TOKENS = 200
+
+class Overloaded(Exception):
+    """Raised when a request can't be admitted; mapped to HTTP 503."""
+    pass
+
+class AdmissionGate:
+    """Concurrency limit plus a bounded wait queue for one engine."""
+
+    def __init__(self, name, max_concurrent=1, max_queue=8, queue_timeout=30.0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.slots = threading.BoundedSemaphore(max_concurrent)
+        self.lock = threading.Lock()
+        self.waiting = 0
+        self.active = 0
+        self.served = 0
+        self.rejected = 0
+
+    @contextmanager
+    def admit(self):
+        with self.lock:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise Overloaded(f"{self.name} queue full ({self.waiting} waiting)")
+            self.waiting += 1
+        acquired = self.slots.acquire(timeout=self.queue_timeout)
+        with self.lock:
+            self.waiting -= 1
+            if not acquired:
+                self.rejected += 1
+            else:
+                self.active += 1
+        if not acquired:
+            raise Overloaded(f"{self.name} busy for more than {self.queue_timeout:.0f}s")
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.served += 1
+            self.slots.release()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "active": self.active,
+                "waiting": self.waiting,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "served": self.served,
+                "rejected": self.rejected,
+            }
+
+class SirisServer:
+    """Serves transcription, chat and speech from one shared set of loaded engines."""
+
+    def __init__(self, stt, llm, tts=None, host="127.0.0.1", port=8765,
+                 llm_concurrency=1, stt_concurrency=1, tts_concurrency=1, max_queue=8,
+                 queue_timeout=30.0, max_connections=64, sessions=None, max_tokens=1024, use_local_index=False):
+        self.stt = stt
+        self.llm = llm
+        self.tts = tts
+        self.gates = {
+            "stt": AdmissionGate("stt", stt_concurrency, max_queue, queue_timeout),
+            "llm": AdmissionGate("llm", llm_concurrency, max_queue, queue_timeout),
+            "tts": AdmissionGate("tts", tts_concurrency, max_queue, queue_timeout),
+        }
+        # Stateless requests bring their own history; stateful ones name a session
+        self.sessions = sessions or SessionManager()
+        self.worker = SirisWorker(llm, chat_manager=None, internet_default=False, sessions=self.sessions)
+        self.worker.llm_gate = self.gates["llm"]
+        # The local index holds the desktop user's chats; only serve it when asked to
+        self.worker.use_local_index = use_local_index
+        self.max_tokens = max_tokens
+        self.connections = threading.BoundedSemaphore(max_connections)
+        self.started_at = time.time()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def serve_forever(self):
+        host, port = self.address[:2]
+        print(f"🌐 Siris server listening on http://{host}:{port}")
+        self.httpd.serve_forever()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.sessions.flush()
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "engines": {
+                "stt": bool(getattr(self.stt, "is_loaded", False)),
+                "llm": getattr(self.llm, "model", None) is not None,
+                "tts": self.tts is not None and getattr(self.tts, "model", None) is not None,
+            },
+            "queues": {name: gate.stats() for name, gate in self.gates.items()},
+            "sessions": self.sessions.stats(),
+        }
+
+    # --- ENDPOINT LOGIC ---
+    def transcribe(self, wav_bytes):
+        audio = read_wav(io.BytesIO(wav_bytes))
+        with self.gates["stt"].admit():
+            text = self.stt.transcribe_audio(audio)
+        return {"text": text}
+
+    def chat(self, body, cancel_token=None):
+        message = self._message(body)
+        session_id = body.get("session")
+        # Search runs before taking an LLM slot so network waits don't block generation
+        response = "".join(self.chat_stream(body, cancel_token)) if not session_id else self.worker.process(
+            message, session_id=session_id, cancel_token=cancel_token, max_tokens=self._max_tokens(body))
+        return {"response": response.strip(), "session": session_id}
+
+    def chat_stream(self, body, cancel_token=None):
+        return self.worker.process_stream(
+            self._message(body),
+            session_id=body.get("session"),
+            history=body.get("history") or [],
+            use_internet=body.get("internet"),
+            cancel_token=cancel_token,
+            max_tokens=self._max_tokens(body),
+        )
+
+    def _max_tokens(self, body):
+        """Requested token limit, capped at the server's maximum."""
+        value = body.get("max_tokens", DEFAULT_MAX_TOKENS)
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError("'max_tokens' must be a positive integer")
+        return min(value, self.max_tokens)
+
+    @staticmethod
+    def _message(body):
+        message = body.get("message", "").strip()
+        if not message:
+            raise ValueError("'message' is required")
+        return message
+
+    def session_info(self, session_id):
+        with self.sessions.use(session_id, create=False) as session:
+            return {
+                "session": session.id,
+                "settings": session.settings,
+                "token_count": session.token_count,
+                "messages": session.history(limit=50),
+            }
+
+    def speak(self, body):
+        if self.tts is None:
+            raise Overloaded("speech output is disabled on this server")
+        text = body.get("text", "").strip()
+        if not text:
+            raise ValueError("'text' is required")
+        with self.gates["tts"].admit():
+            audio, rate, _ = self.tts.synthesize(text)
+        buffer = io.BytesIO()
+        write_wav(buffer, audio, rate)
+        return buffer.getvalue()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.0"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    raise OverflowError(f"body larger than {MAX_BODY_BYTES} bytes")
+                return self.rfile.read(length) if length else b""
+
+            def _read_json(self):
+                raw = self._read_body()
+                return json.loads(raw.decode("utf-8")) if raw else {}
+
+            def do_GET(self):
+                try:
+                    if self.path == "/v1/health":
+                        self._send_json(200, server.health())
+                    elif self.path == "/v1/sessions":
+                        self._send_json(200, {"sessions": server.sessions.list_sessions()})
+                    elif self.path.startswith("/v1/sessions/"):
+                        self._send_json(200, server.session_info(self.path[len("/v1/sessions/"):]))
+                    else:
+                        self._send_json(404, {"error": "not found"})
+                except (KeyError, ValueError) as e:
+                    self._send_json(404, {"error": str(e)})
+
+            def do_POST(self):
+                if not server.connections.acquire(blocking=False):
+                    self._send_json(503, {"error": "too many connections"}, {"Retry-After": "1"})
+                    return
+                try:
+                    self._route()
+                except Overloaded as e:
+                    self._send_json(503, {"error": str(e)}, {"Retry-After": "2"})
+                except OverflowError as e:
+                    self._send_json(413, {"error": str(e)})
+                except (ValueError, KeyError) as e:
+                    self._send_json(400, {"error": str(e)})
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                except Exception as e:
+                    print(f"❌ Server error on {self.path}: {e}")
+                    self._send_json(500, {"error": str(e)})
+                finally:
+                    server.connections.release()
+
+            def _route(self):
+                if self.path == "/v1/transcribe":
+                    self._send_json(200, server.transcribe(self._read_body()))
+                elif self.path == "/v1/chat":
+                    body = self._read_json()
+                    if body.get("stream"):
+                        self._stream_chat(body)
+                    else:
+                        self._send_json(200, server.chat(body))
+                elif self.path == "/v1/sessions":
+                    body = self._read_json()
+                    session_id = server.sessions.create(settings=body.get("settings"), session_id=body.get("session"))
+                    self._send_json(200, {"session": session_id})
+                elif self.path == "/v1/speak":
+                    wav = server.speak(self._read_json())
+                    self.send_response(200)
+                    self.send_header("Content-Type", "audio/wav")
+                    self.send_header("Content-Length", str(len(wav)))
+                    self.end_headers()
+                    self.wfile.write(wav)
+                else:
+                    self._send_json(404, {"error": "not found"})
+
+            def _stream_chat(self, body):
+                """Server-Sent Events: one 'data:' event per text delta, then [DONE]."""
+                token = CancelToken()
+                stream = server.chat_stream(body, cancel_token=token)
+                # Pull the first delta before the headers so admission errors still become a 503
+                first = next(stream, None)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    if first is not None:
+                        self._send_event({"delta": first})
+                        for delta in stream:
+                            self._send_event({"delta": delta})
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client went away: stop decoding for it
+                    token.cancel()
+                    stream.close()
+
+            def _send_event(self, payload):
+                self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+        return Handler
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Siris engines over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stub", action="store_true", help="use the tiny stand-in models")
+    parser.add_argument("--model", default=None, help="LLM model key")
+    parser.add_argument("--voice", default=None, help="voice name for /v1/speak")
+    parser.add_argument("--no-speech", action="store_true", help="don't load TTS")
+    parser.add_argument("--llm-concurrency", type=int, default=1)
+    parser.add_argument("--max-queue", type=int, default=8, help="requests allowed to wait per engine")
+    parser.add_argument("--queue-timeout", type=float, default=30.0)
+    parser.add_argument("--max-tokens", type=int, default=1024, help="upper limit for a request's max_tokens")
+    parser.add_argument("--local-index", action="store_true", help="answer from the local chat index")
+    args = parser.parse_args(argv)
+
+    stt, llm, tts = load_engines(real=not args.stub, model_key=args.model, voice=args.voice, speech=not args.no_speech)
+    server = SirisServer(stt, llm, tts, host=args.host, port=args.port, llm_concurrency=args.llm_concurrency,
+                         max_queue=args.max_queue, queue_timeout=args.queue_timeout,
+                         max_tokens=args.max_tokens, use_local_index=args.local_index)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Shutting down")
+        server.shutdown()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+import os
+import re
+import time
+import difflib
+import threading
+from collections import deque
+import numpy as np
+import sounddevice as sd
+from PyQt6.QtCore import QObject, pyqtSignal
+
+SAMPLE_RATE = 16000
+FRAME = 320  # 20 ms energy frames for the speech gate
+
+def _mel_filterbank(bands=26, n_fft=512, sample_rate=SAMPLE_RATE, low_hz=60.0, high_hz=7600.0):
+    mel = lambda hz: 2595 * np.log10(1 + hz / 700.0)
+    hz = lambda m: 700 * (10 ** (m / 2595.0) - 1)
+    points = hz(np.linspace(mel(low_hz), mel(high_hz), bands + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    bank = np.zeros((len(bins), bands), dtype=np.float32)
+    for band in range(bands):
+        left, center, right = points[band:band + 3]
+        rising = (bins - left) / (center - left)
+        falling = (right - bins) / (right - center)
+        bank[:, band] = np.clip(np.minimum(rising, falling), 0.0, None)
+    return bank
+
+def _dct_matrix(bands=26, coeffs=13):
+    n = np.arange(bands)
+    return np.cos(np.pi / bands * (n[:, None] + 0.5) * np.arange(coeffs)[None, :]).astype(np.float32)
+
+class WordFeatures:
+    """MFCCs (25 ms window, 10 ms hop), mean-normalized, each frame scaled to unit length
+    so frame distance is 1 - dot product."""
+
+    def __init__(self, n_fft=512, win=400, hop=160):
+        self.n_fft = n_fft
+        self.win = win
+        self.hop = hop
+        self.window = np.hamming(win).astype(np.float32)
+        self.bank = _mel_filterbank(n_fft=n_fft)
+        # c0 is loudness; dropping it makes matching level-independent
+        self.dct = _dct_matrix()[:, 1:]
+
+    def __call__(self, audio):
+        if len(audio) < self.win:
+            return np.zeros((0, self.dct.shape[1]), dtype=np.float32)
+        frames = np.lib.stride_tricks.sliding_window_view(audio, self.win)[::self.hop]
+        power = np.abs(np.fft.rfft(frames * self.window, n=self.n_fft, axis=1)) ** 2
+        mfcc = np.log(power @ self.bank + 1e-8) @ self.dct
+        mfcc -= mfcc.mean(axis=0)
+        return mfcc / np.maximum(np.linalg.norm(mfcc, axis=1, keepdims=True), 1e-6)
+
+def match_prefix(template, segment):
+    """Subsequence DTW of template against segment: (mean frame distance, end frame).
+
+    The template may start and end anywhere in the segment. Each template
+    frame advances the segment by 0, 1 or 2 frames, so every row depends only
+    on the one before and the whole match is a loop of len(template) numpy ops.
+    """
+    cost = 1.0 - template @ segment.T
+    total = cost[0].copy()
+    for row in cost[1:]:
+        best = total.copy()
+        best[1:] = np.minimum(best[1:], total[:-1])
+        best[2:] = np.minimum(best[2:], total[:-2])
+        total = row + best
+    end = int(total.argmin())
+    return float(total[end]) / len(template), end
+
+class WakeWordListener(QObject):
+    """Always-on hands-free trigger: a small mic stream, an energy gate and a template keyword spotter.
+
+    The audio callback only queues 100 ms blocks. A worker thread wakes ten
+    times a second, tracks the noise floor, and cuts speech bursts out of the
+    stream. Only those bursts are matched (subsequence DTW of MFCCs) against
+    recordings of the wake phrase in models/wake_word/<phrase>/, so the cost
+    of silence is a few array ops per wake-up.
+
+    Until enough templates exist, bursts (or the first max_word_s of a
+    longer one) are confirmed with the speech recognizer (confirm(audio) ->
+    text) and the phrase part is saved as a template, so the spotter trains
+    itself from the first few uses. The recognizer is far more expensive than
+    the spotter, so its process CPU is metered and held to confirm_cpu_share
+    of one core; bursts over budget are skipped.
+
+    After a detection the stream is handed to the recorder with capture(sink)
+    without a gap: audio after the wake word is buffered until the sink
+    attaches. With endpoint=True, capture_ended fires once the user stops talking.
+    """
+
+    detected = pyqtSignal(float)  # match score 0..1
+    capture_ended = pyqtSignal()
+
+    def __init__(self, phrase="siris", sensitivity=0.5, confirm=None, template_dir="models/wake_word",
+                 device=None, block_ms=100, min_templates=3, max_templates=8,
+                 min_word_s=0.2, max_word_s=1.6, cooldown_s=1.5, end_silence_s=1.0, max_capture_s=20.0,
+                 confirm_cpu_share=0.03, confirm_burst_s=2.0):
+        super().__init__()
+        self.phrase = phrase.lower().strip()
+        self.confirm = confirm
+        self.template_dir = os.path.join(template_dir, re.sub(r"[^a-z0-9]+", "_", self.phrase))
+        self.device = device
+        self.block = SAMPLE_RATE * block_ms // 1000
+        self.min_templates = min_templates
+        self.max_templates = max_templates
+        self.min_word = int(min_word_s * SAMPLE_RATE)
+        self.max_word = int(max_word_s * SAMPLE_RATE)
+        self.cooldown_s = cooldown_s
+        self.end_silence_s = end_silence_s
+        self.max_capture_s = max_capture_s
+        # Leaky bucket of recognizer CPU seconds: refills at confirm_cpu_share, holds at most confirm_burst_s
+        self.confirm_cpu_share = confirm_cpu_share
+        self.confirm_burst_s = confirm_burst_s
+        self.confirm_allowance = confirm_burst_s
+        self.confirm_refilled = time.monotonic()
+        self.set_sensitivity(sensitivity)
+
+        self.features = WordFeatures()
+        self.templates = []
+        self._load_templates()
+
+        self.lock = threading.Lock()
+        self.inbox = deque(maxlen=100)  # 10 s of blocks if the worker stalls
+        self.sink = None
+        self.handoff = None  # blocks held between a detection and capture()
+        self.muted = False
+        self.stream = None
+        self.thread = None
+        self.running = False
+
+        self.noise_floor = 1e-3
+        self.segment = []
+        self.segment_len = 0
+        self.segment_checked = False
+        self.silent_frames = 0
+        self.preroll = deque(maxlen=3)
+        self.quiet_until = 0.0
+        self.capturing = None  # {"endpoint", "started", "heard", "last_voice"} while capturing
+
+        self.stats_data = {"started": 0.0, "worker_cpu_s": 0.0, "callback_s": 0.0, "bursts": 0,
+                           "matched": 0, "confirmed": 0, "confirm_skipped": 0, "detections": 0, "match_ms": 0.0,
+                           "confirm_cpu_s": 0.0, "confirm_thread_s": 0.0}
+
+    # --- CONFIG ---
+    def set_sensitivity(self, sensitivity):
+        """0 (strict) .. 1 (eager): lowers both the speech gate and the match threshold."""
+        self.sensitivity = min(1.0, max(0.0, float(sensitivity)))
+        # Speech must be this far above the noise floor (12 dB strict .. 6 dB eager)
+        self.gate_ratio = 10 ** ((12 - 6 * self.sensitivity) / 20)
+        # Mean MFCC frame distance accepted as the phrase
+        self.max_distance = 0.25 + 0.25 * self.sensitivity
+
+    def set_muted(self, muted):
+        """Ignore the room while Siris is talking (its own voice would trigger it)."""
+        self.muted = bool(muted)
+        if not muted:
+            self.quiet_until = time.monotonic() + 0.3
+
+    def _load_templates(self):
+        if not os.path.isdir(self.template_dir):
+            return
+        for name in sorted(os.listdir(self.template_dir)):
+            if name.endswith(".npy"):
+                try:
+                    self.templates.append(self.features(np.load(os.path.join(self.template_dir, name))))
+                except Exception as e:
+                    print(f"⚠️ Skipping wake word template {name}: {e}")
+        self.templates = [t for t in self.templates if len(t) >= 5][-self.max_templates:]
+
+    def enroll(self, audio):
+        """Add a recording of just the wake phrase (16 kHz mono float32) as a template."""
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        features = self.features(audio)
+        if len(features) < 5:
+            return False
+        os.makedirs(self.template_dir, exist_ok=True)
+        np.save(os.path.join(self.template_dir, f"{int(time.time() * 1000)}.npy"), audio)
+        self.templates = (self.templates + [features])[-self.max_templates:]
+        print(f"👂 Wake word template saved ({len(self.templates)} total)")
+        return True
+
+    # --- STREAM ---
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.stats_data["started"] = time.monotonic()
+        self.thread = threading.Thread(target=self._run, name="siris-wake-word", daemon=True)
+        self.thread.start()
+        self.stream = sd.InputStream(device=self.device, channels=1, samplerate=SAMPLE_RATE,
+                                     blocksize=self.block, dtype="float32", callback=self._callback)
+        self.stream.start()
+        if len(self.templates) >= self.min_templates:
+            print(f"👂 Listening for '{self.phrase}' (sensitivity {self.sensitivity:.2f})")
+        else:
+            print(f"👂 Listening for '{self.phrase}' (learning: say it a few times with a short pause after it, "
+                  f"speech recognition CPU capped at {self.confirm_cpu_share:.0%} of a core)")
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        if self.stream:
+            self.stream.stop()
+            self.stream.close()
+            self.stream = None
+        print(f"👂 Wake word listener stopped. {self.report()}")
+
+    def _callback(self, indata, frames, time_info, status):
+        start = time.perf_counter()
+        chunk = indata[:, 0].copy()
+        with self.lock:
+            if self.sink is not None:
+                self.sink(chunk)
+            elif self.handoff is not None:
+                self.handoff.append(chunk)
+            self.inbox.append(chunk)
+        self.stats_data["callback_s"] += time.perf_counter() - start
+
+    def capture(self, sink, endpoint=False):
+        """Forward live audio to sink(chunk) (audio thread), starting with anything held since
+        the detection. capture(None) stops forwarding and resumes listening for the wake word."""
+        with self.lock:
+            if sink is not None:
+                for chunk in self.handoff or []:
+                    sink(chunk)
+                self.capturing = {"endpoint": endpoint, "started": time.monotonic(), "heard": False, "last_voice": 0.0}
+            else:
+                self.capturing = None
+                self.quiet_until = time.monotonic() + self.cooldown_s
+            self.handoff = None
+            self.sink = sink
+            self._reset_segment()
+
+    # --- WORKER ---
+    def _run(self):
+        cpu_start = time.thread_time()
+        while self.running:
+            time.sleep(self.block / SAMPLE_RATE)
+            with self.lock:
+                chunks = list(self.inbox)
+                self.inbox.clear()
+            if chunks:
+                try:
+                    self._process(np.concatenate(chunks))
+                except Exception as e:
+                    print(f"⚠️ Wake word error: {e}")
+            self.stats_data["worker_cpu_s"] = time.thread_time() - cpu_start
+
+    def _process(self, audio):
+        usable = len(audio) - len(audio) % FRAME
+        energy = np.sqrt(np.mean(audio[:usable].reshape(-1, FRAME) ** 2, axis=1))
+        voiced = energy > self.noise_floor * self.gate_ratio
+        # Noise floor follows quiet frames quickly down and slowly up
+        quiet = energy[~voiced]
+        if len(energy):
+            # A room that never goes quiet (fan, music) slowly becomes the new floor
+            level = float(np.median(quiet)) if len(quiet) else float(energy.min())
+            rate = 0.5 if level < self.noise_floor else (0.05 if len(quiet) else 0.02)
+            self.noise_floor = max(1e-4, self.noise_floor + rate * (level - self.noise_floor))
+
+        if self.capturing is not None:
+            self._track_capture(voiced)
+            return
+        if self.handoff is not None or self.muted or time.monotonic() < self.quiet_until:
+            self._reset_segment()
+            return
+
+        for i, (frame, is_voiced) in enumerate(zip(audio[:usable].reshape(-1, FRAME), voiced)):
+            if self.segment or is_voiced:
+                if not self.segment:
+                    # Keep a little audio from before the onset: consonants start quiet
+                    self.segment = list(self.preroll)
+                    self.segment_len = sum(len(f) for f in self.segment)
+                if not self.segment_checked:
+                    self.segment.append(frame)
+                    self.segment_len += FRAME
+                self.silent_frames = 0 if is_voiced else self.silent_frames + 1
+                ended = self.silent_frames * FRAME >= SAMPLE_RATE * 0.3
+                if (ended or self.segment_len >= self.max_word) and not self.segment_checked:
+                    self.segment_checked = True
+                    rest = audio[(i + 1) * FRAME:]
+                    if self._check(np.concatenate(self.segment), rest, complete=ended):
+                        return
+                if ended:
+                    self._reset_segment()
+            else:
+                self.preroll.append(frame)
+
+    def _reset_segment(self):
+        self.segment = []
+        self.segment_len = 0
+        self.segment_checked = False
+        self.silent_frames = 0
+
+    def _check(self, audio, rest, complete):
+        """Match a speech burst; on detection hold everything after the phrase for capture()."""
+        if self.segment_len - self.silent_frames * FRAME < self.min_word:
+            return False
+        self.stats_data["bursts"] += 1
+        if len(self.templates) >= self.min_templates:
+            score, end = self._match(audio)
+        elif self.confirm is not None:
+            score, end = self._confirm(audio, complete)
+        else:
+            return False
+        if score <= 0:
+            return False
+        with self.lock:
+            self.handoff = [audio[end:], rest] + list(self.inbox)
+            self.inbox.clear()
+        self.stats_data["detections"] += 1
+        self._reset_segment()
+        print(f"👂 Wake word detected (score {score:.2f}). {self.report()}")
+        self.detected.emit(score)
+        return True
+
+    def _match(self, audio):
+        start = time.perf_counter()
+        segment = self.features(audio)
+        best, end = None, 0
+        for template in self.templates:
+            if len(segment) < len(template) // 2:
+                continue
+            distance, frame = match_prefix(template, segment)
+            if best is None or distance < best:
+                best, end = distance, frame
+        self.stats_data["matched"] += 1
+        self.stats_data["match_ms"] += (time.perf_counter() - start) * 1000
+        if best is None or best > self.max_distance:
+            return 0.0, 0
+        # Audio after the matched frame belongs to the command
+        end_sample = min(len(audio), (end + 1) * self.features.hop + self.features.win)
+        return 1.0 - best / self.max_distance * 0.5, end_sample
+
+    def _confirm(self, audio, complete):
+        """Ask the speech recognizer whether a burst starts with the phrase; learn it if so."""
+        now = time.monotonic()
+        self.confirm_allowance = min(self.confirm_burst_s, self.confirm_allowance
+                                     + (now - self.confirm_refilled) * self.confirm_cpu_share)
+        self.confirm_refilled = now
+        if self.confirm_allowance <= 0:
+            self.stats_data["confirm_skipped"] += 1
+            return 0.0, 0
+        # Process CPU, not thread CPU: the recognizer decodes on its own threads. This also counts
+        # whatever else the app did meanwhile, so it errs high.
+        cpu_start, thread_start = time.process_time(), time.thread_time()
+        text = self.confirm(audio)
+        spent = time.process_time() - cpu_start
+        self.confirm_allowance -= spent
+        self.stats_data["confirm_cpu_s"] += spent
+        self.stats_data["confirm_thread_s"] += time.thread_time() - thread_start
+        self.stats_data["confirmed"] += 1
+        if not text:
+            return 0.0, 0
+        words = re.findall(r"[a-z']+", text.lower())
+        size = len(self.phrase.split())
+        score = difflib.SequenceMatcher(None, " ".join(words[:size]), self.phrase).ratio()
+        if score < 0.9 - 0.2 * self.sensitivity:
+            return 0.0, 0
+        if complete and len(words) <= size + 1:
+            # The burst was just the phrase
+            voiced_end = len(audio) - self.silent_frames * FRAME
+            self.enroll(audio[:voiced_end])
+            return score, len(audio)
+        # "Siris, what's ..." in one breath: the phrase ends at the first short pause, if there is one
+        pause = self._first_pause(audio)
+        if pause is None:
+            return score, len(audio)
+        self.enroll(audio[:pause])
+        return score, pause
+
+    def _first_pause(self, audio, min_pause_s=0.08):
+        """Sample where the first pause of at least min_pause_s after min_word_s starts, else None."""
+        usable = len(audio) - len(audio) % FRAME
+        energy = np.sqrt(np.mean(audio[:usable].reshape(-1, FRAME) ** 2, axis=1))
+        quiet = energy <= self.noise_floor * self.gate_ratio
+        needed = int(min_pause_s * SAMPLE_RATE / FRAME)
+        run = 0
+        for frame in range(self.min_word // FRAME, len(quiet)):
+            run = run + 1 if quiet[frame] else 0
+            if run >= needed:
+                return (frame - run + 1) * FRAME
+        return None
+
+    def _track_capture(self, voiced):
+        capture = self.capturing
+        now = time.monotonic()
+        if voiced.any():
+            capture["heard"] = True
+            capture["last_voice"] = now
+        if not capture["endpoint"]:
+            return
+        silence = now - (capture["last_voice"] if capture["heard"] else capture["started"])
+        # Give the user a moment to start talking after the wake word
+        limit = self.end_silence_s if capture["heard"] else self.end_silence_s * 4
+        if silence >= limit or now - capture["started"] >= self.max_capture_s:
+            capture["endpoint"] = False
+            self.capture_ended.emit()
+
+    # --- METRICS ---
+    def stats(self):
+        stats = dict(self.stats_data)
+        wall = max(1e-6, time.monotonic() - stats["started"]) if stats["started"] else 0.0
+        spotter_s = stats["worker_cpu_s"] - stats["confirm_thread_s"] + stats["callback_s"]
+        stats["spotter_cpu_percent"] = round(spotter_s / wall * 100, 2) if wall else 0.0
+        stats["confirm_cpu_percent"] = round(stats["confirm_cpu_s"] / wall * 100, 2) if wall else 0.0
+        stats["cpu_percent"] = round(stats["spotter_cpu_percent"] + stats["confirm_cpu_percent"], 2)
+        stats["templates"] = len(self.templates)
+        stats["noise_floor"] = round(self.noise_floor, 5)
+        return stats
+
+    def report(self):
+        stats = self.stats()
+        return (f"CPU {stats['cpu_percent']:.1f}% of one core ({stats['confirm_cpu_percent']:.1f}% speech recognition), "
+                f"{stats['bursts']} speech bursts, {stats['detections']} detections, {stats['templates']} templates")
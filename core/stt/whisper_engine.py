@@ -1,6 +1,8 @@
 import json
+import threading
 import numpy as np
 from PyQt6.QtCore import QObject, pyqtSignal
+from core.telemetry.tracer import tracer
 
 class STTEngine(QObject):
     transcription_ready = pyqtSignal(str)
@@ -10,6 +12,10 @@ class STTEngine(QObject):
         self.model = None
         self.is_loaded = False
         self.use_openai_whisper = False
+        # Whisper models aren't safe to call from two threads at once
+        self.lock = threading.Lock()
+        # Set while a final decode waits for the lock; partials give way to it
+        self.final_waiting = threading.Event()
         
         # Load config
         with open("config/paths.json", "r") as f:
@@ -38,27 +44,83 @@ class STTEngine(QObject):
         except Exception as e:
             print(f"❌ Error loading Whisper model: {e}")
             self.is_loaded = False
+
+    def unload(self):
+        """Free the model; load_model() brings it back."""
+        with self.lock:
+            self.model = None
+            self.is_loaded = False
     
-    def transcribe_audio(self, audio_data, sample_rate=16000):
+    def _prepare_audio(self, audio_data):
+        if len(audio_data.shape) > 1:
+            audio_data = audio_data.mean(axis=1)
+        audio_float = audio_data.astype(np.float32).flatten()
+        max_val = np.abs(audio_float).max()
+        if max_val > 1.0:
+            audio_float = audio_float / max_val
+        return audio_float
+
+    def _segments(self, audio_float):
+        """Yield (end seconds, text) for each decoded segment."""
+        if self.use_openai_whisper:
+            result = self.model.transcribe(audio_float, language='en', fp16=False)
+            for segment in result['segments']:
+                yield segment['end'], segment['text'].strip()
+            return
+        
+        # Faster-Whisper decodes lazily, one segment per iteration
+        segments, info = self.model.transcribe(audio_float, language='en')
+        for segment in segments:
+            yield segment.end, segment.text.strip()
+
+    def _decode(self, audio_float, on_partial=None):
+        texts = []
+        for _, text in self._segments(audio_float):
+            texts.append(text)
+            if on_partial:
+                on_partial(" ".join(texts).strip())
+        return " ".join(texts).strip()
+
+    def transcribe_partial(self, audio_data, segments=False):
+        """Quick decode of audio recorded so far.
+
+        Returns the text, or the (end seconds, text) segments when asked.
+        Returns None if the model is busy or a final decode wants it.
+        """
+        if not self.is_loaded or self.final_waiting.is_set():
+            return None
+        if not self.lock.acquire(blocking=False):
+            return None
+        try:
+            decoded = []
+            for segment in self._segments(self._prepare_audio(audio_data)):
+                # Stop between segments instead of holding up the final transcript
+                if self.final_waiting.is_set():
+                    return None
+                decoded.append(segment)
+            return decoded if segments else " ".join(text for _, text in decoded).strip()
+        except Exception as e:
+            print(f"⚠️ Partial transcription error: {e}")
+            return None
+        finally:
+            self.lock.release()
+
+    def transcribe_audio(self, audio_data, sample_rate=16000, turn_id=None, cancel_token=None, on_partial=None):
         if not self.is_loaded:
             return "STT model not loaded"
         
         try:
-            if len(audio_data.shape) > 1:
-                audio_data = audio_data.mean(axis=1)
-            audio_float = audio_data.astype(np.float32).flatten()
-            max_val = np.abs(audio_float).max()
-            if max_val > 1.0:
-                audio_float = audio_float / max_val
-            
-            if self.use_openai_whisper:
-                result = self.model.transcribe(audio_float, language='en', fp16=False)
-                text = result['text'].strip()
-            else:
-                segments, info = self.model.transcribe(audio_float, language='en')
-                text = " ".join([segment.text for segment in segments]).strip()
+            audio_float = self._prepare_audio(audio_data)
+            self.final_waiting.set()
+            with self.lock:
+                self.final_waiting.clear()
+                text = self._decode(audio_float, on_partial=on_partial)
             
             print(f"📄 Transcription: '{text}'")
+            tracer.mark("stt_done", turn_id, chars=len(text))
+            # Don't hand a stale transcript to the app after barge-in
+            if cancel_token and cancel_token.cancelled:
+                return ""
             self.transcription_ready.emit(text)
             return text
         except Exception as e:
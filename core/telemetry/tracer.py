@@ -0,0 +1,167 @@
+import os
+import sys
+import math
+import json
+import time
+import uuid
+import glob
+import threading
+import logging
+from logging.handlers import RotatingFileHandler
+
+# Stages of a voice turn, in pipeline order
+STAGES = [
+    "key_release",
+    "stt_done",
+    "search_done",
+    "first_token",
+    "last_token",
+    "first_audio",
+    "playback_end",
+]
+
+class Tracer:
+    """Stamps every stage of a voice turn and writes one span per stage to a rotating JSONL file."""
+
+    def __init__(self, log_path="logs/traces.jsonl", max_bytes=5 * 1024 * 1024, backup_count=5, enabled=True):
+        self.log_path = log_path
+        self.enabled = enabled and os.environ.get("SIRIS_TRACE", "1") != "0"
+        self.current_turn = None
+        self.turns = {}  # turn_id -> {"start": perf_counter, "last": perf_counter, "last_stage": str}
+        self.max_open_turns = 32
+        self.lock = threading.Lock()
+        self.logger = None
+
+        if not self.enabled:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+            handler = RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self.logger = logging.getLogger("siris.trace")
+            self.logger.setLevel(logging.INFO)
+            self.logger.propagate = False
+            self.logger.addHandler(handler)
+        except Exception as e:
+            print(f"⚠️ Tracing disabled: {e}")
+            self.enabled = False
+
+    def begin_turn(self, turn_id=None, stage="key_release"):
+        """Start a new turn and stamp its first stage. Returns the turn ID."""
+        turn_id = turn_id or uuid.uuid4().hex[:12]
+        now = time.perf_counter()
+        with self.lock:
+            self.turns[turn_id] = {"start": now, "last": now, "last_stage": None}
+            self.current_turn = turn_id
+            # Drop the oldest turns that never finished (e.g. empty transcriptions)
+            while len(self.turns) > self.max_open_turns:
+                self.turns.pop(next(iter(self.turns)))
+        self.mark(stage, turn_id)
+        return turn_id
+
+    def mark(self, stage, turn_id=None, **extra):
+        """Record a span from the previous stage of the turn up to now."""
+        # Untraced callers (chat naming, server requests) pass no turn ID
+        if not self.enabled or not turn_id:
+            return
+        now = time.perf_counter()
+        with self.lock:
+            state = self.turns.get(turn_id)
+            if state is None:
+                return
+            # Only the first occurrence of a stage counts (e.g. first_token)
+            if stage == state["last_stage"]:
+                return
+            span = {
+                "turn": turn_id,
+                "stage": stage,
+                "prev": state["last_stage"],
+                "ts": time.time(),
+                "duration_ms": round((now - state["last"]) * 1000, 3),
+                "elapsed_ms": round((now - state["start"]) * 1000, 3),
+            }
+            span.update(extra)
+            state["last"] = now
+            state["last_stage"] = stage
+        self.logger.info(json.dumps(span))
+
+    def end_turn(self, turn_id=None, stage=None, **extra):
+        """Optionally stamp a final stage, then forget the turn."""
+        if not turn_id:
+            return
+        if stage:
+            self.mark(stage, turn_id, **extra)
+        with self.lock:
+            self.turns.pop(turn_id, None)
+            if self.current_turn == turn_id:
+                self.current_turn = None
+
+def load_spans(log_path="logs/traces.jsonl"):
+    """Read spans from the log and all of its rotated backups."""
+    spans = []
+    for path in sorted(glob.glob(log_path + "*")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        try: spans.append(json.loads(line))
+                        except ValueError: pass
+        except OSError:
+            continue
+    return spans
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+def summarize(spans):
+    """Per-stage p50/p95/p99 of stage duration and of time since key release."""
+    by_stage = {}
+    for span in spans:
+        entry = by_stage.setdefault(span.get("stage"), {"duration": [], "elapsed": []})
+        entry["duration"].append(span.get("duration_ms", 0.0))
+        entry["elapsed"].append(span.get("elapsed_ms", 0.0))
+
+    order = STAGES + sorted(s for s in by_stage if s not in STAGES)
+    summary = []
+    for stage in order:
+        if stage not in by_stage:
+            continue
+        row = {"stage": stage, "count": len(by_stage[stage]["duration"])}
+        for key in ("duration", "elapsed"):
+            values = sorted(by_stage[stage][key])
+            for p in (50, 95, 99):
+                row[f"{key}_p{p}"] = percentile(values, p)
+        summary.append(row)
+    return summary
+
+def print_summary(log_path="logs/traces.jsonl"):
+    summary = summarize(load_spans(log_path))
+    if not summary:
+        print(f"No spans found in {log_path}")
+        return
+    header = f"{'stage':<14}{'n':>6}  {'p50':>9}{'p95':>9}{'p99':>9}   {'total p50':>10}{'p95':>9}{'p99':>9}"
+    print("Stage latency (ms) | time since key release (ms)")
+    print(header)
+    print("-" * len(header))
+    for row in summary:
+        print(
+            f"{row['stage']:<14}{row['count']:>6}  "
+            f"{row['duration_p50']:>9.1f}{row['duration_p95']:>9.1f}{row['duration_p99']:>9.1f}   "
+            f"{row['elapsed_p50']:>10.1f}{row['elapsed_p95']:>9.1f}{row['elapsed_p99']:>9.1f}"
+        )
+
+# Shared tracer used across the pipeline
+tracer = Tracer()
+
+if __name__ == "__main__":
+    # Usage: python -m core.telemetry.tracer summary [log_path]
+    if len(sys.argv) < 2 or sys.argv[1] != "summary":
+        print("Usage: python -m core.telemetry.tracer summary [log_path]")
+        sys.exit(1)
+    print_summary(sys.argv[2] if len(sys.argv) > 2 else "logs/traces.jsonl")
@@ -0,0 +1,200 @@
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# Bucket upper edges in ms, roughly x1.5 apart: fine below a frame (16 ms), coarse above
+BUCKETS_MS = [0.1, 0.25, 0.5, 1, 2, 3, 4, 6, 8, 12, 16, 24, 33, 50, 75, 100, 150, 250, 500, 1000, float("inf")]
+
+def ui_profiling_requested():
+    return "--profile-ui" in sys.argv or os.environ.get("SIRIS_PROFILE_UI") == "1"
+
+class Histogram:
+    """Fixed-bucket latency histogram: O(1) to record, percentiles estimated from bucket edges."""
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS_MS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, ms):
+        i = 0
+        while ms > BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, p):
+        """Upper edge of the bucket holding the p-th percentile (capped at the observed max)"""
+        if not self.count:
+            return 0.0
+        rank = p / 100.0 * self.count
+        seen = 0
+        for edge, n in zip(BUCKETS_MS, self.counts):
+            seen += n
+            if seen >= rank:
+                return min(edge, self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max, 3),
+            "buckets": {("inf" if edge == float("inf") else str(edge)): n for edge, n in zip(BUCKETS_MS, self.counts) if n},
+        }
+
+class UIProfiler:
+    """Opt-in GUI-thread timing: paint/handler durations, timer jitter, event-loop lag and signal delivery lag.
+
+    Disabled (the default) every hook is a cheap no-op, so call sites stay in
+    place permanently. Enable with --profile-ui or SIRIS_PROFILE_UI=1; the
+    histograms are written to logs/ui_profile.json and printed on exit.
+    """
+
+    def __init__(self, enabled=None, log_path="logs/ui_profile.json"):
+        self.enabled = ui_profiling_requested() if enabled is None else enabled
+        self.log_path = log_path
+        self.histograms = {}
+        self.last_tick = {}  # timer name -> perf_counter of its previous tick
+        self.emits = {}  # signal name -> deque of emit times not yet delivered
+        self.lock = threading.Lock()
+        self.probe = None
+        self.started = time.perf_counter()
+        self.dumped = False
+        if self.enabled:
+            # Also covers exits that skip aboutToQuit (e.g. sys.exit from a slot)
+            atexit.register(self.dump)
+
+    def record(self, name, ms):
+        if not self.enabled:
+            return
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.record(ms)
+
+    # --- DURATIONS ---
+    def measure(self, name):
+        """with ui_profiler.measure("waveform.paint"): ..."""
+        return self._measure(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    # --- TIMER JITTER ---
+    def tick(self, name, interval_ms):
+        """Call at the top of a timer slot: records how far this tick landed from interval_ms after the last one."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        last = self.last_tick.get(name)
+        self.last_tick[name] = now
+        if last is not None and interval_ms:
+            gap = (now - last) * 1000
+            # Gaps far beyond the interval are the timer being restarted (rate change), not jitter
+            if gap < interval_ms * 4:
+                self.record(name + ".jitter", abs(gap - interval_ms))
+
+    # --- SIGNAL DELIVERY LAG ---
+    def emitted(self, name):
+        """Call on the emitting (worker) thread right before emitting signal name."""
+        if not self.enabled:
+            return
+        with self.lock:
+            queue = self.emits.get(name)
+            if queue is None:
+                queue = self.emits[name] = deque(maxlen=4096)
+            queue.append(time.perf_counter())
+
+    def delivered(self, name, slot):
+        """Wrap a slot so its call records the lag since the matching emitted(name).
+
+        Queued connections deliver in emit order, so emits and deliveries pair up FIFO.
+        """
+        if not self.enabled:
+            return slot
+
+        def wrapper(*args):
+            with self.lock:
+                queue = self.emits.get(name)
+                sent = queue.popleft() if queue else None
+            if sent is not None:
+                self.record(name + ".delivery", (time.perf_counter() - sent) * 1000)
+            with self.measure(name + ".slot"):
+                return slot(*args)
+        return wrapper
+
+    # --- EVENT LOOP LAG ---
+    def start_probe(self, interval_ms=50):
+        """Measure how late a GUI-thread timer fires: time the event loop was busy elsewhere."""
+        if not self.enabled or self.probe is not None:
+            return
+        from PyQt6.QtCore import QTimer, Qt
+        self.probe = QTimer()
+        self.probe.setTimerType(Qt.TimerType.PreciseTimer)
+        self.probe.setInterval(interval_ms)
+        expected = [time.perf_counter() + interval_ms / 1000]
+
+        def check():
+            now = time.perf_counter()
+            self.record("event_loop.lag", max(0.0, (now - expected[0]) * 1000))
+            expected[0] = now + interval_ms / 1000
+        self.probe.timeout.connect(check)
+        self.probe.start()
+
+    # --- REPORT ---
+    def summary(self):
+        with self.lock:
+            return {name: h.to_dict() for name, h in sorted(self.histograms.items())}
+
+    def dump(self):
+        """Write the histograms to log_path and print a table. No-op when disabled."""
+        if not self.enabled or self.dumped:
+            return
+        self.dumped = True
+        if self.probe is not None:
+            self.probe.stop()
+        summary = self.summary()
+        report = {"ts": time.time(), "duration_s": round(time.perf_counter() - self.started, 1), "histograms": summary}
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with open(self.log_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        except Exception as e:
+            print(f"⚠️ Failed to write UI profile: {e}")
+        print_report(summary)
+        print(f"🖥️ UI profile written to {self.log_path}")
+
+def print_report(summary):
+    header = f"{'ui timing (ms)':<28}{'n':>7}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, row in summary.items():
+        print(f"{name:<28}{row['count']:>7}{row['mean_ms']:>9.2f}{row['p50_ms']:>9.2f}"
+              f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['max_ms']:>9.2f}")
+
+# Shared profiler used by the UI
+ui_profiler = UIProfiler()
+
+if __name__ == "__main__":
+    # Usage: python -m core.telemetry.ui_profiler [logs/ui_profile.json]
+    path = sys.argv[1] if len(sys.argv) > 1 else "logs/ui_profile.json"
+    with open(path, "r", encoding="utf-8") as f:
+        print_report(json.load(f)["histograms"])
@@ -0,0 +1,332 @@
+# core/tools/local_search.py
+import os
+import re
+import json
+import math
+import time
+import pickle
+import threading
+import numpy as np
+
+from core.chat.chat_manager import read_chat, chat_id_from_file
+from core.chat.archive import ARCHIVE_DIR, ARCHIVE_EXT
+
+INDEX_VERSION = 1
+TEXT_EXTENSIONS = (".txt", ".md", ".rst", ".py", ".json", ".csv", ".html")
+STOPWORDS = set("""
+a an and are as at be but by for from has have he her his i if in into is it its me my of on or our she so
+that the their them they this to was we were what when where which who why will with you your do does did
+can could would should how about just not no yes
+""".split())
+
+def tokenize(text):
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+def chunk_text(text, words_per_chunk=120, overlap=20):
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, words_per_chunk - overlap)
+    return [" ".join(words[i:i + words_per_chunk]) for i in range(0, max(1, len(words) - overlap), step)]
+
+def chunk_chat(path):
+    """One chunk per user/assistant exchange of a saved chat."""
+    data = read_chat(path)
+    title = data.get("name", os.path.basename(path))
+    chunks, pending = [], []
+    for msg in data.get("messages", []):
+        pending.append(f"{msg['role']}: {msg['content']}")
+        if msg["role"] == "assistant":
+            chunks.append((title, "\n".join(pending)))
+            pending = []
+    if pending:
+        chunks.append((title, "\n".join(pending)))
+    return chunks
+
+def chunk_document(path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        text = f.read()
+    title = os.path.basename(path)
+    return [(title, chunk) for chunk in chunk_text(text)]
+
+class LocalIndex:
+    """Incrementally updated BM25 index over chat history and document folders.
+
+    Postings are kept as Python lists for cheap appends and converted to NumPy
+    arrays on first use after a change, so a query scores only the postings of
+    its own terms with vectorized math. Changed files are re-indexed by
+    tombstoning their old chunks; the index compacts itself when too many
+    tombstones pile up.
+    """
+
+    def __init__(self, chat_dir="chat_history", doc_folders=None, index_path="index/local_index.pkl",
+                 refresh_interval=30.0, k1=1.5, b=0.75):
+        self.chat_dir = chat_dir
+        self.doc_folders = list(doc_folders or [])
+        self.index_path = index_path
+        self.refresh_interval = refresh_interval
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.RLock()
+        # Held for a whole refresh; refresh_async skips instead of waiting on it
+        self.refresh_lock = threading.Lock()
+        self.last_refresh = 0.0
+        self._reset()
+        self._load()
+
+    def _reset(self):
+        self.chunks = []          # chunk_id -> {"source", "title", "text"} or None if deleted
+        self.doc_len = []         # chunk_id -> token count (0 if deleted)
+        self.postings = {}        # term -> ([chunk_ids], [term_freqs])
+        self.files = {}           # path -> {"mtime", "size", "chunks": [chunk_ids]}
+        self.total_len = 0
+        self.alive_count = 0
+        self._arrays = {}         # term -> (ids ndarray, tfs ndarray)
+        self._doc_len_np = None
+
+    # --- PERSISTENCE ---
+    def _load(self):
+        if not os.path.exists(self.index_path):
+            return
+        try:
+            with open(self.index_path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("version") != INDEX_VERSION:
+                return
+            self.chunks = state["chunks"]
+            self.doc_len = state["doc_len"]
+            self.postings = state["postings"]
+            self.files = state["files"]
+            self.total_len = sum(self.doc_len)
+            self.alive_count = sum(1 for c in self.chunks if c is not None)
+            print(f"📚 Local index loaded: {self.alive_count} chunks")
+        except Exception as e:
+            print(f"⚠️ Local index unreadable, rebuilding: {e}")
+            self._reset()
+
+    def save(self):
+        # Called from the indexing thread, the only writer, so queries can keep
+        # running while the (possibly large) pickle is written
+        state = {
+            "version": INDEX_VERSION,
+            "chunks": self.chunks,
+            "doc_len": self.doc_len,
+            "postings": self.postings,
+            "files": self.files,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            tmp_path = self.index_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+        except Exception as e:
+            print(f"⚠️ Failed to save local index: {e}")
+
+    # --- INDEXING ---
+    def _scan(self):
+        """Current (path -> (mtime, size, chunker)) for every indexable file."""
+        found = {}
+        if os.path.isdir(self.chat_dir):
+            for name in os.listdir(self.chat_dir):
+                if chat_id_from_file(name):
+                    path = os.path.join(self.chat_dir, name)
+                    found[path] = chunk_chat
+        # Archived chats are decompressed once here and then served from the index
+        archive_dir = os.path.join(self.chat_dir, ARCHIVE_DIR)
+        if os.path.isdir(archive_dir):
+            for name in os.listdir(archive_dir):
+                if name.endswith(ARCHIVE_EXT):
+                    found[os.path.join(archive_dir, name)] = chunk_chat
+        for folder in self.doc_folders:
+            for root, _, names in os.walk(folder):
+                for name in names:
+                    if name.lower().endswith(TEXT_EXTENSIONS):
+                        found[os.path.join(root, name)] = chunk_document
+        result = {}
+        for path, chunker in found.items():
+            try:
+                st = os.stat(path)
+                result[path] = (st.st_mtime, st.st_size, chunker)
+            except OSError:
+                pass
+        return result
+
+    def add_chunk(self, source, title, text):
+        tokens = tokenize(text)
+        counts = {}
+        for t in tokens:
+            counts[t] = counts.get(t, 0) + 1
+        with self.lock:
+            chunk_id = len(self.chunks)
+            self.chunks.append({"source": source, "title": title, "text": text})
+            self.doc_len.append(len(tokens))
+            self.total_len += len(tokens)
+            self.alive_count += 1
+            for term, tf in counts.items():
+                ids, tfs = self.postings.setdefault(term, ([], []))
+                ids.append(chunk_id)
+                tfs.append(tf)
+                self._arrays.pop(term, None)
+            self._doc_len_np = None
+            return chunk_id
+
+    def remove_file(self, path):
+        with self.lock:
+            entry = self.files.pop(path, None)
+            if not entry:
+                return
+            for chunk_id in entry["chunks"]:
+                if self.chunks[chunk_id] is not None:
+                    self.chunks[chunk_id] = None
+                    self.total_len -= self.doc_len[chunk_id]
+                    self.doc_len[chunk_id] = 0
+                    self.alive_count -= 1
+            self._doc_len_np = None
+
+    def index_file(self, path, mtime, size, chunker):
+        try:
+            pieces = chunker(path)
+        except Exception as e:
+            print(f"⚠️ Could not index {path}: {e}")
+            pieces = []
+        with self.lock:
+            self.remove_file(path)
+            ids = [self.add_chunk(path, title, text) for title, text in pieces]
+            self.files[path] = {"mtime": mtime, "size": size, "chunks": ids}
+
+    def refresh(self):
+        """Re-index new or changed files and drop deleted ones. Returns number of files touched."""
+        with self.refresh_lock:
+            return self._refresh()
+
+    def _refresh(self):
+        current = self._scan()
+        changed = 0
+        for path in list(self.files):
+            if path not in current:
+                self.remove_file(path)
+                changed += 1
+        for path, (mtime, size, chunker) in current.items():
+            entry = self.files.get(path)
+            if entry and entry["mtime"] == mtime and entry["size"] == size:
+                continue
+            self.index_file(path, mtime, size, chunker)
+            changed += 1
+        with self.lock:
+            dead = len(self.chunks) - self.alive_count
+            if dead > 1000 and dead > 0.3 * len(self.chunks):
+                self.compact()
+        self.last_refresh = time.monotonic()
+        if changed:
+            self.save()
+        return changed
+
+    def refresh_async(self):
+        """Refresh in the background if the last refresh is older than refresh_interval."""
+        if time.monotonic() - self.last_refresh < self.refresh_interval:
+            return
+        # Taken here so only one caller starts a thread; released when that refresh ends
+        if not self.refresh_lock.acquire(blocking=False):
+            return
+        def run():
+            try:
+                self._refresh()
+            finally:
+                self.refresh_lock.release()
+        threading.Thread(target=run, daemon=True).start()
+
+    def compact(self):
+        """Rebuild ids without tombstones."""
+        with self.lock:
+            chunks, files = self.chunks, self.files
+            self._reset()
+            for path, entry in files.items():
+                ids = []
+                for chunk_id in entry["chunks"]:
+                    chunk = chunks[chunk_id]
+                    if chunk is not None:
+                        ids.append(self.add_chunk(chunk["source"], chunk["title"], chunk["text"]))
+                self.files[path] = {"mtime": entry["mtime"], "size": entry["size"], "chunks": ids}
+
+    # --- QUERY ---
+    def _term_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            ids, tfs = self.postings[term]
+            arrays = (np.asarray(ids, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def query(self, query, k=3):
+        """Top-k chunks by BM25 as [{"title", "description", "url", "score"}]."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self.lock:
+            if not terms or self.alive_count == 0:
+                return []
+            if self._doc_len_np is None:
+                self._doc_len_np = np.asarray(self.doc_len, dtype=np.float32)
+            doc_len = self._doc_len_np
+            n = self.alive_count
+            avgdl = max(1.0, self.total_len / n)
+            scores = np.zeros(len(self.chunks), dtype=np.float32)
+            for term in terms:
+                if term not in self.postings:
+                    continue
+                ids, tfs = self._term_arrays(term)
+                df = len(ids)
+                idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * doc_len[ids] / avgdl)
+                scores[ids] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+            # Tombstoned chunks have doc_len 0
+            scores[doc_len == 0] = 0
+            hits = int(np.count_nonzero(scores))
+            if hits == 0:
+                return []
+            k = min(k, hits)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            results = []
+            for chunk_id in top:
+                chunk = self.chunks[chunk_id]
+                results.append({
+                    "title": chunk["title"],
+                    "description": self._snippet(chunk["text"], terms),
+                    "url": chunk["source"],
+                    "score": float(scores[chunk_id]),
+                })
+            return results
+
+    @staticmethod
+    def _snippet(text, terms, width=300):
+        lower = text.lower()
+        positions = [lower.find(t) for t in terms if lower.find(t) >= 0]
+        start = max(0, min(positions) - 60) if positions else 0
+        snippet = text[start:start + width].replace("\n", " ")
+        return ("..." if start else "") + snippet + ("..." if start + width < len(text) else "")
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_local_index(doc_folders=None):
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = LocalIndex(doc_folders=doc_folders)
+        elif doc_folders is not None:
+            _index.doc_folders = list(doc_folders)
+        return _index
+
+def local_search(query, num_results=3, cancel_token=None):
+    """Same interface as google_search, answered from the offline index."""
+    index = get_local_index()
+    index.refresh_async()
+    if cancel_token and cancel_token.cancelled:
+        return ""
+    results = index.query(query, num_results)
+    if not results:
+        return ""
+    context = ""
+    for res in results:
+        context += f"Source: {res['title']} - {res['description']}\n"
+    return context
@@ -1,12 +1,224 @@
 # core/tools/search.py
-from googlesearch import search
+import os
+import re
+import json
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 
-def google_search(query, num_results=3):
+def normalize_query(query):
+    """Cache key: lowercase, no punctuation, collapsed whitespace"""
+    query = re.sub(r"[^\w\s]", " ", query.lower())
+    return " ".join(query.split())
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after ttl seconds."""
+
+    def __init__(self, maxsize=256, ttl=600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self.data[key]
+                self.misses += 1
+                return None
+            self.data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self.lock:
+            self.data[key] = (time.monotonic() + self.ttl, value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+
+# --- PROVIDERS ---
+# A provider has a name and an async search(query, num_results) returning
+# a list of {"title", "description", "url"} dicts. Blocking libraries run
+# via asyncio.to_thread on the service's bounded executor and get their own
+# request timeout: cancelling the task can't stop a call that already started.
+
+class GoogleProvider:
+    name = "google"
+
+    def __init__(self, timeout=5.0):
+        self.timeout = timeout
+
+    async def search(self, query, num_results):
+        from googlesearch import search
+        def fetch():
+            return [
+                {"title": r.title, "description": r.description, "url": r.url}
+                for r in search(query, num_results=num_results, advanced=True, timeout=self.timeout)
+            ]
+        # googlesearch is blocking; run it off the event loop
+        return await asyncio.to_thread(fetch)
+
+class DuckDuckGoProvider:
+    name = "duckduckgo"
+
+    def __init__(self, timeout=5.0):
+        self.timeout = timeout
+
+    async def search(self, query, num_results):
+        from duckduckgo_search import DDGS
+        def fetch():
+            with DDGS(timeout=self.timeout) as ddgs:
+                return [
+                    {"title": r.get("title", ""), "description": r.get("body", ""), "url": r.get("href", "")}
+                    for r in ddgs.text(query, max_results=num_results)
+                ]
+        return await asyncio.to_thread(fetch)
+
+class LocalProvider:
+    """Offline stand-in: canned results keyed by normalized query, with optional artificial latency."""
+    name = "local"
+
+    def __init__(self, results=None, results_path=None, latency=0.0):
+        self.results = {}
+        self.latency = latency
+        if results_path and os.path.exists(results_path):
+            with open(results_path, "r") as f:
+                results = {**json.load(f), **(results or {})}
+        for query, items in (results or {}).items():
+            self.results[normalize_query(query)] = items
+
+    async def search(self, query, num_results):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        key = normalize_query(query)
+        items = self.results.get(key)
+        if items is None:
+            # Fall back to the entry sharing the most words with the query
+            words = set(key.split())
+            best = max(self.results, key=lambda k: len(words & set(k.split())), default=None)
+            items = self.results.get(best, []) if best and words & set(best.split()) else []
+        return items[:num_results]
+
+def default_providers():
+    mode = os.environ.get("SIRIS_SEARCH", "web")
+    if mode == "local":
+        return [LocalProvider(results_path="config/search_fixtures.json")]
+    providers = [GoogleProvider()]
     try:
-        results = list(search(query, num_results=num_results, advanced=True))
-        context = ""
-        for res in results:
-            context += f"Source: {res.title} - {res.description}\n"
-        return context
-    except:
-        return "No internet connection or search failed."
\ No newline at end of file
+        import duckduckgo_search  # noqa: F401
+        providers.append(DuckDuckGoProvider())
+    except ImportError:
+        pass
+    return providers
+
+class SearchService:
+    """Queries all providers concurrently under a hard deadline, with a TTL + LRU result cache."""
+
+    def __init__(self, providers=None, timeout=3.0, cache_size=256, cache_ttl=600, io_workers=4):
+        self.providers = providers if providers is not None else default_providers()
+        self.timeout = timeout
+        self.io_workers = io_workers
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.loop = None
+        self.loop_thread = None
+        self.loop_lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self.loop_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                # Bounded pool for blocking provider calls, so a hung network can't grow threads without limit.
+                # Calls still queued when their search gives up are cancelled with the task.
+                self.loop.set_default_executor(ThreadPoolExecutor(max_workers=self.io_workers,
+                                                                  thread_name_prefix="siris-search-io"))
+                self.loop_thread = threading.Thread(target=self.loop.run_forever, name="siris-search", daemon=True)
+                self.loop_thread.start()
+        return self.loop
+
+    async def asearch(self, query, num_results=3, timeout=None):
+        """Merged, de-duplicated results from every provider that answers before the deadline."""
+        key = (normalize_query(query), num_results)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        timeout = self.timeout if timeout is None else timeout
+        tasks = [asyncio.ensure_future(p.search(query, num_results)) for p in self.providers]
+        if not tasks:
+            return []
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            print(f"⏱️ Search deadline hit: {len(pending)}/{len(tasks)} provider(s) too slow")
+
+        # Keep provider priority order when merging
+        results, seen = [], set()
+        for task in tasks:
+            if task not in done or task.cancelled() or task.exception():
+                continue
+            for item in task.result():
+                ident = item.get("url") or item.get("title")
+                if ident in seen:
+                    continue
+                seen.add(ident)
+                results.append(item)
+        results = results[:num_results]
+        # Don't cache failures or deadline-truncated merges, so the next attempt can hit the network again
+        if results and not pending:
+            self.cache.put(key, results)
+        return results
+
+    def search(self, query, num_results=3, timeout=None, cancel_token=None):
+        """Blocking wrapper for worker threads. Returns [] on deadline or cancel."""
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(query, num_results, timeout)
+        if cancel_token:
+            cancel_token.add_callback(future.cancel)
+        try:
+            # Small grace period on top of the provider deadline for merging
+            return future.result(timeout + 0.5)
+        except FutureTimeout:
+            future.cancel()
+            return []
+        except Exception:
+            return []
+
+    def submit(self, query, num_results=3, timeout=None):
+        """Start a search in the background and return a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(self.asearch(query, num_results, timeout), self._ensure_loop())
+
+def format_results(results):
+    context = ""
+    for res in results:
+        context += f"Source: {res['title']} - {res['description']}\n"
+    return context
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_search_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SearchService()
+        return _service
+
+def google_search(query, num_results=3, cancel_token=None, timeout=None):
+    results = get_search_service().search(query, num_results=num_results, timeout=timeout, cancel_token=cancel_token)
+    if cancel_token and cancel_token.cancelled:
+        return ""
+    if not results:
+        return "No internet connection or search failed."
+    return format_results(results)
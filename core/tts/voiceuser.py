@@ -9,6 +9,8 @@ import sounddevice as sd
 from PyQt6.QtCore import QObject, pyqtSignal
 from transformers import GPT2PreTrainedModel
 from transformers.generation import GenerationMixin
+from core.telemetry.tracer import tracer
+from core.telemetry.ui_profiler import ui_profiler
 
 # --- MONKEY PATCH FOR TTS/TRANSFORMERS COMPATIBILITY ---
 # Fixes: 'GPT2InferenceModel' object has no attribute 'generate'
@@ -19,9 +21,12 @@ except ImportError:
 
 class VoiceUser(QObject):
     word_spoken = pyqtSignal(int, str, int)  # word_index, word_text, total_words
+    speaking_changed = pyqtSignal(bool)  # playback started / ended
     
     def __init__(self, config_path="config/paths.json"):
         super().__init__()
+        # Optional SpectrumAnalyzer that follows playback for the waveform
+        self.analyzer = None
         with open(config_path, 'r') as f:
             self.paths = json.load(f)['tts']
         
@@ -90,49 +95,87 @@ class VoiceUser(QObject):
         except Exception as e:
             print(f"❌ Error loading voice: {e}")
 
-    def speak(self, text):
+    def stop(self):
+        """Stop any speech that is currently playing"""
+        sd.stop()
+
+    def unload(self):
+        """Free the model and voice latents (GPU memory included)"""
+        self.stop()
+        self.model = None
+        self.latents = None
+
+    def synthesize(self, text):
+        """Generate speech without playing it. Returns (audio, sample_rate, spoken_text)."""
+        # Limit text length to prevent TTS errors (max ~200 chars for safety)
+        if len(text) > 200:
+            text = text[:197] + "..."
+            print("⚠️  Text truncated to fit TTS limits")
+
+        # Use the inference method which is the standard XTTS API
+        out = self.model.inference(
+            text, "en", self.latents[0], self.latents[1], temperature=0.7
+        )
+        return np.array(out['wav']), 24000, text
+
+    def speak(self, text, turn_id=None, cancel_token=None):
         if not self.model:
             print("❌ TTS model not loaded. Cannot generate speech.")
+            tracer.end_turn(turn_id)
             return
             
         if not self.latents: 
             print("❌ No voice loaded. Add a voice in settings first.")
+            tracer.end_turn(turn_id)
             return
 
-        # Limit text length to prevent TTS errors (max ~200 chars for safety)
-        if len(text) > 200:
-            text = text[:197] + "..."
-            print("⚠️  Text truncated to fit TTS limits")
-
         print("🔊 Generating Audio...")
         try:
-            # Use the inference method which is the standard XTTS API
-            out = self.model.inference(
-                text, "en", self.latents[0], self.latents[1], temperature=0.7
-            )
-            audio_data = np.array(out['wav'])
+            audio_data, sample_rate, text = self.synthesize(text)
+            
+            # Turn was cancelled while synthesizing, don't play it
+            if cancel_token and cancel_token.cancelled:
+                tracer.end_turn(turn_id)
+                return
             
             # Split text into words for highlighting
             words = text.split()
             total_words = len(words)
             
             # Calculate audio duration and time per word
-            sample_rate = 24000
             audio_duration = len(audio_data) / sample_rate
             time_per_word = audio_duration / total_words if total_words > 0 else 0
             
             # Start playback in a separate thread
             def play_audio():
                 sd.play(audio_data, sample_rate)
+                tracer.mark("first_audio", turn_id)
+                if self.analyzer:
+                    self.analyzer.feed_playback(audio_data, sample_rate)
+                self.speaking_changed.emit(True)
                 sd.wait()
-                print("✅ Speech playback complete")
+                if self.analyzer:
+                    self.analyzer.stop_playback()
+                self.speaking_changed.emit(False)
+                interrupted = bool(cancel_token and cancel_token.cancelled)
+                tracer.end_turn(turn_id, "playback_end", audio_s=round(audio_duration, 3), interrupted=interrupted)
+                print("⏹️ Speech interrupted" if interrupted else "✅ Speech playback complete")
+            
+            # Barge-in stops playback immediately
+            if cancel_token:
+                cancel_token.add_callback(self.stop)
             
             playback_thread = threading.Thread(target=play_audio, daemon=True)
             playback_thread.start()
             
             # Emit word signals with timing
             for i, word in enumerate(words):
-                time.sleep(time_per_word)
+                if cancel_token:
+                    if cancel_token.wait(time_per_word):
+                        break
+                else:
+                    time.sleep(time_per_word)
+                ui_profiler.emitted("word_spoken")
                 self.word_spoken.emit(i, word, total_words)
             
             # Wait for playback to complete
@@ -146,4 +189,5 @@ class VoiceUser(QObject):
             print(f"❌ TTS Error: {e}")
             print("   Text was too long for TTS engine")
         except Exception as e:
-            print(f"❌ TTS Error: {e}")
\ No newline at end of file
+            print(f"❌ TTS Error: {e}")
+            tracer.end_turn(turn_id)
\ No newline at end of file
@@ -1,50 +1,37 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QThread
+import sys
+import json
+import numpy as np
+import sounddevice as sd
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QShortcut, QKeySequence
+from PyQt6.QtCore import QTimer, QThread
 
+# Imported first so the startup profile clock starts as early as possible
+from core.pipeline.startup import profile, profiling_requested, EngineRegistry
+from core.pipeline.resources import ResourceManager
+
+# Heavy engines (torch, transformers, TTS) are imported lazily in the loaders below
 from ui.topbar.topbar import TopBarUI
 from core.stt.whisper_engine import STTEngine
-from core.llm.llama_engine import LLMEngine
-from core.tools.search import google_search
-from core.tts.voicetrainer import VoiceTrainer
-from core.tts.voiceuser import VoiceUser
-from core.chat.chat_manager import ChatManager
+from core.tools.local_search import get_local_index
+from core.chat.chat_manager import ChatManager, estimate_tokens
 from core.chat.chat_namer import ChatNamer
+from core.chat.chat_summarizer import ChatSummarizer
+from core.chat.archive import ChatArchiver
+from core.telemetry.tracer import tracer
+from core.telemetry.ui_profiler import ui_profiler
+from core.pipeline.orchestrator import TurnOrchestrator, CancelToken
+from core.pipeline.speculative import SpeculativeSearch, PartialWindow
+from core.pipeline.worker import SirisWorker
+from core.pipeline.spectrum import SpectrumAnalyzer
+from core.stt.wake_word import WakeWordListener
 
-class SirisWorker(QObject):
-    response_ready = pyqtSignal(str)
-    
-    def __init__(self, llm, chat_manager, internet_default=True):
-        super().__init__()
-        self.llm = llm
-        self.chat_manager = chat_manager
-        self.use_internet = internet_default
-    
-    def process(self, query):
-        # Get context from chat history
-        history = self.chat_manager.get_context(limit=5)
-        
-        # Build context string or pass messages if LLM supports it
-        # For now, we'll prepend recent history to the query if needed, 
-        # but LLMEngine.generate takes a prompt. 
-        # Ideally we should update LLMEngine to accept messages.
-        # For now, we'll stick to simple prompt or context injection.
-        
-        if self.use_internet:
-            search_results = google_search(query)
-            context = f"Web Results:\\n{search_results}\\n\\nUser Query: {query}"
-        else:
-            context = query
-            
-        # Add history context if available (simple concatenation for now)
-        if history:
-            hist_text = "\\n".join([f"{msg['role']}: {msg['content']}" for msg in history])
-            full_prompt = f"History:\\n{hist_text}\\n\\nCurrent User Query: {context}"
-        else:
-            full_prompt = context
-        
-        response = self.llm.generate(full_prompt)
-        self.response_ready.emit(response)
+profile.mark("imports_done")
 
 class SirisApp:
+    SUMMARY_DELAY_MS = 2000
+    NO_ANSWER_REPLY = "Sorry, I ran out of time on that one. Could you ask again?"
+
     def __init__(self):
         self.app = QApplication(sys.argv)
         
@@ -54,33 +41,69 @@ class SirisApp:
         
         # 2. INIT UI (Pass settings so checkboxes are correct)
         self.ui = TopBarUI(initial_settings=self.settings)
+        # --profile-ui: GUI-thread timing histograms, dumped on exit
+        ui_profiler.start_probe()
+        self.app.aboutToQuit.connect(ui_profiler.dump)
         
-        # 3. INIT BACKEND (Use saved settings)
-        self.stt = STTEngine()
+        # Band energies of mic/TTS audio drive the waveform (FFT runs off the audio and GUI threads)
+        self.spectrum = SpectrumAnalyzer()
+        self.ui.waveform.set_spectrum_source(self.spectrum.latest)
+        self.app.aboutToQuit.connect(self.spectrum.close)
         
-        # Load Saved Model
-        print(f"⚙️ Loading Saved Model: {self.settings['model']}")
-        self.llm = LLMEngine(model_key=self.settings["model"])
+        # 3. INIT BACKEND (Use saved settings)
+        # Engines load concurrently in the background; each one is wired up when ready
+        self.stt = None
+        self.llm = None
+        self.engines = EngineRegistry(max_workers=3)
+        self.engines.state_changed.connect(self.on_engine_state)
+        self.app.aboutToQuit.connect(self.engines.shutdown)
+        # Unload idle engines / enforce the memory budget; reloaded on next use
+        self.resources = ResourceManager(self.engines, idle_timeouts=self.settings["idle_unload_s"],
+                                         budget_mb=self.settings["memory_budget_mb"])
         
         # Init Chat System
-        self.chat_manager = ChatManager()
-        self.chat_namer = ChatNamer(self.llm)
+        if self.settings["chat_backend"] == "sqlite":
+            from core.chat.sqlite_store import SQLiteChatManager
+            self.chat_manager = SQLiteChatManager()
+        else:
+            self.chat_manager = ChatManager(history_mode=self.settings["history_mode"])
+        # Chat writes are queued off this thread; make sure they land before exit
+        self.app.aboutToQuit.connect(self.chat_manager.close)
+        self.chat_namer = ChatNamer(None)
+        self.chat_summarizer = ChatSummarizer(None)
+        self.summary_token = None
+        
+        # Bounded pool for turn stages; a new recording cancels the running turn
+        self.orchestrator = TurnOrchestrator(max_workers=4)
+        self.turn = None
+        self.app.aboutToQuit.connect(self.orchestrator.shutdown)
         
         self.worker = SirisWorker(self.llm, self.chat_manager, internet_default=self.settings["internet"])
+        self.worker.stream_deltas = True
+        self.worker.response_budget_s = self.settings["response_budget_s"]
+        self.worker.target_tokens = self.settings["target_answer_tokens"]
+        
+        # Compress chats nobody has opened in a while (json backend only)
+        if isinstance(self.chat_manager, ChatManager):
+            self.orchestrator.submit_background(ChatArchiver(self.chat_manager, self.settings["archive_after_days"]).sweep)
+        
+        # Long-term memory across chats; the embedder loads off the GUI thread
+        self.memory = None
+        if self.settings["semantic_memory"]:
+            self.orchestrator.submit_background(self.init_memory)
+        
+        # Offline retrieval index over chat history + document folders (built in background)
+        get_local_index(self.settings["document_folders"]).refresh_async()
         
         # TTS Components
         self.voice_trainer = None
         self.voice_user = None 
         self.training_thread = None
-        
-        # Initialize TTS if Output is "Speech" or "Both"
-        if "Speech" in self.settings["output"] or "Both" in self.settings["output"]:
-            print("⚙️ Initializing TTS System...")
-            threading.Thread(target=self.init_tts).start()
 
         # Connections
-        self.stt.transcription_ready.connect(self.handle_transcription)
-        self.worker.response_ready.connect(self.handle_ai_response)
+        self.worker.response_ready.connect(ui_profiler.delivered("response_ready", self.handle_ai_response))
+        self.worker.response_delta.connect(ui_profiler.delivered("response_delta", self.on_response_delta))
+        self.on_word_spoken = ui_profiler.delivered("word_spoken", self.ui.highlight_word)
         self.ui.setting_changed.connect(self.handle_setting_change)
         self.ui.add_voice_signal.connect(self.train_new_voice)
         
@@ -88,10 +111,109 @@ class SirisApp:
         self.stream = None
         self.audio_buffer = []
         
+        # Speculative search from partial transcripts while recording
+        self.speculation = None
+        self.partial_busy = False
+        self.partial_window = PartialWindow()
+        self.partial_timer = QTimer()
+        self.partial_timer.setInterval(1500)
+        self.partial_timer.timeout.connect(self.request_partial_transcript)
+        
         self.shortcut = QShortcut(QKeySequence("Ctrl+Space"), self.ui)
         self.shortcut.activated.connect(self.toggle_recording)
         
+        # Hands-free: a light always-on mic stream listening for the wake phrase
+        self.wake = None
+        self.wake_turn = False
+        if self.settings["hands_free"]:
+            self.start_wake_listener()
+        self.app.aboutToQuit.connect(self.stop_wake_listener)
+        
+        # Show the bar before any model loads
         self.ui.show()
+        profile.mark("ui_shown")
+        
+        self.engines.load("stt", self.create_stt, self.on_stt_ready, self.on_stt_unload)
+        print(f"⚙️ Loading Saved Model: {self.settings['model']}")
+        self.engines.load("llm", lambda: self.create_llm(self.settings["model"]), self.on_llm_ready, self.on_llm_unload)
+        
+        # Initialize TTS if Output is "Speech" or "Both"
+        if "Speech" in self.settings["output"] or "Both" in self.settings["output"]:
+            print("⚙️ Initializing TTS System...")
+            self.init_tts()
+
+    # --- ENGINE LOADING (runs on the registry's pool) ---
+    def create_stt(self):
+        with profile.measure("stt", "load"):
+            return STTEngine()
+
+    def create_llm(self, model_key):
+        with profile.measure("llm", "import"):
+            from core.llm.llama_engine import LLMEngine
+        with profile.measure("llm", "load"):
+            return LLMEngine(model_key=model_key)
+
+    def create_tts(self):
+        with profile.measure("tts", "import"):
+            from core.tts.voiceuser import VoiceUser
+        with profile.measure("tts", "load"):
+            voice_user = VoiceUser()
+            # Load last used voice
+            target_voice = self.settings.get("last_voice", "default")
+            print(f"🗣️ Loading Saved Voice: {target_voice}")
+            voice_user.load_voice(target_voice)
+        return voice_user
+
+    # --- ENGINE READY CALLBACKS (GUI thread) ---
+    def on_stt_ready(self, stt):
+        self.stt = stt
+        self.stt.transcription_ready.connect(self.handle_transcription)
+
+    def on_llm_ready(self, llm):
+        self.llm = llm
+        self.worker.llm = llm
+        self.chat_namer.llm = llm
+        self.chat_summarizer.llm = llm
+        self.chat_manager.set_token_counter(llm.count_tokens)
+
+    def on_tts_ready(self, voice_user):
+        self.voice_user = voice_user
+        # Connect word highlighting signal
+        self.voice_user.word_spoken.connect(self.on_word_spoken)
+        self.voice_user.speaking_changed.connect(self.ui.waveform.set_active)
+        self.voice_user.speaking_changed.connect(self.on_speaking_changed)
+        self.voice_user.analyzer = self.spectrum
+
+    # --- ENGINE UNLOAD CALLBACKS (GUI thread): drop every reference so memory is freed ---
+    def on_stt_unload(self, stt):
+        stt.transcription_ready.disconnect(self.handle_transcription)
+        self.stt = None
+
+    def on_llm_unload(self, llm):
+        self.llm = None
+        self.worker.llm = None
+        self.chat_namer.llm = None
+        self.chat_summarizer.llm = None
+        self.chat_manager.set_token_counter(estimate_tokens)
+
+    def on_tts_unload(self, voice_user):
+        voice_user.word_spoken.disconnect(self.on_word_spoken)
+        voice_user.speaking_changed.disconnect(self.ui.waveform.set_active)
+        voice_user.speaking_changed.disconnect(self.on_speaking_changed)
+        self.voice_user = None
+
+    def on_engine_state(self, name, state):
+        print(f"⚙️ Engine {name}: {state}")
+        idle = not self.is_recording and self.turn is None
+        if not self.engines.all_settled():
+            if idle:
+                self.ui.set_status(f"Siris Loading ({name})... Ctrl+Space works already.")
+            return
+        profile.mark("engines_settled")
+        if profiling_requested():
+            print(profile.report())
+        if idle:
+            self.reset_ui()
 
     def load_settings(self):
         defaults = {
@@ -99,7 +221,20 @@ class SirisApp:
             "model": "llama_1b",
             "output": "Both",
             "input": "Microphone",
-            "last_voice": "default"
+            "last_voice": "default",
+            "document_folders": [],
+            "idle_unload_s": {"stt": 1800, "llm": 3600, "tts": 1800},
+            "memory_budget_mb": 0,
+            "prewarm_on_hotkey": True,
+            "chat_backend": "json",
+            "history_mode": "summarize",
+            "archive_after_days": 30,
+            "semantic_memory": True,
+            "response_budget_s": 8.0,
+            "target_answer_tokens": 120,
+            "hands_free": False,
+            "wake_phrase": "siris",
+            "wake_sensitivity": 0.5
         }
         try:
             with open(self.settings_file, "r") as f:
@@ -126,8 +261,11 @@ class SirisApp:
         elif key == "output":
             self.settings["output"] = value
             if ("Speech" in value or "Both" in value) and self.voice_user is None:
-                self.ui.status_label.setText("Initializing Voice...")
-                threading.Thread(target=self.init_tts).start()
+                self.ui.set_status("Initializing Voice...")
+                self.init_tts()
+            elif not ("Speech" in value or "Both" in value):
+                # Text only: XTTS is dead weight until speech comes back
+                self.resources.release("tts")
 
         elif key == "voice_select":
             self.settings["last_voice"] = value
@@ -135,19 +273,24 @@ class SirisApp:
                 self.init_tts() 
             else:
                 self.voice_user.load_voice(value)
-                self.ui.status_label.setText(f"Voice: {value}")
+                self.ui.set_status(f"Voice: {value}")
             
         elif key == "model":
             self.settings["model"] = value
-            self.ui.status_label.setText(f"Loading {value}...")
-            def switch():
-                self.llm = LLMEngine(model_key=value)
-                self.worker.llm = self.llm
-                self.ui.status_label.setText("Siris Ready")
-            threading.Thread(target=switch).start()
+            self.ui.set_status(f"Loading {value}...")
+            self.engines.load("llm", lambda: self.create_llm(value), self.on_llm_ready, self.on_llm_unload)
             
         elif key == "input":
             self.settings["input"] = value
+            
+        elif key == "hands_free":
+            self.settings["hands_free"] = (value == "True")
+            if self.settings["hands_free"]:
+                self.start_wake_listener()
+            else:
+                self.stop_wake_listener()
+            if not self.is_recording and self.turn is None:
+                self.reset_ui()
 
         # Save immediately
         self.save_settings()
@@ -155,18 +298,11 @@ class SirisApp:
         self.ui.setup_settings_menu()
 
     def init_tts(self):
-        if not self.voice_user:
-            # Fix import if needed, but assuming VoiceUser is in core.tts.voiceuser
-            from core.tts.voiceuser import VoiceUser
-            self.voice_user = VoiceUser()
-            # Connect word highlighting signal
-            self.voice_user.word_spoken.connect(self.ui.highlight_word)
-            # Load last used voice
-            target_voice = self.settings.get("last_voice", "default")
-            print(f"🗣️ Loading Saved Voice: {target_voice}")
-            self.voice_user.load_voice(target_voice)
+        if not self.voice_user and self.engines.state("tts") != EngineRegistry.LOADING:
+            self.engines.load("tts", self.create_tts, self.on_tts_ready, self.on_tts_unload)
 
     def train_new_voice(self, name, path):
+        from core.tts.voicetrainer import VoiceTrainer
         self.voice_trainer = VoiceTrainer()
         self.training_thread = QThread()
         self.voice_trainer.moveToThread(self.training_thread)
@@ -188,15 +324,35 @@ class SirisApp:
         
         if self.voice_user:
             self.voice_user.load_voice(voice_name)
-        self.ui.status_label.setText(f"Voice '{voice_name}' Ready")
+        self.ui.set_status(f"Voice '{voice_name}' Ready")
 
     def toggle_recording(self):
         if not self.is_recording:
+            # Barge-in: stop the previous answer (generation, search, speech)
+            if self.turn and not self.turn.cancelled:
+                tracer.end_turn(self.turn.id, "cancelled")
+            self.turn = self.orchestrator.start_turn()
             self.is_recording = True
-            self.ui.status_label.setText("Siris Listening...")
-            self.ui.status_label.setStyleSheet("color: #ff00ff; background: transparent; font-weight: bold;")
+            self.ui.waveform.set_active(True)
+            # Background summarizing yields the LLM to the user; it is retried after the next answer
+            if self.summary_token:
+                self.summary_token.cancel()
+            if self.settings["prewarm_on_hotkey"]:
+                # Reload anything unloaded while idle as the user starts speaking
+                speech = "Speech" in self.settings["output"] or "Both" in self.settings["output"]
+                self.resources.prewarm(["stt", "llm"] + (["tts"] if speech else []))
+            self.speculation = SpeculativeSearch(cancel_token=self.turn.token) if self.worker.use_internet else None
+            self.partial_window = PartialWindow()
+            if self.speculation:
+                self.partial_timer.start()
+            self.ui.set_status("Siris Listening...", "color: #ff00ff; background: transparent; font-weight: bold;")
             self.audio_buffer = []
             
+            if self.wake and self.settings["input"] == "Microphone":
+                # The wake word stream is already open: record from it, starting right after the phrase
+                self.wake.capture(self.on_captured_audio, endpoint=self.wake_turn)
+                return
+            
             device_idx = None
             if self.settings["input"] == "System Audio":
                  try:
@@ -211,34 +367,124 @@ class SirisApp:
                 self.stream = sd.InputStream(device=device_idx, channels=1, samplerate=16000, callback=self.audio_callback)
                 self.stream.start()
             except:
-                self.ui.status_label.setText("Mic Error")
+                self.ui.set_status("Mic Error")
         else:
             self.is_recording = False
-            self.ui.status_label.setText("Siris Thinking...")
-            self.ui.status_label.setStyleSheet("color: #00ffff; background: transparent; font-weight: bold;")
+            self.wake_turn = False
+            self.ui.waveform.set_active(False)
+            self.partial_timer.stop()
+            tracer.begin_turn(self.turn.id)
+            self.ui.set_status("Siris Thinking...", "color: #00ffff; background: transparent; font-weight: bold;")
             
             if self.stream:
                 self.stream.stop()
                 self.stream.close()
+                self.stream = None
+            if self.wake:
+                self.wake.capture(None)
             
             if len(self.audio_buffer) > 0:
                 full_audio = np.concatenate(self.audio_buffer, axis=0)
-                threading.Thread(target=lambda: self.stt.transcribe_audio(full_audio)).start()
+                turn = self.turn
+                on_partial = self.speculation.offer_stable if self.speculation else None
+                
+                def transcribe():
+                    # Recording may finish before Whisper has (re)loaded
+                    with self.engines.acquire("stt") as stt:
+                        if stt is None:
+                            print("❌ Speech recognition unavailable.")
+                            return
+                        stt.transcribe_audio(full_audio, turn_id=turn.id, cancel_token=turn.token, on_partial=on_partial)
+                self.orchestrator.submit(turn, transcribe)
+
+    def request_partial_transcript(self):
+        if not self.is_recording or self.partial_busy or not self.speculation or self.engines.get("stt") is None:
+            return
+        chunks = list(self.audio_buffer)
+        # Wait for at least a second of audio before guessing
+        if sum(len(c) for c in chunks) < 16000:
+            return
+        window = self.partial_window
+        audio = window.tail(np.concatenate(chunks, axis=0))
+        if audio is None:
+            return
+        self.partial_busy = True
+        speculation = self.speculation
+        
+        def run():
+            with self.engines.acquire("stt", timeout=0) as stt:
+                segments = stt.transcribe_partial(audio, segments=True) if stt else None
+            if segments:
+                speculation.offer(window.advance(segments, len(audio)))
+        # Cleared on the future, not in run(): a cancelled turn skips run() entirely
+        future = self.orchestrator.submit(self.turn, run)
+        future.add_done_callback(lambda _: setattr(self, "partial_busy", False))
 
     def audio_callback(self, indata, frames, time, status):
         if self.is_recording:
-            self.audio_buffer.append(indata.copy())
-            try:
-                vol = np.linalg.norm(indata) * 5
-                self.ui.waveform.update_amplitudes(vol, vol)
-            except: pass
+            self.on_captured_audio(indata.copy())
+    
+    def on_captured_audio(self, chunk):
+        # Audio thread: the recording stream's callback or the wake word stream
+        self.audio_buffer.append(chunk)
+        self.spectrum.feed(chunk, 16000)
+    
+    # --- HANDS-FREE ---
+    def start_wake_listener(self):
+        if self.wake:
+            return
+        self.wake = WakeWordListener(self.settings["wake_phrase"], self.settings["wake_sensitivity"],
+                                     confirm=self.confirm_wake_word)
+        self.wake.detected.connect(self.on_wake_word)
+        self.wake.capture_ended.connect(self.on_capture_ended)
+        try:
+            self.wake.start()
+        except Exception as e:
+            print(f"❌ Wake word listener failed: {e}")
+            self.wake.stop()
+            self.wake = None
+            # Keep the menu honest: hands-free is off
+            self.ui.hands_free_enabled = False
+            self.ui.hands_free_action.setText(self.ui.get_hands_free_text())
+            self.ui.set_status("Mic Error")
+    
+    def stop_wake_listener(self):
+        if not self.wake:
+            return
+        wake, self.wake = self.wake, None
+        # A recording running on the wake stream ends with it
+        if self.is_recording and self.stream is None:
+            self.toggle_recording()
+        wake.stop()
+    
+    def confirm_wake_word(self, audio):
+        # Listener thread, only while it is still learning the phrase. Never loads Whisper for this.
+        stt = self.engines.get("stt")
+        return stt.transcribe_partial(audio) if stt else None
+    
+    def on_wake_word(self, score):
+        if self.is_recording or not self.wake:
+            return
+        self.wake_turn = True
+        self.toggle_recording()
+    
+    def on_capture_ended(self):
+        # Hands-free turn: the user stopped talking
+        if self.is_recording and self.wake_turn:
+            self.toggle_recording()
+    
+    def on_speaking_changed(self, speaking):
+        # TTS thread: don't let Siris's own voice trigger the wake word
+        if self.wake:
+            self.wake.set_muted(speaking)
 
     def handle_transcription(self, text):
         if not text:
+            tracer.end_turn(self.turn.id if self.turn else None)
             self.reset_ui()
             return
         
-        self.ui.status_label.setText(f"You: {text}")
+        self.ui.set_status(f"You: {text}")
         
         # Add to chat history
         self.chat_manager.add_message("user", text)
@@ -246,43 +492,126 @@ class SirisApp:
         # Check if we need to name the chat
         if len(self.chat_manager.current_chat_data["messages"]) <= 4:
              # Run naming in background
-             threading.Thread(target=self.update_chat_name).start()
+             self.orchestrator.submit_background(self.update_chat_name)
              
-        threading.Thread(target=lambda: self.worker.process(text)).start()
+        turn = self.turn
+        speculation = self.speculation
+        
+        def respond():
+            with self.engines.acquire("llm") as llm:
+                if llm is None:
+                    print("❌ LLM unavailable.")
+                    return
+                self.worker.process(text, turn.id, turn.token, speculation)
+        self.orchestrator.submit(turn, respond)
+
+    def start_summary(self):
+        """Queue a rolling-summary pass once the answer is out (spoken, or shown in text-only mode)."""
+        if self.summary_token and not self.summary_token.cancelled:
+            return
+        if self.is_recording or not self.chat_manager.needs_summary():
+            return
+        self.summary_token = CancelToken()
+        self.orchestrator.submit_background(self.summarize_chat, self.summary_token)
+
+    def summarize_chat(self, token):
+        # Low priority: gives up if the user talks again and is retried after the next answer
+        if token.cancelled:
+            return
+        with self.engines.acquire("llm") as llm:
+            if llm is not None and not token.cancelled:
+                self.chat_summarizer.run(self.chat_manager, cancel_token=token)
+        # Let the next answer schedule another pass if this one didn't finish
+        token.cancel()
+
+    def init_memory(self):
+        from core.chat.memory import SemanticMemory
+        memory = SemanticMemory()
+        if isinstance(self.chat_manager, ChatManager):
+            # Catch up on exchanges saved while memory wasn't running
+            memory.backfill(self.chat_manager.history_dir)
+        # Registered after the backfill so no exchange is queued twice; anything
+        # missed in between is picked up by the next backfill
+        self.chat_manager.listeners.append(memory.on_message)
+        self.worker.memory = memory
+        self.memory = memory
+        self.app.aboutToQuit.connect(lambda: memory.flush(timeout=2.0))
 
     def update_chat_name(self):
-        # Only name if it's a default name
-        current_name = self.chat_manager.current_chat_data.get("name", "")
-        if "Chat 20" in current_name: # Checks for default timestamp name
-            new_name = self.chat_namer.generate_name(self.chat_manager.current_chat_data["messages"])
-            if new_name:
-                self.chat_manager.set_chat_name(new_name)
-                print(f"🏷️ Chat Renamed: {new_name}")
-
-    def handle_ai_response(self, response):
+        with self.engines.acquire("llm") as llm:
+            if llm is None:
+                return
+            # Only name if it's a default name
+            current_name = self.chat_manager.current_chat_data.get("name", "")
+            if "Chat 20" in current_name: # Checks for default timestamp name
+                new_name = self.chat_namer.generate_name(self.chat_manager.current_chat_data["messages"])
+                if new_name:
+                    self.chat_manager.set_chat_name(new_name)
+                    print(f"🏷️ Chat Renamed: {new_name}")
+
+    def on_response_delta(self, turn_id, delta):
+        # Deltas queued before a barge-in belong to the abandoned turn
+        if self.turn is None or self.turn.id != turn_id or self.turn.cancelled:
+            return
+        if "Text" in self.settings["output"] or "Both" in self.settings["output"]:
+            self.ui.stream_delta(delta)
+
+    def handle_ai_response(self, turn_id, response):
+        turn = self.turn
+        # Response from a turn that was interrupted (or replaced by barge-in) while the signal was queued
+        if turn is None or turn.cancelled or turn_id != turn.id:
+            return
         print(f"Siris: {response}")
         
-        # Add to chat history
-        self.chat_manager.add_message("assistant", response)
+        if response.strip():
+            # Add to chat history
+            self.chat_manager.add_message("assistant", response)
+        else:
+            # Nothing survived (e.g. generation stopped mid-thought): say so, but keep it out of the history
+            response = self.NO_ANSWER_REPLY
         
         output_mode = self.settings["output"]
         
         if "Text" in output_mode or "Both" in output_mode:
-            self.ui.status_label.setText(f"Siris: {response}")
+            if self.ui.streaming:
+                self.ui.end_stream(response)
+            else:
+                self.ui.set_status(f"Siris: {response}")
             
         if "Speech" in output_mode or "Both" in output_mode:
-            if self.voice_user:
+            if self.engines.state("tts") != EngineRegistry.PENDING:
                 # Prepare UI for word highlighting
                 self.ui.set_text_for_highlighting(response)
-                threading.Thread(target=lambda: self.voice_user.speak(response)).start()
+                self.orchestrator.submit(turn, self.speak, response, turn)
             else:
                 print("⚠️ TTS not ready yet.")
+                tracer.end_turn(turn_id)
+                QTimer.singleShot(self.SUMMARY_DELAY_MS, self.start_summary)
+        else:
+            tracer.end_turn(turn_id)
+            # Text only: give the reader a moment (and a follow-up the LLM) before summarizing
+            QTimer.singleShot(self.SUMMARY_DELAY_MS, self.start_summary)
 
         QTimer.singleShot(10000, self.reset_ui)
 
+    def speak(self, response, turn):
+        # TTS may still be loading, or reloading after an idle unload
+        with self.engines.acquire("tts") as voice_user:
+            if voice_user is None:
+                print("⚠️ TTS unavailable.")
+                tracer.end_turn(turn.id)
+            else:
+                voice_user.speak(response, turn_id=turn.id, cancel_token=turn.token)
+        # speak() returns when playback ends; a barge-in means the user wants the LLM now
+        if not turn.cancelled:
+            self.start_summary()
+
     def reset_ui(self):
-        self.ui.status_label.setText("Siris Online. Press Ctrl+Space.")
-        self.ui.status_label.setStyleSheet("color: #00ffff; background: transparent;")
+        if self.wake:
+            self.ui.set_status(f"Siris Online. Say '{self.settings['wake_phrase'].title()}' or press Ctrl+Space.",
+                               "color: #00ffff; background: transparent;")
+            return
+        self.ui.set_status("Siris Online. Press Ctrl+Space.", "color: #00ffff; background: transparent;")
 
 if __name__ == "__main__":
     siris = SirisApp()
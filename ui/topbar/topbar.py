@@ -5,10 +5,11 @@ from ctypes import wintypes
 from PyQt6.QtWidgets import (QWidget, QHBoxLayout, QLabel, QMenu, 
                              QScrollArea, QFrame, QFileDialog, QMessageBox, QInputDialog)
 from PyQt6.QtGui import QGuiApplication, QFont, QAction
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 
-from ui.topbar.widgets import cm_to_px, CloseIcon, SettingsIcon, VoiceProgressDialog
+from ui.topbar.widgets import cm_to_px, CloseIcon, SettingsIcon, VoiceProgressDialog, SpokenTextView
 from ui.topbar.waveform import WaveformWidget
+from core.telemetry.ui_profiler import ui_profiler
 
 class TopBarUI(QWidget):
     setting_changed = pyqtSignal(str, str)
@@ -46,6 +47,7 @@ class TopBarUI(QWidget):
         
         # Load Internet State from Settings
         self.internet_enabled = self.settings.get("internet", True)
+        self.hands_free_enabled = self.settings.get("hands_free", False)
         self.setup_settings_menu()
         
         self.icons_layout.addWidget(self.close_btn)
@@ -84,6 +86,24 @@ class TopBarUI(QWidget):
         self.scroll_area.setWidget(self.status_label)
         self.center_layout.addWidget(self.scroll_area)
 
+        # Spoken responses swap in a persistent text document for word highlighting
+        self.response_view = SpokenTextView(self)
+        self.response_view.setFont(font)
+        self.response_view.setStyleSheet("""
+            QTextEdit {
+                color: #cccccc;
+                background: rgba(30, 30, 40, 150);
+                border: 1px solid rgba(100, 100, 255, 50);
+                border-radius: 10px;
+                letter-spacing: 1px;
+                padding: 5px;
+            }
+            QScrollBar:vertical { background: #1a1a1a; width: 4px; }
+            QScrollBar::handle:vertical { background: #00ffff; border-radius: 2px; }
+        """)
+        self.response_view.hide()
+        self.center_layout.addWidget(self.response_view)
+
         # 3. RIGHT: Waveform (updated to match new topbar height)
         self.waveform = WaveformWidget(width_cm=3.5, height_cm=1.05, parent=self)
 
@@ -95,61 +115,90 @@ class TopBarUI(QWidget):
 
         self.progress_dialog = None
         self.current_text = ""  # Store current text for highlighting
-        self.current_words = []  # Store words list
+
+        # Streamed responses: deltas are buffered and drawn at most once per frame
+        self.streaming = False
+        self.stream_parts = []
+        self.stream_timer = QTimer(self)
+        self.stream_timer.setSingleShot(True)
+        self.stream_timer.setInterval(16)
+        self.stream_timer.timeout.connect(self.flush_stream)
 
         if sys.platform.startswith("win"):
             try: self._register_appbar()
             except: pass
 
+    def set_status(self, text, style=None):
+        """Show a status line (switches back from the response view)."""
+        self.cancel_stream()
+        self.status_label.setText(text)
+        if style is not None:
+            self.status_label.setStyleSheet(style)
+        if self.response_view.isVisible():
+            self.response_view.hide()
+            self.scroll_area.show()
+
+    def show_response_view(self):
+        if not self.response_view.isVisible():
+            self.scroll_area.hide()
+            self.response_view.show()
+
+    # --- STREAMING ---
+    def stream_delta(self, text):
+        """Queue a piece of a response that is still being generated."""
+        if not self.streaming:
+            text = text.lstrip()
+            if not text:
+                return
+            self.streaming = True
+            self.response_view.begin_stream("Siris: ")
+            self.show_response_view()
+        self.stream_parts.append(text)
+        if not self.stream_timer.isActive():
+            self.stream_timer.start()
+
+    def flush_stream(self):
+        if self.stream_parts:
+            with ui_profiler.measure("topbar.flush_stream"):
+                self._append_stream()
+
+    def _append_stream(self):
+        if self.stream_parts:
+            text = "".join(self.stream_parts)
+            self.stream_parts = []
+            self.response_view.append_text(text)
+
+    def end_stream(self, final_text=None):
+        """Draw whatever is still buffered; the streamed text stays on screen.
+        final_text replaces it if the engine trimmed the streamed response."""
+        self.stream_timer.stop()
+        self.flush_stream()
+        self.streaming = False
+        if final_text is not None:
+            prefix = "Siris: "
+            if self.response_view.toPlainText()[len(prefix):].strip() != final_text.strip():
+                self.response_view.begin_stream(prefix)
+                self.response_view.append_text(final_text)
+
+    def cancel_stream(self):
+        self.stream_timer.stop()
+        self.stream_parts = []
+        self.streaming = False
+
     def highlight_word(self, word_index, word_text, total_words):
-        """Highlight the currently spoken word and jump scroll"""
-        if not self.current_words:
-            return
-        
-        # Build HTML with highlighted word
-        html_parts = []
-        for i, word in enumerate(self.current_words):
-            if i < word_index:
-                # Already spoken - full white
-                html_parts.append(f'<span style="color: #ffffff;">{word}</span>')
-            elif i == word_index:
-                # Currently speaking - cyan and bold
-                html_parts.append(f'<span style="color: #00ffff; font-weight: bold;">{word}</span>')
-            else:
-                # Not yet spoken - light white
-                html_parts.append(f'<span style="color: #cccccc;">{word}</span>')
-        
-        html_text = ' '.join(html_parts)
-        self.status_label.setText(html_text)
-        
-        # Jump scroll instead of smooth scroll
-        # Calculate approximate position of current word
-        label_height = self.status_label.height()
-        scroll_area_height = self.scroll_area.height()
-        
-        # Estimate vertical position based on word index
-        progress = word_index / total_words if total_words > 0 else 0
-        target_y = int(progress * label_height)
-        
-        # Jump to target position (no animation)
-        scroll_value = max(0, target_y - scroll_area_height // 2)
-        # Disable smooth scrolling by setting value directly
-        scrollbar = self.scroll_area.verticalScrollBar()
-        scrollbar.setValue(scroll_value)
+        """Highlight the currently spoken word and jump scroll to its line"""
+        with ui_profiler.measure("topbar.highlight_word"):
+            if not self.response_view.highlight(word_index):
+                return
+            self.show_response_view()
+            self.response_view.scroll_to_word(word_index)
     
     def set_text_for_highlighting(self, text):
-        """Store text and prepare for word highlighting"""
+        """Load the response into the text view with every word not yet spoken"""
+        self.cancel_stream()
         self.current_text = text
-        self.current_words = text.split()
-        
-        # Initialize with all words in light white
-        html_parts = [f'<span style="color: #cccccc;">{word}</span>' for word in self.current_words]
-        html_text = ' '.join(html_parts)
-        self.status_label.setText(html_text)
-        
-        # Scroll to bottom to keep new input visible
-        scrollbar = self.scroll_area.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        self.response_view.set_words(text)
+        self.show_response_view()
 
     def setup_settings_menu(self):
         self.menu = QMenu(self)
@@ -190,6 +239,9 @@ class TopBarUI(QWidget):
         for i in ["Microphone", "System Audio"]:
             a = in_menu.addAction(f"{i} {'(✓)' if i == current_in else ''}")
             a.triggered.connect(lambda checked, x=i: self.setting_changed.emit("input", x))
+        self.hands_free_action = QAction(self.get_hands_free_text(), in_menu)
+        self.hands_free_action.triggered.connect(self.toggle_hands_free_state)
+        in_menu.addAction(self.hands_free_action)
 
         self.menu.addSeparator()
         
@@ -224,6 +276,15 @@ class TopBarUI(QWidget):
         self.web_action.setText(self.get_internet_icon_text())
         self.setting_changed.emit("internet", str(self.internet_enabled))
 
+    def get_hands_free_text(self):
+        phrase = self.settings.get("wake_phrase", "siris").title()
+        return f"Hands-Free ('{phrase}') {'(✓)' if self.hands_free_enabled else ''}"
+
+    def toggle_hands_free_state(self):
+        self.hands_free_enabled = not self.hands_free_enabled
+        self.hands_free_action.setText(self.get_hands_free_text())
+        self.setting_changed.emit("hands_free", str(self.hands_free_enabled))
+
     def open_voice_dialog(self):
         path, _ = QFileDialog.getOpenFileName(self, "Select Voice Sample", "", "Audio (*.wav *.mp3)")
         if path:
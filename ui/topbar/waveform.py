@@ -1,11 +1,18 @@
 import math
+import time
+import numpy as np
 from PyQt6.QtWidgets import QWidget
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QPainter, QColor, QPainterPath, QPen, QLinearGradient, QTransform
+from PyQt6.QtGui import QPainter, QColor, QPen, QLinearGradient, QPixmap, QPolygonF
 from ui.topbar.widgets import cm_to_px
+from core.telemetry.ui_profiler import ui_profiler
 
 class WaveformWidget(QWidget):
-    def __init__(self, width_cm=4.0, height_cm=0.70, parent=None):
+    ACTIVE_INTERVAL_MS = 16
+    FRAME_MS = 16.0  # animation constants below are tuned per 16 ms step
+
+    def __init__(self, width_cm=4.0, height_cm=0.70, parent=None, cache_frames=True,
+                 idle_fps=15, idle_stop_s=20.0, settle_s=1.5):
         super().__init__(parent)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         self.pixel_width = cm_to_px(width_cm)
@@ -25,113 +32,274 @@ class WaveformWidget(QWidget):
         self.opacity = 1.0
         self.target_opacity = 1.0
         self.fade_speed = 0.05
+        # Render each animation step once into a pixmap; extra repaints just blit it
+        self.cache_frames = cache_frames
+        self._frame = None
+        self._frame_dirty = True
+        # Optional spectrum feed (core.pipeline.spectrum LatestValue) shaping the wave
+        self.spectrum = None
+        self._spectrum_seq = 0
+        self._rebuild_geometry()
+
+        # Frame rate: full speed while recording/speaking or audio is moving, idle_fps once
+        # it has been quiet for settle_s, and stopped after idle_stop_s (0 = never) or while hidden
+        self.idle_interval_ms = int(1000 / idle_fps) if idle_fps else 0
+        self.idle_stop_s = idle_stop_s
+        self.settle_s = settle_s
+        self.active = False
+        self.rate_state = "active"
+        self._last_input = time.monotonic()
+        self._last_tick = time.monotonic()
+        self.fps = 0.0
+        self._fps_frames = 0
+        self._fps_since = time.monotonic()
 
         self.animation_timer = QTimer(self)
         self.animation_timer.timeout.connect(self.animate)
-        self.animation_timer.start(16)
+        self.animation_timer.start(self.ACTIVE_INTERVAL_MS)
 
         self.demo_timer = QTimer(self)
         self.demo_timer.timeout.connect(self.demo_animation)
         self.demo_timer.start(100)
 
     def update_amplitudes(self, volume, spike):
+        # Called from audio callbacks: only plain attributes here, timers belong to the GUI thread
         self._target_dynamic = 0.05 + math.sqrt(max(0.0, volume)) * 0.95
         self.spike_amplitude = max(self.spike_amplitude, max(0.0, spike))
         self.target_opacity = 1.0 if volume > 0.02 else 0.8
+        if volume > 0.02:
+            self._last_input = time.monotonic()
+
+    # --- FRAME RATE ---
+    def set_active(self, active):
+        """Recording or speech started/stopped. Going active jumps straight back to full rate."""
+        self.active = active
+        self._last_input = time.monotonic()
+        if active:
+            self._set_rate("active")
+
+    def _set_rate(self, state):
+        if state == self.rate_state:
+            return
+        self.rate_state = state
+        self._fps_frames, self._fps_since = 0, time.monotonic()
+        if state == "active":
+            # Don't replay the time spent asleep as one huge step
+            self._last_tick = time.monotonic()
+            self.animation_timer.start(self.ACTIVE_INTERVAL_MS)
+            self.demo_timer.start(100)
+        elif state == "idle":
+            self.animation_timer.start(self.idle_interval_ms)
+        else:  # "stopped" / "hidden"
+            self.animation_timer.stop()
+            self.demo_timer.stop()
+            self.fps = 0.0
+
+    def _update_rate(self, now):
+        if not self.idle_interval_ms and not self.idle_stop_s:
+            return
+        quiet = 0.0 if self.active else now - self._last_input
+        if quiet < self.settle_s:
+            self._set_rate("active")
+        elif self.idle_stop_s and quiet >= self.settle_s + self.idle_stop_s:
+            self._set_rate("stopped")
+        elif self.idle_interval_ms:
+            self._set_rate("idle")
+        else:
+            self._set_rate("stopped")
+
+    def showEvent(self, event):
+        # Also delivered when the window is restored from minimized
+        if self.rate_state == "hidden":
+            self.rate_state = "stopped"
+            self._set_rate("active")
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._set_rate("hidden")
+        super().hideEvent(event)
+
+    def stats(self):
+        """Current rate state and measured (not nominal) frames per second."""
+        elapsed = time.monotonic() - self._fps_since
+        fps = self._fps_frames / elapsed if elapsed >= 0.25 else self.fps
+        if not self.animation_timer.isActive():
+            fps = 0.0
+        return {"state": self.rate_state, "fps": round(fps, 1), "interval_ms": self.animation_timer.interval()}
+
+    def set_spectrum_source(self, latest):
+        """Drive amplitude and wave shape from a SpectrumAnalyzer's latest-value slot."""
+        self.spectrum = latest
+
+    def _read_spectrum(self, steps):
+        seq, value = self.spectrum.read()
+        if seq != self._spectrum_seq:
+            self._spectrum_seq = seq
+            self.update_amplitudes(value["level"], value["flux"])
+            # Low bands in the middle of the wave, highs toward the edges
+            self._envelope_target = 0.55 + 0.9 * np.interp(self._band_position, self._band_index(value["bands"]), value["bands"])
+        self._envelope += (self._envelope_target - self._envelope) * (1 - 0.7 ** steps)
+        self._shape = self._falloff * self._envelope
+
+    def _band_index(self, bands):
+        if len(bands) != len(self._band_grid):
+            self._band_grid = np.linspace(0.0, 1.0, len(bands))
+        return self._band_grid
 
     def demo_animation(self):
         if self._target_dynamic < 0.1:
             self._target_dynamic = 0.05 + (math.sin(self.phase * 0.5) * 0.5 + 0.5) * 0.3
 
     def animate(self):
-        self.phase -= 0.08
-        self.dynamic_amplitude += (self._target_dynamic - self.dynamic_amplitude) * 0.1
-        self.spike_amplitude *= 0.85
-        self.opacity += (self.target_opacity - self.opacity) * self.fade_speed
+        ui_profiler.tick("waveform.timer", self.animation_timer.interval())
+        # Advance by elapsed time so the motion keeps its speed at any frame rate
+        now = time.monotonic()
+        steps = min((now - self._last_tick) * 1000 / self.FRAME_MS, 30.0)
+        self._last_tick = now
+        self.phase -= 0.08 * steps
+        self.dynamic_amplitude += (self._target_dynamic - self.dynamic_amplitude) * (1 - 0.9 ** steps)
+        self.spike_amplitude *= 0.85 ** steps
+        self.opacity += (self.target_opacity - self.opacity) * (1 - (1 - self.fade_speed) ** steps)
+        if self.spectrum is not None:
+            self._read_spectrum(steps)
+        self._frame_dirty = True
         self.update()
+        self._update_rate(now)
+
+    def _rebuild_geometry(self):
+        """Per-size constants: x positions, edge falloff, gradients and pens. Recomputed only on resize."""
+        width, height = self.width(), self.height()
+        mid_y = height / 2.0
+        i = np.arange(self.wave_points + 1, dtype=np.float64)
+        half = self.wave_points / 2
+        self._index = i
+        self._x = width * i / self.wave_points
+        self._x_reversed = self._x[::-1].copy()
+        self._falloff = (1 - (np.abs(i - half) / half) ** 2) ** 2
+        self._band_position = np.abs(i - half) / half
+        self._band_grid = np.zeros(0)
+        self._envelope = np.ones(len(i))
+        self._envelope_target = self._envelope
+        self._shape = self._falloff
+
+        c1 = QColor("#00ffff"); c1.setAlpha(220)
+        c2 = QColor("#ff00ff"); c2.setAlpha(220)
+        self._grad_top = QLinearGradient(0, 0, 0, mid_y)
+        self._grad_top.setColorAt(0, c1); self._grad_top.setColorAt(1, c2)
+        c3 = QColor("#ff00ff"); c3.setAlpha(220)
+        c4 = QColor("#5e0025"); c4.setAlpha(180)
+        self._grad_bottom = QLinearGradient(0, mid_y, 0, height)
+        self._grad_bottom.setColorAt(0, c3); self._grad_bottom.setColorAt(1, c4)
+
+        self._pen_mid = QPen(QColor("#ffffff"), 1.2); self._pen_mid.setCapStyle(Qt.PenCapStyle.RoundCap)
+        self._glow_pens = []
+        for layer in range(self.glow_layers):
+            glow_color = QColor("#ff33ff")
+            glow_color.setAlpha(max(0, 60 - layer * 10))
+            pen = QPen(glow_color, (self.glow_spread * (layer + 1) / self.glow_layers))
+            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+            self._glow_pens.append(pen)
+        self._ribbon_pens = []
+        for line in range(self.ribbon_lines):
+            alpha = int(40 + (1 - abs(line - self.ribbon_lines / 2) / (self.ribbon_lines / 2)) * 80)
+            grad_line = QLinearGradient(0, 0, width, 0)
+            grad_line.setColorAt(0, QColor(255, 51, 255, alpha))
+            grad_line.setColorAt(0.5, QColor(255, 255, 255, min(255, int(alpha * 1.5))))
+            grad_line.setColorAt(1, QColor(255, 51, 255, alpha))
+            pen_line = QPen(grad_line, 1.2); pen_line.setCapStyle(Qt.PenCapStyle.RoundCap)
+            self._ribbon_pens.append(pen_line)
+        self._frame = None
+
+    def resizeEvent(self, event):
+        self._rebuild_geometry()
+        super().resizeEvent(event)
 
     def create_wave_coords(self, total_amp, freq, phase_shift, y_offset):
-        coords = []
-        mid_y = self.height() / 2.0
-        for i in range(self.wave_points + 1):
-            edge_falloff = (1 - (abs(i - self.wave_points / 2) / (self.wave_points / 2))**2)**2
-            sine = math.sin(self.phase * freq + phase_shift + (i * 0.08))
-            coords.append(mid_y + y_offset + (sine * total_amp * edge_falloff))
-        return coords
-
-    def create_base_path(self, total_amp):
-        path = QPainterPath()
-        mid_y, width = self.height() / 2.0, self.width()
-        path.moveTo(0, mid_y)
-        for i in range(self.wave_points + 1):
-            x = width * i / self.wave_points
-            edge_falloff = (1 - (abs(i - self.wave_points / 2) / (self.wave_points / 2))**2)**2
-            sine1 = math.sin(self.phase + (i * 0.06))
-            sine2 = math.sin(self.phase * 2.0 + (i * 0.08))
-            y = (sine1 * 0.6 + sine2 * 0.4) * total_amp * edge_falloff
-            path.lineTo(x, mid_y + y)
-        return path
+        sine = np.sin(self.phase * freq + phase_shift + self._index * 0.08)
+        return self.height() / 2.0 + y_offset + sine * (total_amp * self._shape)
+
+    def create_base_coords(self, total_amp):
+        i = self._index
+        y = np.sin(self.phase + i * 0.06) * 0.6 + np.sin(self.phase * 2.0 + i * 0.08) * 0.4
+        return self.height() / 2.0 + y * (total_amp * self._shape)
 
     def paintEvent(self, event):
+        with ui_profiler.measure("waveform.paint"):
+            self._paint()
+
+    def _paint(self):
+        if not self.cache_frames:
+            painter = QPainter(self)
+            self.render_frame(painter)
+            painter.end()
+            return
+        # Repaints without a new animation step (parent relayouts, text updates) reuse the last frame
+        ratio = self.devicePixelRatioF()
+        if self._frame is None or self._frame.devicePixelRatioF() != ratio:
+            self._frame = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+            self._frame.setDevicePixelRatio(ratio)
+            self._frame_dirty = True
+        if self._frame_dirty:
+            self._frame.fill(Qt.GlobalColor.transparent)
+            frame_painter = QPainter(self._frame)
+            self.render_frame(frame_painter)
+            frame_painter.end()
+            self._frame_dirty = False
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._frame)
+        painter.end()
+
+    def render_frame(self, painter):
+        self._fps_frames += 1
+        now = time.monotonic()
+        if now - self._fps_since >= 1.0:
+            self.fps = self._fps_frames / (now - self._fps_since)
+            self._fps_frames, self._fps_since = 0, now
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setOpacity(self.opacity)
 
         total_amp = self.base_amplitude * (self.dynamic_amplitude + self.spike_amplitude)
         if total_amp < 0.5: total_amp = 0.5
-
-        width = self.width()
         mid_y = self.height() / 2.0
+        x, x_reversed = self._x, self._x_reversed
 
         top_wave = self.create_wave_coords(total_amp, 1.0, 0.5, -mid_y * 0.3)
         mid_wave = self.create_wave_coords(total_amp, 1.5, 0, 0)
         bottom_wave = self.create_wave_coords(total_amp, 0.9, 1.0, mid_y * 0.3)
+        mid_line = _polygon(x, mid_wave)
 
-        # Draw top gradient
-        path_top = QPainterPath()
-        path_top.moveTo(0, top_wave[0])
-        for i in range(self.wave_points + 1): path_top.lineTo(width * i / self.wave_points, top_wave[i])
-        for i in range(self.wave_points, -1, -1): path_top.lineTo(width * i / self.wave_points, mid_wave[i])
-        grad_top = QLinearGradient(0, 0, 0, mid_y)
-        c1 = QColor("#00ffff"); c1.setAlpha(220)
-        c2 = QColor("#ff00ff"); c2.setAlpha(220)
-        grad_top.setColorAt(0, c1); grad_top.setColorAt(1, c2)
-        painter.setBrush(grad_top); painter.setPen(Qt.PenStyle.NoPen); painter.drawPath(path_top)
-
-        # Draw bottom gradient
-        path_bottom = QPainterPath()
-        path_bottom.moveTo(0, mid_wave[0])
-        for i in range(self.wave_points + 1): path_bottom.lineTo(width * i / self.wave_points, mid_wave[i])
-        for i in range(self.wave_points, -1, -1): path_bottom.lineTo(width * i / self.wave_points, bottom_wave[i])
-        grad_bottom = QLinearGradient(0, mid_y, 0, self.height())
-        c3 = QColor("#ff00ff"); c3.setAlpha(220)
-        c4 = QColor("#5e0025"); c4.setAlpha(180)
-        grad_bottom.setColorAt(0, c3); grad_bottom.setColorAt(1, c4)
-        painter.setBrush(grad_bottom); painter.drawPath(path_bottom)
-
-        # Draw midline
-        path_midline = QPainterPath()
-        path_midline.moveTo(0, mid_wave[0])
-        for i in range(self.wave_points + 1): path_midline.lineTo(width * i / self.wave_points, mid_wave[i])
-        pen_mid = QPen(QColor("#ffffff"), 1.2); pen_mid.setCapStyle(Qt.PenCapStyle.RoundCap)
-        painter.setPen(pen_mid); painter.setBrush(Qt.BrushStyle.NoBrush); painter.drawPath(path_midline)
-
-        # Draw glow & ribbons (Combined logic for brevity, functionally identical)
-        base_path = self.create_base_path(total_amp)
-        for i in range(self.glow_layers):
-            glow_color = QColor("#ff33ff")
-            glow_color.setAlpha(max(0, 60 - i * 10))
-            pen = QPen(glow_color, (self.glow_spread * (i + 1) / self.glow_layers))
-            pen.setCapStyle(Qt.PenCapStyle.RoundCap)
-            painter.setPen(pen); painter.drawPath(base_path)
+        # Top and bottom gradient bands (each a closed polygon: one edge forward, the other back)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._grad_top)
+        painter.drawPolygon(_polygon(np.concatenate((x, x_reversed)), np.concatenate((top_wave, mid_wave[::-1]))))
+        painter.setBrush(self._grad_bottom)
+        painter.drawPolygon(_polygon(np.concatenate((x, x_reversed)), np.concatenate((mid_wave, bottom_wave[::-1]))))
 
-        for i in range(self.ribbon_lines):
-            y_offset = (i - self.ribbon_lines / 2) * (self.ribbon_spread * self.dynamic_amplitude / self.ribbon_lines)
-            alpha = int(40 + (1 - abs(i - self.ribbon_lines / 2) / (self.ribbon_lines / 2)) * 80)
-            grad_line = QLinearGradient(0, 0, self.width(), 0)
-            grad_line.setColorAt(0, QColor(255, 51, 255, alpha))
-            grad_line.setColorAt(0.5, QColor(255, 255, 255, int(alpha * 1.5)))
-            grad_line.setColorAt(1, QColor(255, 51, 255, alpha))
-            pen_line = QPen(grad_line, 1.2); pen_line.setCapStyle(Qt.PenCapStyle.RoundCap)
-            painter.setPen(pen_line)
-            painter.drawPath(QTransform().translate(0, y_offset).map(base_path))
\ No newline at end of file
+        # Midline
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.setPen(self._pen_mid)
+        painter.drawPolyline(mid_line)
+
+        # Glow, then ribbons: the same base line shifted by a constant step, so translate instead of remapping it
+        base_line = _polygon(x, self.create_base_coords(total_amp))
+        for pen in self._glow_pens:
+            painter.setPen(pen)
+            painter.drawPolyline(base_line)
+
+        step = self.ribbon_spread * self.dynamic_amplitude / self.ribbon_lines
+        painter.translate(0, -self.ribbon_lines / 2 * step)
+        for pen in self._ribbon_pens:
+            painter.setPen(pen)
+            painter.drawPolyline(base_line)
+            painter.translate(0, step)
+
+def _polygon(x, y):
+    """QPolygonF filled straight from NumPy arrays (no per-point QPointF objects)."""
+    polygon = QPolygonF()
+    polygon.resize(len(x))
+    buffer = polygon.data()
+    buffer.setsize(len(x) * 16)
+    points = np.frombuffer(buffer, dtype=np.float64).reshape(-1, 2)
+    points[:, 0] = x
+    points[:, 1] = y
+    return polygon
@@ -1,6 +1,6 @@
 import sys
-from PyQt6.QtWidgets import QWidget, QSizePolicy, QDialog, QVBoxLayout, QProgressBar, QLabel
-from PyQt6.QtGui import QPainter, QColor, QPen, QGuiApplication
+from PyQt6.QtWidgets import QWidget, QSizePolicy, QDialog, QVBoxLayout, QProgressBar, QLabel, QTextEdit, QFrame
+from PyQt6.QtGui import QPainter, QColor, QPen, QGuiApplication, QTextCursor, QTextCharFormat, QTextBlockFormat
 from PyQt6.QtCore import Qt, QTimer
 
 # --- HELPER FUNCTION (This was missing) ---
@@ -56,6 +56,104 @@ class CloseIcon(QWidget):
     def mousePressEvent(self, event):
         sys.exit()
 
+# --- SPOKEN TEXT ---
+class SpokenTextView(QTextEdit):
+    """Read-only text whose words can be highlighted one at a time while they are spoken.
+
+    The document is built once per response with each word's (start, end)
+    position recorded. Highlighting never edits the document: "spoken so far"
+    and "current word" are two extra selections, which Qt paints over the
+    existing layout, so each word costs O(1) with no relayout.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setTextInteractionFlags(Qt.TextInteractionFlag.NoTextInteraction)
+        self.viewport().setCursor(Qt.CursorShape.ArrowCursor)
+        self.document().setUndoRedoEnabled(False)
+
+        # Only the colour changes, so highlighting never changes line breaks (the font is already bold)
+        self.pending_format = self._format("#cccccc")
+        self.spoken_format = self._format("#ffffff")
+        self.current_format = self._format("#00ffff")
+        self.word_spans = []  # (start, end) document positions per word
+        self.current = -1
+        self.stream_cursor = None
+
+    def _format(self, color):
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        return fmt
+
+    def set_words(self, text):
+        """Show text (whitespace collapsed like str.split) with every word not yet spoken."""
+        document = self.document()
+        document.clear()
+        cursor = QTextCursor(document)
+        block_format = QTextBlockFormat()
+        block_format.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        cursor.setBlockFormat(block_format)
+        self.word_spans = []
+        for i, word in enumerate(text.split()):
+            if i:
+                cursor.insertText(" ", self.pending_format)
+            start = cursor.position()  # UTF-16 positions, so emoji don't shift later words
+            cursor.insertText(word, self.pending_format)
+            self.word_spans.append((start, cursor.position()))
+        self.current = -1
+        self.setExtraSelections([])
+        self.verticalScrollBar().setValue(0)
+
+    def _selection(self, start, end, fmt):
+        selection = QTextEdit.ExtraSelection()
+        selection.cursor = QTextCursor(self.document())
+        selection.cursor.setPosition(start)
+        selection.cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        selection.format = fmt
+        return selection
+
+    def highlight(self, index):
+        """Make word index current and everything before it spoken. Returns False if out of range."""
+        if not 0 <= index < len(self.word_spans):
+            return False
+        if index != self.current:
+            start, end = self.word_spans[index]
+            selections = [self._selection(start, end, self.current_format)]
+            if index:
+                selections.append(self._selection(0, self.word_spans[index - 1][1], self.spoken_format))
+            self.setExtraSelections(selections)
+            self.current = index
+        return True
+
+    def begin_stream(self, prefix=""):
+        """Clear the view for a response that arrives in pieces."""
+        self.set_words("")
+        self.stream_cursor = QTextCursor(self.document())
+        self.stream_cursor.movePosition(QTextCursor.MoveOperation.End)
+        if prefix:
+            self.stream_cursor.insertText(prefix, self.spoken_format)
+
+    def append_text(self, text):
+        """Append at the end; only the last block is laid out again. Keeps the view pinned to the bottom if it was."""
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+        self.stream_cursor.insertText(text, self.spoken_format)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def scroll_to_word(self, index):
+        """Center the word's line using its real layout position."""
+        cursor = QTextCursor(self.document())
+        cursor.setPosition(self.word_spans[index][0])
+        rect = self.cursorRect(cursor)  # viewport coordinates
+        scrollbar = self.verticalScrollBar()
+        target = scrollbar.value() + rect.center().y() - self.viewport().height() // 2
+        scrollbar.setValue(max(0, min(scrollbar.maximum(), target)))
+
 # --- PROGRESS DIALOG ---
 class VoiceProgressDialog(QDialog):
     def __init__(self, parent=None):